@@ -0,0 +1,18 @@
+"""
+Gunicorn settings, which gunicorn reads from the working directory.
+"""
+import os
+
+
+def on_starting(server) -> None:
+	"""Drop the metrics snapshots of the workers of a previous run."""
+	os.environ.setdefault(
+		"DJANGO_SETTINGS_MODULE", "it_company_task_manager.settings.prod"
+	)
+	import django
+
+	django.setup()
+
+	from task_manager.metrics import store
+
+	store.clear()
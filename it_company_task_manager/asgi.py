@@ -2,6 +2,11 @@
 ASGI config for it_company_task_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The index, list and detail pages are served by the async views, unless the
+ASYNC_VIEWS environment variable is set to something other than "1". Serve it
+with an ASGI server, for instance uvicorn workers under gunicorn:
+
+    gunicorn it_company_task_manager.asgi -k uvicorn_worker.UvicornWorker
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +17,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "it_company_task_manager.settings")
+os.environ.setdefault("ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
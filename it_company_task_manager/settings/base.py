@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -26,20 +27,25 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+	"task_manager.middleware.MetricsMiddleware",
+	"task_manager.middleware.ServerTimingMiddleware",
 	"django.middleware.security.SecurityMiddleware",
+	"task_manager.middleware.ReplicaStickinessMiddleware",
 	"django.contrib.sessions.middleware.SessionMiddleware",
 	"django.middleware.common.CommonMiddleware",
 	"django.middleware.csrf.CsrfViewMiddleware",
 	"django.contrib.auth.middleware.AuthenticationMiddleware",
 	"django.contrib.messages.middleware.MessageMiddleware",
 	"django.middleware.clickjacking.XFrameOptionsMiddleware",
+	"task_manager.middleware.AnonymousPageCacheMiddleware",
 ]
 
 ROOT_URLCONF = "it_company_task_manager.urls"
 
 TEMPLATES = [
 	{
-		"BACKEND": "django.template.backends.django.DjangoTemplates",
+		"BACKEND": "task_manager.metrics.TimedDjangoTemplates",
+		"NAME": "django",
 		"DIRS": [BASE_DIR / "templates", BASE_DIR / "templates/pages"],
 		"APP_DIRS": True,
 		"OPTIONS": {
@@ -55,6 +61,20 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "it_company_task_manager.wsgi.application"
 
+# Read replicas
+# Aliases of DATABASES that task_manager.routers.ReplicaRouter sends
+# reads to, writes going to "default". Users read "default" for
+# REPLICA_STICKY_SECONDS after a request that may write, marked by the
+# REPLICA_STICKY_COOKIE cookie, so that they never see stale data.
+
+DATABASE_ROUTERS = ["task_manager.routers.ReplicaRouter"]
+
+DATABASE_REPLICAS = []
+
+REPLICA_STICKY_SECONDS = 10
+
+REPLICA_STICKY_COOKIE = "use_primary"
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -75,6 +95,15 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "task_manager.Worker"
 
+# Users are loaded from the cache, with their position, for
+# USER_CACHE_TIMEOUT seconds, and sessions read from the cache too.
+
+AUTHENTICATION_BACKENDS = ["task_manager.backends.CachedModelBackend"]
+
+USER_CACHE_TIMEOUT = 60 * 5
+
+SESSION_ENGINE = "task_manager.sessions"
+
 LOGIN_REDIRECT_URL = "/"
 
 LOGOUT_REDIRECT_URL = "/"
@@ -103,3 +132,104 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Task search
+# Dotted path to the task_manager.search.SearchBackend used by the task list.
+
+TASK_SEARCH_BACKEND = "task_manager.search.TaskFullTextSearchBackend"
+
+# Page cache
+# task_manager.middleware.AnonymousPageCacheMiddleware caches the pages
+# of views with a page cache timeout for anonymous visitors, in the
+# CACHE_MIDDLEWARE_ALIAS cache, and lets a reverse proxy cache them with
+# Cache-Control and Surrogate-Key headers. Purges are sent to the proxy
+# as PURGE requests to PAGE_CACHE_PURGE_URL, with a Surrogate-Key header.
+
+CACHE_MIDDLEWARE_KEY_PREFIX = "task_manager"
+
+PAGE_CACHE_PURGE_URL = None
+
+# Query monitoring
+# task_manager.middleware.NPlusOneMiddleware logs SQL repeated this many
+# times in one request, recording only this share of the requests.
+# Under the test runner, which sets TESTING, requests over their view's
+# query budget raise.
+
+TESTING = False
+
+TEST_RUNNER = "task_manager.tests.runner.TestRunner"
+
+NPLUSONE_THRESHOLD = 3
+
+NPLUSONE_SAMPLE_RATE = 0.01
+
+# Metrics
+# Each process writes its request metrics to a file in METRICS_DIR, at
+# most every METRICS_FLUSH_INTERVAL seconds, and /metrics adds them up.
+# Without a directory /metrics shows the process serving it only.
+# The gunicorn master empties the directory when it starts.
+# Scrapers authenticate with an "Authorization: Bearer METRICS_TOKEN"
+# header; staff users may view the metrics too.
+
+METRICS_DIR = None
+
+METRICS_FLUSH_INTERVAL = 1.0
+
+METRICS_TOKEN = None
+
+# Server-Timing
+# Who gets the Server-Timing header of task_manager.middleware: "staff"
+# users and requests with an X-Server-Timing-Token header made by the
+# "trigger_token server-timing" command, valid for
+# SERVER_TIMING_TOKEN_MAX_AGE seconds. An empty list turns it off.
+
+SERVER_TIMING_ALLOW = ["staff", "token"]
+
+SERVER_TIMING_TOKEN_MAX_AGE = 60 * 60 * 24
+
+# Profiling
+# task_manager.middleware.ProfilerMiddleware, when added to MIDDLEWARE,
+# profiles one in PROFILER_SAMPLE_EVERY requests (none when 0) and the
+# requests with an X-Profile-Token header made by the "trigger_token
+# profile" command. Profiles go to a directory per URL name, which keeps
+# the newest PROFILER_MAX_FILES; merge_profiles combines them.
+
+PROFILER_DIR = BASE_DIR / "profiles"
+
+PROFILER_SAMPLE_EVERY = 0
+
+PROFILER_INTERVAL = 0.005
+
+PROFILER_MAX_FILES = 50
+
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+
+# Memory profiling
+# task_manager.middleware.MemoryProfilerMiddleware, when added to
+# MIDDLEWARE, traces the allocations of one in
+# MEMORY_PROFILER_SAMPLE_EVERY requests (none when 0) and of the requests
+# with an X-Memory-Profile-Token header made by the "trigger_token
+# memory-profile" command. Each keeps its MEMORY_PROFILER_TOP_LINES
+# largest allocating lines, traced MEMORY_PROFILER_FRAMES frames deep,
+# in a directory per URL name holding the newest
+# MEMORY_PROFILER_MAX_FILES; memory_report sums them up.
+
+MEMORY_PROFILER_DIR = BASE_DIR / "memory_profiles"
+
+MEMORY_PROFILER_SAMPLE_EVERY = 0
+
+MEMORY_PROFILER_FRAMES = 1
+
+MEMORY_PROFILER_TOP_LINES = 25
+
+MEMORY_PROFILER_MAX_FILES = 200
+
+MEMORY_PROFILER_TOKEN_MAX_AGE = 60 * 60
+
+# Async views
+# With ASYNC_VIEWS the index, list and detail pages are served by the
+# async views of task_manager.async_views. The ASGI entry point turns
+# it on through the ASYNC_VIEWS environment variable, see asgi.py, so
+# that WSGI workers keep the sync views.
+
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS") == "1"
@@ -1,3 +1,5 @@
+import os
+
 from .base import *
 
 # Insecure key!
@@ -13,7 +15,14 @@ INTERNAL_IPS = ["localhost", "127.0.0.1"]
 # Application definition
 INSTALLED_APPS.append("debug_toolbar")
 
-MIDDLEWARE.insert(1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+MIDDLEWARE.insert(
+	MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+	"debug_toolbar.middleware.DebugToolbarMiddleware",
+)
+
+MIDDLEWARE.append("task_manager.middleware.NPlusOneMiddleware")
+
+NPLUSONE_SAMPLE_RATE = 1.0
 
 # Database
 DATABASES = {
@@ -22,3 +31,14 @@ DATABASES = {
 		"NAME": BASE_DIR / "db.sqlite3",
 	}
 }
+
+# Set SQLITE_REPLICA to a copy of db.sqlite3 to try the read replica
+# router: reads go to the copy, which no longer sees the writes, unless
+# made right after one.
+if SQLITE_REPLICA := os.environ.get("SQLITE_REPLICA"):
+	DATABASES["replica"] = {
+		"ENGINE": "django.db.backends.sqlite3",
+		"NAME": SQLITE_REPLICA,
+		"TEST": {"MIRROR": "default"},
+	}
+	DATABASE_REPLICAS = ["replica"]
@@ -1,5 +1,6 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 from .base import *
@@ -17,9 +18,29 @@ if RENDER_EXTERNAL_HOSTNAME := os.environ.get('RENDER_EXTERNAL_HOSTNAME'):
 	ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
 
 # Application definition
-MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
+MIDDLEWARE.insert(
+	MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+	"whitenoise.middleware.WhiteNoiseMiddleware",
+)
+
+# Metrics
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
 
 # Database
+# With psycopg 3 each process keeps a pool of open connections, so that
+# requests skip the TLS handshake. POSTGRES_POOL=0 turns the pool off,
+# as psycopg2 requires, and keeps each thread's connection open for
+# POSTGRES_CONN_MAX_AGE seconds instead. Each request in flight holds a
+# connection, so the pool's max size should cover a process's threads,
+# or, under ASGI, its concurrent requests.
+POSTGRES_POOL = os.environ.get('POSTGRES_POOL', '1') == '1'
+
+POSTGRES_HEALTH_CHECKS = (
+	os.environ.get('POSTGRES_HEALTH_CHECKS', '1') == '1'
+)
+
 DATABASES = {
 	'default': {
 		'ENGINE': 'django.db.backends.postgresql',
@@ -28,12 +49,79 @@ DATABASES = {
 		'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
 		'HOST': os.environ.get('POSTGRES_HOST'),
 		'PORT': int(os.environ.get('POSTGRES_DB_PORT', 5432)),
+		'CONN_MAX_AGE': (
+			0 if POSTGRES_POOL
+			else int(os.environ.get('POSTGRES_CONN_MAX_AGE', 600))
+		),
+		'CONN_HEALTH_CHECKS': POSTGRES_HEALTH_CHECKS,
+		# A transaction-mode pooler, such as PgBouncer, lends the server
+		# connection for one transaction only, which the server-side
+		# cursors of .iterator() would outlive. Django already keeps
+		# psycopg's prepared statements off; the database's time zone
+		# should be UTC, so that no session setting is needed either.
+		'DISABLE_SERVER_SIDE_CURSORS': (
+			os.environ.get('POSTGRES_TRANSACTION_POOLER') == '1'
+		),
 		'OPTIONS': {
 			'sslmode': 'require',
 		},
 	}
 }
 
+if POSTGRES_POOL:
+	from psycopg_pool import ConnectionPool
+
+	DATABASES['default']['OPTIONS']['pool'] = {
+		'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)),
+		'max_size': int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 10)),
+		# Seconds a request waits for a free connection before failing.
+		'timeout': float(os.environ.get('POSTGRES_POOL_TIMEOUT', 10)),
+		'max_idle': float(os.environ.get('POSTGRES_POOL_MAX_IDLE', 600)),
+		'max_lifetime': float(
+			os.environ.get('POSTGRES_POOL_MAX_LIFETIME', 3600)
+		),
+	}
+	if POSTGRES_HEALTH_CHECKS:
+		DATABASES['default']['OPTIONS']['pool']['check'] = (
+			ConnectionPool.check_connection
+		)
+
+# Read replicas, a comma separated list of hosts sharing the primary's
+# database, user and password.
+for i, host in enumerate(
+	filter(None, os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(','))
+):
+	DATABASES[f'replica{i}'] = {
+		**DATABASES['default'],
+		'HOST': host.strip(),
+		'TEST': {'MIRROR': 'default'},
+	}
+	DATABASE_REPLICAS.append(f'replica{i}')
+
+# A database of its own for benchmark_servers, on the primary's server,
+# which the deployments under test use as their POSTGRES_DB.
+if POSTGRES_BENCHMARK_DB := os.environ.get('POSTGRES_BENCHMARK_DB'):
+	DATABASES['benchmark'] = {
+		**DATABASES['default'],
+		'NAME': POSTGRES_BENCHMARK_DB,
+	}
+
+# Cache
+# Every process must share the cache, or the user, session, page and
+# fragment invalidations would reach only the process making them: a
+# logged out or deactivated user would stay signed in on the others.
+if not (REDIS_URL := os.environ.get('REDIS_URL')):
+	raise ImproperlyConfigured(
+		'REDIS_URL must point to the cache shared by every process.'
+	)
+
+CACHES = {
+	'default': {
+		'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+		'LOCATION': REDIS_URL,
+	}
+}
+
 # Security settings
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
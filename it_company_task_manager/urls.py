@@ -22,7 +22,15 @@ from task_manager.views import LoginView
 
 urlpatterns = [
 	path("admin/", admin.site.urls),
-	path("", include("task_manager.urls", "task_manager")),
+	path(
+		"",
+		include(
+			"task_manager.async_urls"
+			if settings.ASYNC_VIEWS
+			else "task_manager.urls",
+			"task_manager",
+		),
+	),
 	path("accounts/login/", LoginView.as_view(), name="login"),
 	path("accounts/", include("django.contrib.auth.urls")),
 ]
@@ -0,0 +1,171 @@
+"""
+Read-only JSON API. Rows are serialized straight from ``.values()`` and
+streamed in chunks, so memory stays bounded whatever the page size, and
+pages are keyset paginated like the HTML lists.
+"""
+import json
+from collections.abc import Iterator
+from itertools import islice
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.views import View
+
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.pagination import NEXT, KeysetPaginator
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CHUNK_SIZE = 200
+
+TaskAssignment = Task.assignees.through
+
+
+class ApiListView(LoginRequiredMixin, View):
+	"""
+	Streams one page of ``queryset.values(*fields, **expressions)`` as
+	``{"results": [...], "next": cursor}``. Pages only go forward: the
+	``next`` cursor is null on the last page.
+	"""
+
+	raise_exception = True
+	http_method_names = ["get"]
+	queryset: QuerySet | None = None
+	fields: tuple[str, ...] = ()
+	expressions: dict = {}
+	keyset_ordering: tuple[str, ...] = ("id",)
+	chunk_size = CHUNK_SIZE
+	query_budget = 3
+
+	def get(self, request: HttpRequest) -> StreamingHttpResponse:
+		paginator = KeysetPaginator(
+			self.get_queryset().values(*self.fields, **self.expressions),
+			self.get_page_size(),
+			self.keyset_ordering,
+		)
+		direction, _, rows = paginator.seek(request.GET.get("cursor"))
+		if direction != NEXT:
+			_, _, rows = paginator.seek()
+
+		return StreamingHttpResponse(
+			self.stream(rows.iterator(chunk_size=self.chunk_size), paginator),
+			content_type="application/json",
+		)
+
+	def get_queryset(self) -> QuerySet:
+		return self.queryset.all()
+
+	def get_page_size(self) -> int:
+		try:
+			page_size = int(self.request.GET.get("limit", PAGE_SIZE))
+		except ValueError:
+			return PAGE_SIZE
+
+		return max(1, min(page_size, MAX_PAGE_SIZE))
+
+	def serialize_chunk(self, rows: list[dict]) -> list[dict]:
+		"""Hook to add data to a chunk of rows with a fixed query count."""
+		return rows
+
+	def stream(
+		self, rows: Iterator[dict], paginator: KeysetPaginator
+	) -> Iterator[str]:
+		yield '{"results": ['
+
+		remaining = paginator.per_page
+		last_row = None
+		separator = ""
+
+		while remaining and (
+			chunk := list(islice(rows, min(self.chunk_size, remaining)))
+		):
+			remaining -= len(chunk)
+			last_row = chunk[-1]
+			yield separator + ", ".join(
+				json.dumps(row, cls=DjangoJSONEncoder)
+				for row in self.serialize_chunk(chunk)
+			)
+			separator = ", "
+
+		# The paginator selects one extra row to tell if more remain.
+		has_next = last_row is not None and next(rows, None) is not None
+		next_cursor = (
+			paginator.encode_cursor(last_row, NEXT) if has_next else None
+		)
+
+		yield f'], "next": {json.dumps(next_cursor)}}}'
+
+
+class TaskApiListView(ApiListView):
+	"""
+	Tasks with their assignee ids and whether the user may edit them.
+	``?editable=1`` keeps only the tasks the user may edit.
+	"""
+
+	fields = (
+		"id",
+		"name",
+		"description",
+		"created_at",
+		"deadline",
+		"is_completed",
+		"priority",
+		"task_type",
+		"editable",
+	)
+	expressions = {"task_type_name": F("task_type__name")}
+	keyset_ordering = ("-priority", "deadline", "id")
+	query_budget = 4
+
+	def get_queryset(self) -> QuerySet:
+		tasks = Task.objects.with_editable(self.request.user)
+
+		if self.request.GET.get("editable") in ("1", "true"):
+			tasks = tasks.editable_by(self.request.user)
+
+		return tasks
+
+	def serialize_chunk(self, rows: list[dict]) -> list[dict]:
+		"""Add the assignee ids of the chunk's tasks with one query."""
+		assignees = {row["id"]: [] for row in rows}
+
+		for task_id, worker_id in TaskAssignment.objects.filter(
+			task_id__in=assignees
+		).order_by("task_id", "worker_id").values_list(
+			"task_id", "worker_id"
+		):
+			assignees[task_id].append(worker_id)
+
+		for row in rows:
+			row["assignees"] = assignees[row["id"]]
+
+		return rows
+
+
+class WorkerApiListView(ApiListView):
+	queryset = Worker.objects.all()
+	fields = (
+		"id",
+		"username",
+		"first_name",
+		"last_name",
+		"position",
+		"active_task_count",
+		"resolved_task_count",
+	)
+	expressions = {"position_name": F("position__name")}
+	keyset_ordering = ("username", "id")
+
+
+class PositionApiListView(ApiListView):
+	queryset = Position.objects.all()
+	fields = ("id", "name")
+	keyset_ordering = ("name", "id")
+
+
+class TaskTypeApiListView(ApiListView):
+	queryset = TaskType.objects.all()
+	fields = ("id", "name")
+	keyset_ordering = ("name", "id")
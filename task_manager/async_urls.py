@@ -0,0 +1,23 @@
+"""
+The task_manager URLconf with the index, list and detail pages served by
+the async views, which ``ASYNC_VIEWS`` switches to.
+"""
+from django.urls import path
+
+from task_manager import async_views, urls
+
+ASYNC_VIEWS = {
+	"index": async_views.index,
+	"worker_list": async_views.WorkerListView.as_view(),
+	"worker_detail": async_views.WorkerDetailView.as_view(),
+	"task_list": async_views.TaskListView.as_view(),
+	"task_detail": async_views.TaskDetailView.as_view(),
+}
+
+urlpatterns = [
+	path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+	if pattern.name in ASYNC_VIEWS else pattern
+	for pattern in urls.urlpatterns
+]
+
+app_name = urls.app_name
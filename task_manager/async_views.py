@@ -0,0 +1,114 @@
+"""
+Async versions of the index, list and detail views, which
+``task_manager.async_urls`` serves when ``ASYNC_VIEWS`` is on, as it is
+under ASGI. They subclass the sync views, keeping their querysets,
+templates and query budgets, but load the user, the page's rows and
+their prefetches with the async ORM, so requests waiting on the database
+don't hold a worker. Contexts are built in a thread since the fragment
+and page caches block, and Django renders the templates in one.
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.http import Http404, HttpRequest, HttpResponse
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext as _
+
+from task_manager import page_cache, views
+from task_manager.counters import aget_counters
+from task_manager.page_cache import cache_anonymous_page
+from task_manager.query_budget import query_budget
+
+
+@query_budget(3)
+@cache_anonymous_page(views.PAGE_CACHE_TIMEOUT)
+async def index(request: HttpRequest) -> HttpResponse:
+	page_cache.add_keys(request, page_cache.TASK_LIST, page_cache.WORKER_LIST)
+
+	return TemplateResponse(
+		request, "pages/index.html", await aget_counters()
+	)
+
+
+class AsyncViewMixin:
+	"""
+	Loads the user before the sync code of the parent views, such as
+	LoginRequiredMixin, reads ``request.user``, which would otherwise
+	query the database from the event loop.
+	"""
+
+	async def dispatch(self, request, *args, **kwargs):
+		request.user = await request.auser()
+		response = super().dispatch(request, *args, **kwargs)
+
+		return await response if inspect.isawaitable(response) else response
+
+
+class AsyncConditionalGetMixin(AsyncViewMixin):
+	"""The ``get`` of ConditionalGetMixin, rendering with ``aget_page``."""
+
+	async def get(self, request, *args, **kwargs):
+		if len(get_messages(request)) or (
+			probe := await self.aget_probe()
+		) is None:
+			return await self.aget_page()
+
+		if (response := self.get_not_modified(probe)) is None:
+			response = await self.aget_page()
+		self.add_validators(response, probe)
+
+		return response
+
+	async def aget_page(self) -> HttpResponse:
+		raise NotImplementedError
+
+
+class AsyncListMixin(AsyncConditionalGetMixin):
+	async def aget_page(self) -> HttpResponse:
+		self.object_list = self.get_queryset()
+		self.paginated = await self.apaginate_queryset(
+			self.object_list, self.get_paginate_by(self.object_list)
+		)
+		context = await sync_to_async(self.get_context_data)()
+
+		return self.render_to_response(context)
+
+	def paginate_queryset(self, queryset, page_size):
+		return self.paginated
+
+
+class AsyncDetailMixin(AsyncConditionalGetMixin):
+	async def aget_page(self) -> HttpResponse:
+		self.object = await self.aget_object()
+		context = await sync_to_async(self.get_context_data)(
+			object=self.object
+		)
+
+		return self.render_to_response(context)
+
+	async def aget_object(self):
+		queryset = self.get_queryset()
+		try:
+			return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+		except queryset.model.DoesNotExist:
+			raise Http404(
+				_("No %(verbose_name)s found matching the query")
+				% {"verbose_name": queryset.model._meta.verbose_name}
+			)
+
+
+class WorkerListView(AsyncListMixin, views.WorkerListView):
+	pass
+
+
+class WorkerDetailView(AsyncDetailMixin, views.WorkerDetailView):
+	pass
+
+
+class TaskListView(AsyncListMixin, views.TaskListView):
+	pass
+
+
+class TaskDetailView(AsyncDetailMixin, views.TaskDetailView):
+	pass
@@ -0,0 +1,65 @@
+"""
+Authentication backend caching the users that sessions identify, with
+their position joined, so that an authenticated request needs no query
+to load ``request.user`` once its user and cached_db session are warm.
+
+Cached users are dropped by ``task_manager.signals`` when the worker is
+saved or deleted, a password change included, and all of them when any
+position is, positions being few and rarely edited. Task counts, which
+set-based updates keep, may lag by ``USER_CACHE_TIMEOUT``.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_KEY_PREFIX = "task_manager:user"
+POSITIONS_VERSION_KEY = "task_manager:user-positions-version"
+
+UserModel = get_user_model()
+
+
+class CachedModelBackend(ModelBackend):
+	def get_user(self, user_id):
+		key = make_user_key(user_id)
+		cached = cache.get_many([key, POSITIONS_VERSION_KEY])
+		if (version := cached.get(POSITIONS_VERSION_KEY)) is None:
+			version = get_positions_version()
+		user, user_version = cached.get(key, (None, None))
+		if user is None or user_version != version:
+			try:
+				user = UserModel._default_manager.select_related(
+					"position"
+				).get(pk=user_id)
+			except UserModel.DoesNotExist:
+				return None
+			cache.set(key, (user, version), settings.USER_CACHE_TIMEOUT)
+
+		return user if self.user_can_authenticate(user) else None
+
+
+def make_user_key(user_id) -> str:
+	return f"{USER_KEY_PREFIX}:{user_id}"
+
+
+def get_positions_version() -> int:
+	"""
+	Return the positions version, storing a fresh one when it is missing,
+	so users cached under an evicted version are never served.
+	"""
+	version = time.time_ns()
+	if cache.add(POSITIONS_VERSION_KEY, version, None):
+		return version
+
+	return cache.get(POSITIONS_VERSION_KEY, version)
+
+
+def invalidate_user(user_id) -> None:
+	cache.delete(make_user_key(user_id))
+
+
+def invalidate_positions() -> None:
+	"""Drop every cached user, for their positions changed."""
+	cache.set(POSITIONS_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,413 @@
+"""
+View benchmarks. Each route is requested through the test client against
+datasets of growing size, recording wall time, query count and SQL time,
+and compared with a stored JSON baseline to catch regressions.
+
+``LoadBenchmark`` instead drives running servers over many concurrent
+keep-alive connections, to compare the throughput of deployments, such
+as the WSGI and the ASGI ones, serving the same database.
+"""
+import http.client
+import json
+import math
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import count
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import (
+	BACKEND_SESSION_KEY,
+	HASH_SESSION_KEY,
+	SESSION_KEY,
+	get_user_model,
+)
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from task_manager.generators import DataGenerator
+from task_manager.models import Task, TaskType, Worker
+from task_manager.pagination import NEXT, KeysetPaginator
+from task_manager.views import TaskListView
+
+SIZES = (1000, 100_000, 1_000_000)
+REPEAT = 5
+THRESHOLD = 1.5
+# Timings below this many milliseconds are too noisy to compare.
+MIN_DELTA_MS = 5.0
+BASELINE_PATH = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+PAGE_SIZE = 10
+USERNAME = "benchmark-admin"
+LOAD_ROUTES = (
+	"index", "task_list", "task_detail", "worker_list", "worker_detail"
+)
+LOAD_CONNECTIONS = 50
+LOAD_DURATION = 10.0
+
+
+def build_dataset(size: int, using: str = "default") -> None:
+	"""
+	Grow the dataset to ``size`` tasks, with a worker for every 20 tasks.
+	Sizes are built incrementally, so a larger dataset contains the
+	smaller ones.
+	"""
+	missing = size - Task.objects.using(using).count()
+	if missing > 0:
+		DataGenerator(
+			workers=max(10, missing // 20),
+			tasks=missing,
+			seed=size,
+			prefix=f"benchmark-{size}",
+			using=using,
+		).generate()
+
+	if not Worker.objects.using(using).filter(username=USERNAME).exists():
+		get_user_model().objects.db_manager(using).create_superuser(
+			username=USERNAME, password=None
+		)
+
+
+class QueryTimer:
+	"""Database execute wrapper counting queries and their total time."""
+
+	def __init__(self) -> None:
+		self.count = 0
+		self.seconds = 0.0
+
+	def __call__(self, execute, sql, params, many, context):
+		started = time.perf_counter()
+		try:
+			return execute(sql, params, many, context)
+		finally:
+			self.seconds += time.perf_counter() - started
+			self.count += 1
+
+
+class ViewBenchmark:
+	"""Measures every benchmarked route against the current dataset."""
+
+	def __init__(self, repeat: int = REPEAT, using: str = "default") -> None:
+		self.repeat = repeat
+		self.using = using
+		self.client = Client()
+		self.client.force_login(
+			Worker.objects.using(using).get(username=USERNAME)
+		)
+		tasks = Task.objects.using(using)
+		self.task = tasks.order_by("pk").first()
+		self.task_type = TaskType.objects.using(using).first()
+		self.heavy_worker = Worker.objects.using(using).order_by(
+			"-active_task_count", "-resolved_task_count"
+		).first()
+		self.last_page = max(1, math.ceil(tasks.count() / PAGE_SIZE))
+		self.last_page_cursor = self.get_page_cursor(tasks, self.last_page)
+		self.sequence = count()
+
+	@staticmethod
+	def get_page_cursor(tasks, number: int) -> str:
+		"""
+		Return the task list cursor of the numbered page, for the keyset
+		pagination to seek the rows that ``?page=`` reaches by OFFSET.
+		"""
+		if number == 1:
+			return ""
+
+		ordering = TaskListView.keyset_ordering
+		row = tasks.order_by(*ordering)[(number - 1) * PAGE_SIZE - 1]
+
+		return KeysetPaginator(tasks, PAGE_SIZE, ordering).encode_cursor(
+			row, NEXT
+		)
+
+	def get_routes(self) -> dict[str, Callable[[], HttpResponse]]:
+		get, post = self.client.get, self.client.post
+		task_list = reverse("task_manager:task_list")
+
+		return {
+			"index": lambda: get(reverse("task_manager:index")),
+			"task_list": lambda: get(task_list),
+			"task_list_query": lambda: get(task_list, {"query": "task 1"}),
+			"task_list_deep_page": lambda: get(
+				task_list, {"page": self.last_page}
+			),
+			"task_list_deep_cursor": lambda: get(
+				task_list, {"cursor": self.last_page_cursor}
+			),
+			"task_detail": lambda: get(
+				reverse("task_manager:task_detail", args=[self.task.pk])
+			),
+			"worker_list": lambda: get(reverse("task_manager:worker_list")),
+			"worker_detail_heavy": lambda: get(
+				reverse(
+					"task_manager:worker_detail", args=[self.heavy_worker.pk]
+				)
+			),
+			"task_create_post": lambda: post(
+				reverse("task_manager:task_create"), self.get_task_data()
+			),
+			"task_update_post": lambda: post(
+				reverse("task_manager:task_update", args=[self.task.pk]),
+				self.get_task_data(name=self.task.name),
+			),
+		}
+
+	def get_task_data(self, name: str | None = None) -> dict:
+		number = next(self.sequence)
+
+		return {
+			"name": name or f"benchmark-created-{time.time_ns()}-{number}",
+			"description": f"Benchmark run {number}.",
+			"deadline": date.today() + timedelta(days=30),
+			"priority": number % 4 + 1,
+			"task_type": self.task_type.pk if self.task_type else "",
+			"assignees": [self.heavy_worker.pk],
+		}
+
+	def run(
+		self, routes: list[str] | None = None
+	) -> dict[str, dict[str, float]]:
+		all_routes = self.get_routes()
+
+		return {
+			name: self.measure(all_routes[name])
+			for name in routes or all_routes
+		}
+
+	def measure(self, request: Callable[[], HttpResponse]) -> dict:
+		"""
+		Return the median wall and SQL time in milliseconds over the runs,
+		after a warm-up request, and the query count of the last run.
+		"""
+		self._request(request)
+		wall_times, sql_times = [], []
+
+		for _ in range(self.repeat):
+			timer = QueryTimer()
+			with connections[self.using].execute_wrapper(timer):
+				started = time.perf_counter()
+				self._request(request)
+				wall_times.append((time.perf_counter() - started) * 1000)
+			sql_times.append(timer.seconds * 1000)
+
+		return {
+			"wall_ms": round(statistics.median(wall_times), 2),
+			"sql_ms": round(statistics.median(sql_times), 2),
+			"queries": timer.count,
+		}
+
+	@staticmethod
+	def _request(request: Callable[[], HttpResponse]) -> None:
+		response = request()
+		if response.status_code >= 400:
+			raise RuntimeError(
+				f"{response.request['PATH_INFO']} returned "
+				f"{response.status_code}."
+			)
+		if response.streaming:
+			b"".join(response.streaming_content)
+
+
+def get_load_paths(using: str = "default") -> dict[str, str]:
+	"""Return the path of each load route, for the benchmark user."""
+	task = Task.objects.using(using).order_by("pk").first()
+	worker = Worker.objects.using(using).order_by(
+		"-active_task_count", "-resolved_task_count"
+	).first()
+
+	return {
+		"index": reverse("task_manager:index"),
+		"task_list": reverse("task_manager:task_list"),
+		"task_detail": reverse("task_manager:task_detail", args=[task.pk]),
+		"worker_list": reverse("task_manager:worker_list"),
+		"worker_detail": reverse(
+			"task_manager:worker_detail", args=[worker.pk]
+		),
+	}
+
+
+@contextmanager
+def benchmark_session(using: str = "default") -> Iterator[str]:
+	"""
+	Log the benchmark user in and yield its session cookie, then delete
+	the session and the user. The session is stored in the ``using``
+	database, which the servers under test must serve from with a
+	database backed SESSION_ENGINE.
+	"""
+	user = Worker.objects.using(using).get(username=USERNAME)
+	session = Session.objects.using(using).create(
+		session_key=get_random_string(32, VALID_KEY_CHARS),
+		session_data=SessionStore().encode({
+			SESSION_KEY: str(user.pk),
+			BACKEND_SESSION_KEY: settings.AUTHENTICATION_BACKENDS[0],
+			HASH_SESSION_KEY: user.get_session_auth_hash(),
+		}),
+		expire_date=timezone.now()
+		+ timedelta(seconds=settings.SESSION_COOKIE_AGE),
+	)
+	try:
+		yield f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+	finally:
+		session.delete()
+		user.delete()
+
+
+class LoadBenchmark:
+	"""
+	Requests the paths in turn over ``connections`` keep-alive
+	connections to a running server for ``duration`` seconds, after each
+	connection has fetched every path once to warm the server up.
+	"""
+
+	def __init__(
+		self,
+		base_url: str,
+		paths: list[str],
+		cookie: str = "",
+		connections: int = LOAD_CONNECTIONS,
+		duration: float = LOAD_DURATION,
+	) -> None:
+		url = urlsplit(base_url)
+		self.connection_class = (
+			http.client.HTTPSConnection
+			if url.scheme == "https"
+			else http.client.HTTPConnection
+		)
+		self.netloc = url.netloc
+		self.prefix = url.path.rstrip("/")
+		self.paths = paths
+		self.headers = {"Cookie": cookie} if cookie else {}
+		self.connections = connections
+		self.duration = duration
+
+	def run(self) -> dict[str, float]:
+		"""
+		Return the requests per second, the median and 95th percentile
+		latency in milliseconds and the count of failed requests.
+		"""
+		barrier = threading.Barrier(self.connections + 1)
+		results = [([], [0]) for _ in range(self.connections)]
+		threads = [
+			threading.Thread(
+				target=self.load, args=(barrier, *result), daemon=True
+			)
+			for result in results
+		]
+		for thread in threads:
+			thread.start()
+		barrier.wait()
+		started = time.perf_counter()
+		for thread in threads:
+			thread.join()
+		elapsed = time.perf_counter() - started
+
+		latencies = sorted(ms for result in results for ms in result[0])
+		errors = sum(result[1][0] for result in results)
+
+		return {
+			"requests": len(latencies),
+			"requests_per_second": round(len(latencies) / elapsed, 1),
+			"p50_ms": round(_percentile(latencies, 0.5), 2),
+			"p95_ms": round(_percentile(latencies, 0.95), 2),
+			"errors": errors,
+		}
+
+	def load(
+		self, barrier: threading.Barrier, latencies: list, errors: list
+	) -> None:
+		connection = self.connection_class(self.netloc, timeout=30)
+		for path in self.paths:
+			self.request(connection, path)
+		barrier.wait()
+
+		deadline = time.perf_counter() + self.duration
+		sequence = 0
+		while (started := time.perf_counter()) < deadline:
+			path = self.paths[sequence % len(self.paths)]
+			sequence += 1
+			if self.request(connection, path):
+				latencies.append((time.perf_counter() - started) * 1000)
+			else:
+				errors[0] += 1
+		connection.close()
+
+	def request(self, connection, path: str) -> bool:
+		"""Fetch a page and return whether it succeeded."""
+		try:
+			connection.request("GET", self.prefix + path, headers=self.headers)
+			response = connection.getresponse()
+			response.read()
+		except (OSError, http.client.HTTPException):
+			connection.close()
+			return False
+
+		# Redirects, to the login or to HTTPS, would skip the page.
+		return 200 <= response.status < 300
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+	if not values:
+		return 0.0
+
+	return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def find_regressions(
+	results: dict[str, dict[str, dict]],
+	baseline: dict[str, dict[str, dict]],
+	threshold: float = THRESHOLD,
+) -> list[str]:
+	"""
+	Compare results with the baseline, both keyed by dataset size and
+	route. Any extra query is a regression; times regress when they grow
+	past ``threshold`` times the baseline by more than the noise floor.
+	A result missing from the baseline fails too, as it can't be checked.
+	"""
+	regressions = []
+
+	for size, routes in results.items():
+		for route, result in routes.items():
+			base = baseline.get(size, {}).get(route)
+			if base is None:
+				regressions.append(f"{size}/{route}: not in the baseline")
+				continue
+
+			if result["queries"] > base["queries"]:
+				regressions.append(
+					f"{size}/{route}: queries {base['queries']} -> "
+					f"{result['queries']}"
+				)
+			for metric in ("wall_ms", "sql_ms"):
+				if (
+					result[metric] > base[metric] * threshold
+					and result[metric] - base[metric] > MIN_DELTA_MS
+				):
+					regressions.append(
+						f"{size}/{route}: {metric} {base[metric]} -> "
+						f"{result[metric]}"
+					)
+
+	return regressions
+
+
+def load_baseline(path: Path) -> dict:
+	try:
+		return json.loads(path.read_text())
+	except FileNotFoundError:
+		return {}
+
+
+def save_baseline(path: Path, results: dict) -> None:
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
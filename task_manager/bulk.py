@@ -0,0 +1,120 @@
+"""
+Set-based task updates. Each action runs a fixed number of queries
+whatever the number of selected tasks, and keeps the counters, fragment
+cache, page cache and ``updated_at`` timestamps that single saves and
+signals maintain in step.
+"""
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from task_manager import counters, fragment_cache, page_cache
+from task_manager.models import Counter, Task, TaskType, Worker
+
+TaskAssignment = Task.assignees.through
+
+
+def complete_tasks(tasks: QuerySet) -> int:
+	"""Mark the tasks as completed and return how many were still open."""
+	with transaction.atomic():
+		completed = tasks.filter(is_completed=False).update(
+			is_completed=True, updated_at=timezone.now()
+		)
+		counters.increment({Counter.ACTIVE_TASKS: -completed})
+		counters.refresh_worker_task_counts(_assignees_of(tasks))
+
+	_invalidate(
+		_task_ids(tasks), page_cache.TASK_LIST, page_cache.WORKER_LIST
+	)
+
+	return completed
+
+
+def set_priority(tasks: QuerySet, priority: int) -> int:
+	updated = tasks.update(priority=priority, updated_at=timezone.now())
+	_invalidate(_task_ids(tasks), page_cache.TASK_LIST)
+
+	return updated
+
+
+def set_task_type(tasks: QuerySet, task_type: TaskType | None) -> int:
+	updated = tasks.update(task_type=task_type, updated_at=timezone.now())
+	_invalidate(_task_ids(tasks))
+
+	return updated
+
+
+def add_assignees(tasks: QuerySet, worker_ids: Iterable[int]) -> int:
+	"""
+	Assign the workers to every task with one INSERT that skips existing
+	assignments, and return the number of selected tasks.
+	"""
+	worker_ids = list(worker_ids)
+	task_ids = _task_ids(tasks)
+
+	with transaction.atomic():
+		TaskAssignment.objects.bulk_create(
+			[
+				TaskAssignment(task_id=task_id, worker_id=worker_id)
+				for task_id in task_ids
+				for worker_id in worker_ids
+			],
+			ignore_conflicts=True,
+		)
+		Task.objects.filter(pk__in=task_ids).update(
+			updated_at=timezone.now()
+		)
+		counters.refresh_worker_task_counts(
+			Worker.objects.filter(pk__in=worker_ids)
+		)
+
+	fragment_cache.bump_versions(task_ids)
+	page_cache.purge({page_cache.WORKER_LIST})
+
+	return len(task_ids)
+
+
+def remove_assignees(tasks: QuerySet, worker_ids: Iterable[int]) -> int:
+	"""Unassign the workers from every task and return the rows removed."""
+	worker_ids = list(worker_ids)
+	# Read the tasks first: once users unassign themselves, ``tasks``
+	# filtered by ``editable_by()`` no longer matches them.
+	task_ids = _task_ids(tasks)
+
+	with transaction.atomic():
+		removed, _ = TaskAssignment.objects.filter(
+			task_id__in=task_ids, worker_id__in=worker_ids
+		).delete()
+		if removed:
+			Task.objects.filter(pk__in=task_ids).update(
+				updated_at=timezone.now()
+			)
+		counters.refresh_worker_task_counts(
+			Worker.objects.filter(pk__in=worker_ids)
+		)
+
+	_invalidate(task_ids, page_cache.WORKER_LIST)
+
+	return removed
+
+
+def _assignees_of(tasks: QuerySet) -> QuerySet:
+	return Worker.objects.filter(
+		pk__in=TaskAssignment.objects.filter(
+			task__in=tasks.values("pk")
+		).values("worker_id")
+	)
+
+
+def _task_ids(tasks: QuerySet) -> list[int]:
+	return list(tasks.values_list("pk", flat=True))
+
+
+def _invalidate(task_ids: list[int], *page_keys: str) -> None:
+	"""Invalidate the tasks' fragments and purge their pages."""
+	fragment_cache.bump_versions(task_ids)
+	page_cache.purge(
+		{*page_keys, *(page_cache.task_key(task_id) for task_id in task_ids)}
+	)
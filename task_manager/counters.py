@@ -0,0 +1,164 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import (
+	Case,
+	Count,
+	F,
+	Model,
+	OuterRef,
+	QuerySet,
+	Subquery,
+	Value,
+	When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from task_manager import page_cache
+from task_manager.models import Counter, Task, Worker
+
+COUNTER_NAMES = (
+	Counter.TOTAL_TASKS,
+	Counter.ACTIVE_TASKS,
+	Counter.TOTAL_USERS,
+)
+
+
+def get_counters(using: str = "default") -> dict[str, int]:
+	"""Return every dashboard counter in a single query."""
+	counters = dict.fromkeys(COUNTER_NAMES, 0)
+	counters.update(_counter_values(using))
+
+	return counters
+
+
+async def aget_counters(using: str = "default") -> dict[str, int]:
+	counters = dict.fromkeys(COUNTER_NAMES, 0)
+	async for name, value in _counter_values(using):
+		counters[name] = value
+
+	return counters
+
+
+def get_list_probe(
+	model: type[Model], name: str, using: str = "default"
+) -> tuple[int, datetime | None] | None:
+	"""
+	Return the counter of the model's rows with their latest
+	``updated_at`` in a single query, which together change whenever a
+	row is saved, touched or deleted.
+	"""
+	latest = model._default_manager.using(using).order_by(
+		"-updated_at"
+	).values("updated_at")[:1]
+
+	return Counter.objects.using(using).filter(name=name).values_list(
+		"value", Subquery(latest)
+	).first()
+
+
+def increment(deltas: dict[str, int], using: str = "default") -> None:
+	"""Add the deltas to their counters with a single UPDATE."""
+	deltas = {name: delta for name, delta in deltas.items() if delta}
+	if not deltas:
+		return
+
+	Counter.objects.using(using).filter(name__in=deltas).update(
+		value=F("value") + Case(
+			*(
+				When(name=name, then=Value(delta))
+				for name, delta in deltas.items()
+			)
+		)
+	)
+
+
+def count_rows(using: str = "default") -> dict[str, int]:
+	"""Count the rows each counter stands for, straight from the tables."""
+	tasks = Task.objects.using(using)
+
+	return {
+		Counter.TOTAL_TASKS: tasks.count(),
+		Counter.ACTIVE_TASKS: tasks.filter(is_completed=False).count(),
+		Counter.TOTAL_USERS: Worker.objects.using(using).count(),
+	}
+
+
+def reconcile(using: str = "default") -> dict[str, tuple[int, int]]:
+	"""
+	Overwrite drifted counters with the real counts and return the fixed
+	ones as ``{name: (stored, actual)}``. Counter rows are locked while
+	counting so concurrent increments can't be lost. Per-worker task
+	counts are recounted as well, and the list pages purged on drift.
+	"""
+	fixed = {}
+
+	with transaction.atomic(using=using):
+		stored = {
+			counter.name: counter
+			for counter in Counter.objects.using(using).select_for_update()
+		}
+		for name, actual in count_rows(using).items():
+			counter = stored.get(name) or Counter(name=name, value=None)
+			if counter.value != actual:
+				fixed[name] = (counter.value or 0, actual)
+				counter.value = actual
+				counter.save(using=using)
+
+		refreshed = refresh_worker_task_counts(
+			Worker.objects.using(using).all()
+		)
+		if fixed or refreshed:
+			page_cache.purge(
+				{page_cache.TASK_LIST, page_cache.WORKER_LIST}, using
+			)
+
+	return fixed
+
+
+def refresh_worker_task_counts(workers: QuerySet) -> int:
+	"""
+	Recount active and resolved tasks of the given workers with a single
+	UPDATE of correlated subqueries, and return the number of workers
+	whose counts changed. The others, ``updated_at`` included, are left
+	alone, so a recount of every worker writes the drifted rows only.
+	"""
+	active = _count_assigned_tasks(is_completed=False)
+	resolved = _count_assigned_tasks(is_completed=True)
+
+	return workers.alias(
+		actual_active=active, actual_resolved=resolved
+	).exclude(
+		active_task_count=F("actual_active"),
+		resolved_task_count=F("actual_resolved"),
+	).update(
+		active_task_count=active,
+		resolved_task_count=resolved,
+		updated_at=timezone.now(),
+	)
+
+
+def shift_worker_task_counts(workers: QuerySet, is_completed: bool) -> int:
+	"""Move one task between the workers' active and resolved counts."""
+	delta = -1 if is_completed else 1
+
+	return workers.update(
+		active_task_count=F("active_task_count") + delta,
+		resolved_task_count=F("resolved_task_count") - delta,
+		updated_at=timezone.now(),
+	)
+
+
+def _counter_values(using: str) -> QuerySet:
+	return Counter.objects.using(using).filter(
+		name__in=COUNTER_NAMES
+	).values_list("name", "value")
+
+
+def _count_assigned_tasks(is_completed: bool) -> Coalesce:
+	assignments = Task.assignees.through.objects.filter(
+		worker_id=OuterRef("pk"), task__is_completed=is_completed
+	).order_by().values("worker_id").annotate(count=Count("*"))
+
+	return Coalesce(Subquery(assignments.values("count")), 0)
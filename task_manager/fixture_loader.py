@@ -0,0 +1,272 @@
+"""
+Streaming counterpart of ``loaddata`` for JSON fixtures. Objects are parsed
+one at a time, buffered per model and inserted in batches, foreign key
+targets first and many-to-many rows last, so memory is bounded by the
+batch size rather than the fixture size. Constraints are checked once for
+all loaded tables at the end, like ``loaddata`` does.
+"""
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializedObject
+from django.core.serializers.python import Deserializer
+from django.db import connections, transaction
+from django.db.models import Model
+from django.db.models.constants import OnConflict
+
+from task_manager import counters, fragment_cache, page_cache, search
+from task_manager.models import Task, Worker
+
+BATCH_SIZE = 1000
+READ_SIZE = 64 * 1024
+SEPARATORS = " \t\r\n,[]"
+
+
+def iter_json_objects(
+	stream: TextIO, read_size: int = READ_SIZE
+) -> Iterator[dict]:
+	"""
+	Yield the objects of a JSON array, or of JSON Lines, holding only the
+	text of the object being decoded in memory.
+	"""
+	decoder = json.JSONDecoder()
+	buffer = ""
+	position = 0
+	exhausted = False
+
+	while True:
+		while position < len(buffer) and buffer[position] in SEPARATORS:
+			position += 1
+
+		if position == len(buffer):
+			if exhausted:
+				return
+			buffer, position = stream.read(read_size), 0
+			exhausted = not buffer
+			continue
+
+		try:
+			obj, position = decoder.raw_decode(buffer, position)
+		except json.JSONDecodeError:
+			if exhausted:
+				raise
+			data = stream.read(read_size)
+			exhausted = not data
+			buffer, position = buffer[position:] + data, 0
+			continue
+
+		if not isinstance(obj, dict):
+			raise ValueError(f"Expected a fixture object, got {obj!r}.")
+
+		yield obj
+
+
+def sort_models(models: Iterable[type[Model]]) -> list[type[Model]]:
+	"""Order the models so that foreign key targets come first."""
+	models = sorted(models, key=lambda model: model._meta.label)
+	ordered = []
+
+	def visit(model: type[Model], path: set) -> None:
+		if model in ordered or model in path:
+			return
+		path.add(model)
+		for field in model._meta.concrete_fields:
+			if field.related_model in models:
+				visit(field.related_model, path)
+		ordered.append(model)
+
+	for model in models:
+		visit(model, set())
+
+	return ordered
+
+
+class FixtureLoader:
+	def __init__(
+		self,
+		using: str = "default",
+		batch_size: int = BATCH_SIZE,
+		ignorenonexistent: bool = False,
+	) -> None:
+		self.using = using
+		self.batch_size = batch_size
+		self.ignorenonexistent = ignorenonexistent
+		self.connection = connections[using]
+		self.pending: dict[type[Model], list[DeserializedObject]] = (
+			defaultdict(list)
+		)
+		self.deferred: list[DeserializedObject] = []
+		self.loaded: dict[type[Model], int] = defaultdict(int)
+
+	def load(self, stream: TextIO) -> dict[type[Model], int]:
+		"""Load the fixture and return the object count of each model."""
+		with transaction.atomic(using=self.using):
+			with self.connection.constraint_checks_disabled():
+				for deserialized in Deserializer(
+					iter_json_objects(stream),
+					using=self.using,
+					ignorenonexistent=self.ignorenonexistent,
+				):
+					self.add(deserialized)
+				self.flush()
+
+				for deserialized in self.deferred:
+					deserialized.save_deferred_fields(using=self.using)
+
+			self.connection.check_constraints(
+				table_names=self.table_names()
+			)
+			self.reset_sequences()
+			self.refresh_denormalized()
+
+		return dict(self.loaded)
+
+	def add(self, deserialized: DeserializedObject) -> None:
+		model = type(deserialized.object)
+		self.pending[model].append(deserialized)
+
+		if len(self.pending[model]) >= self.batch_size:
+			self.flush()
+
+	def flush(self) -> None:
+		"""Insert every buffered object, then its many-to-many rows."""
+		batches = [
+			(model, self.pending.pop(model))
+			for model in sort_models(list(self.pending))
+		]
+
+		for model, batch in batches:
+			self.insert(model, [item.object for item in batch])
+			self.deferred += [
+				deserialized for deserialized in batch
+				if deserialized.deferred_fields
+			]
+			self.loaded[model] += len(batch)
+
+		for model, batch in batches:
+			self.insert_m2m(model, batch)
+			if model is Task:
+				fragment_cache.bump_versions(
+					deserialized.object.pk for deserialized in batch
+				)
+
+	def insert(self, model: type[Model], objs: list[Model]) -> None:
+		"""
+		Insert the objects as raw rows, like ``loaddata``'s raw saves, so
+		``auto_now_add`` values come from the fixture. Rows whose primary
+		key exists are overwritten.
+		"""
+		opts = model._meta
+		fields = list(opts.local_concrete_fields)
+		queryset = model._base_manager.using(self.using)
+
+		with_pk = [obj for obj in objs if obj.pk is not None]
+		for batch in self._batches(fields, with_pk):
+			queryset._insert(
+				batch,
+				fields=fields,
+				raw=True,
+				using=self.using,
+				on_conflict=OnConflict.UPDATE,
+				update_fields=[f for f in fields if not f.primary_key],
+				unique_fields=[opts.pk],
+			)
+
+		fields = [field for field in fields if not field.primary_key]
+		without_pk = [obj for obj in objs if obj.pk is None]
+		for batch in self._batches(fields, without_pk):
+			rows = queryset._insert(
+				batch,
+				fields=fields,
+				returning_fields=[opts.pk],
+				raw=True,
+				using=self.using,
+			)
+			for obj, (pk,) in zip(batch, rows):
+				obj.pk = pk
+
+		for obj in objs:
+			obj._state.adding = False
+			obj._state.db = self.using
+
+	def insert_m2m(
+		self, model: type[Model], batch: list[DeserializedObject]
+	) -> None:
+		"""Replace the batch's many-to-many rows with a DELETE and INSERT."""
+		for field in model._meta.many_to_many:
+			through = field.remote_field.through
+			source = field.m2m_field_name()
+			target = field.m2m_reverse_field_name()
+			related = {
+				deserialized.object.pk: deserialized.m2m_data[field.name]
+				for deserialized in batch
+				if field.name in deserialized.m2m_data
+			}
+			if not related:
+				continue
+
+			through._base_manager.using(self.using).filter(
+				**{f"{source}__in": related}
+			).delete()
+			through._base_manager.using(self.using).bulk_create(
+				[
+					through(**{f"{source}_id": pk, f"{target}_id": target_pk})
+					for pk, target_pks in related.items()
+					for target_pk in target_pks
+				],
+				batch_size=self.batch_size,
+				ignore_conflicts=True,
+			)
+
+	def table_names(self) -> list[str]:
+		"""Return the tables loaded into, many-to-many tables included."""
+		return [
+			table
+			for model in self.loaded
+			for table in (
+				model._meta.db_table,
+				*(
+					field.remote_field.through._meta.db_table
+					for field in model._meta.many_to_many
+				),
+			)
+		]
+
+	def reset_sequences(self) -> None:
+		statements = self.connection.ops.sequence_reset_sql(
+			no_style(), list(self.loaded)
+		)
+		if statements:
+			with self.connection.cursor() as cursor:
+				for sql in statements:
+					cursor.execute(sql)
+
+	def refresh_denormalized(self) -> None:
+		"""
+		Recount, reindex and purge cached pages, as signals would have.
+		"""
+		if Task in self.loaded or Worker in self.loaded:
+			counters.reconcile(using=self.using)
+		for model in (Task, Worker):
+			if model in self.loaded:
+				search.rebuild_sqlite_index(model, using=self.using)
+		if self.loaded:
+			page_cache.purge(
+				{page_cache.TASK_LIST, page_cache.WORKER_LIST}, self.using
+			)
+
+	def _batches(
+		self, fields: list, objs: list[Model]
+	) -> Iterator[list[Model]]:
+		batch_size = max(
+			1,
+			min(
+				self.batch_size,
+				self.connection.ops.bulk_batch_size(fields, objs),
+			),
+		)
+		for start in range(0, len(objs), batch_size):
+			yield objs[start:start + batch_size]
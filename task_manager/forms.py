@@ -4,7 +4,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 
-from task_manager.models import Position, Task
+from task_manager.models import Position, Task, TaskType
 
 
 class SearchForm(forms.Form):
@@ -17,7 +17,120 @@ class SearchForm(forms.Form):
 	)
 
 
-class TaskForm(forms.ModelForm):
+class IdListField(forms.Field):
+	"""A list of primary keys posted as repeated values."""
+
+	widget = forms.MultipleHiddenInput
+
+	def to_python(self, value) -> list[int]:
+		if not value:
+			return []
+
+		try:
+			return sorted({int(pk) for pk in value})
+		except (TypeError, ValueError):
+			raise ValidationError("Enter a list of ids.", code="invalid")
+
+
+class TaskBulkActionForm(forms.Form):
+	COMPLETE = "complete"
+	SET_PRIORITY = "set_priority"
+	SET_TASK_TYPE = "set_task_type"
+	ADD_ASSIGNEES = "add_assignees"
+	REMOVE_ASSIGNEES = "remove_assignees"
+	ACTION_CHOICES = [
+		(COMPLETE, "Mark as completed"),
+		(SET_PRIORITY, "Change priority"),
+		(SET_TASK_TYPE, "Change task type"),
+		(ADD_ASSIGNEES, "Add assignees"),
+		(REMOVE_ASSIGNEES, "Remove assignees"),
+	]
+
+	action = forms.ChoiceField(
+		choices=ACTION_CHOICES,
+		widget=forms.Select(attrs={"class": "form-select"}),
+	)
+	tasks = IdListField(
+		error_messages={"required": "Select at least one task."}
+	)
+	priority = forms.TypedChoiceField(
+		choices=Task.PRIORITY_CHOICES,
+		coerce=int,
+		required=False,
+		widget=forms.Select(attrs={"class": "form-select"}),
+	)
+	task_type = forms.ModelChoiceField(
+		queryset=TaskType.objects,
+		required=False,
+		widget=forms.Select(attrs={"class": "form-select"}),
+	)
+	assignees = forms.CharField(
+		required=False,
+		widget=forms.TextInput(
+			attrs={
+				"class": "form-control",
+				"placeholder": "Usernames, comma separated",
+			}
+		),
+	)
+
+	def clean_assignees(self) -> list[int]:
+		usernames = {
+			username.strip()
+			for username in self.cleaned_data["assignees"].split(",")
+			if username.strip()
+		}
+		found = dict(
+			get_user_model().objects.filter(
+				username__in=usernames
+			).values_list("username", "pk")
+		)
+
+		if unknown := usernames - set(found):
+			raise ValidationError(
+				f"Unknown users: {', '.join(sorted(unknown))}."
+			)
+
+		return list(found.values())
+
+	def clean(self):
+		cleaned_data = super().clean()
+		action = cleaned_data.get("action")
+		required = {
+			self.SET_PRIORITY: "priority",
+			self.SET_TASK_TYPE: "task_type",
+			self.ADD_ASSIGNEES: "assignees",
+			self.REMOVE_ASSIGNEES: "assignees",
+		}.get(action)
+
+		if (
+			required
+			and required not in self.errors
+			and not cleaned_data.get(required)
+		):
+			self.add_error(required, "This field is required.")
+
+		return cleaned_data
+
+
+class ValidatedModelFormMixin:
+	"""
+	Marks the fields a valid form checked as validated on its instance,
+	whose save() would otherwise run the same unique and foreign key
+	queries again.
+	"""
+
+	def validate_unique(self) -> None:
+		super().validate_unique()
+		if not self._errors:
+			exclude = self._get_validation_exclusions()
+			self.instance.mark_validated(
+				field.name for field in self.instance._meta.concrete_fields
+				if field.name not in exclude
+			)
+
+
+class TaskForm(ValidatedModelFormMixin, forms.ModelForm):
 	priority = forms.ChoiceField(
 		choices=Task.PRIORITY_CHOICES,
 		widget=forms.RadioSelect
@@ -57,6 +170,29 @@ class TaskForm(forms.ModelForm):
 			"assignees": forms.SelectMultiple(attrs={"class": "form-select"})
 		}
 
+	def save(self, commit: bool = True) -> Task:
+		"""
+		Save the assignees of changed tasks first, so that the task's own
+		save sets the ``updated_at`` covering them instead of the assignee
+		changes touching the task again.
+		"""
+		if (
+			not commit
+			or self.errors
+			or self.instance._state.adding
+			or not self.instance.get_dirty_fields()
+		):
+			return super().save(commit)
+
+		self.instance._saving_assignees = True
+		try:
+			self._save_m2m()
+		finally:
+			del self.instance._saving_assignees
+		self.instance.save()
+
+		return self.instance
+
 
 class WorkerBaseForm(forms.ModelForm):
 	username = forms.CharField(
@@ -0,0 +1,135 @@
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from datetime import date
+
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.backends.base import BaseCache
+
+from task_manager import metrics
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+VERSION_TIMEOUT = None
+VERSION_KEY_PREFIX = "task_manager:task-version"
+FRAGMENT_KEY_PREFIX = "task_manager:task-fragment"
+
+
+def get_cache() -> BaseCache:
+	"""
+	Return the ``template_fragments`` cache when configured, like Django's
+	``{% cache %}`` tag does, and the default cache otherwise.
+	"""
+	try:
+		return caches["template_fragments"]
+	except InvalidCacheBackendError:
+		return caches["default"]
+
+
+def get_versions(task_ids: Iterable[int]) -> dict[int, int]:
+	"""
+	Return the fragment version of every task in one cache round trip.
+	Tasks without a stored version get a fresh one, so fragments cached
+	under an evicted version can never be served again.
+	"""
+	cache = get_cache()
+	keys = {_version_key(task_id): task_id for task_id in task_ids}
+	versions = {
+		keys[key]: version for key, version in cache.get_many(keys).items()
+	}
+
+	if missing := set(keys.values()) - set(versions):
+		fresh = {task_id: time.time_ns() for task_id in missing}
+		cache.set_many(
+			{_version_key(task_id): v for task_id, v in fresh.items()},
+			VERSION_TIMEOUT,
+		)
+		versions.update(fresh)
+
+	return versions
+
+
+def load_versions(tasks: Iterable) -> None:
+	"""Attach fragment versions to the tasks before they are rendered."""
+	tasks = list(tasks)
+	versions = get_versions(task.pk for task in tasks)
+
+	for task in tasks:
+		task._fragment_version = versions[task.pk]
+
+
+def load_fragments(tasks: Iterable, name: str, *vary_on: Callable) -> None:
+	"""
+	Fetch the versions and then the cached ``name`` fragments of the tasks
+	in two cache round trips, for ``{% taskfragment %}`` to read instead
+	of looking up each fragment. ``vary_on`` are functions returning the
+	tag's extra ``vary_on`` arguments of a task.
+	"""
+	tasks = list(tasks)
+	load_versions(tasks)
+	keys = [
+		make_fragment_key(
+			name, task, *get_vary_on(*(vary(task) for vary in vary_on))
+		)
+		for task in tasks
+	]
+	fragments = get_cache().get_many(keys)
+
+	for task, key in zip(tasks, keys):
+		task.__dict__.setdefault("_fragments", {})[key] = fragments.get(key)
+
+
+def get_vary_on(*vary_on) -> tuple:
+	"""Return what a task fragment varies on besides the task."""
+	# The overdue indicator changes at midnight.
+	return (date.today(), *vary_on)
+
+
+def bump_versions(task_ids: Iterable[int]) -> None:
+	"""Invalidate every cached fragment of the given tasks."""
+	version = time.time_ns()
+	get_cache().set_many(
+		{_version_key(task_id): version for task_id in task_ids},
+		VERSION_TIMEOUT,
+	)
+
+
+def make_fragment_key(name: str, task, *vary_on) -> str:
+	version = getattr(task, "_fragment_version", None)
+	if version is None:
+		version = get_versions([task.pk])[task.pk]
+	digest = hashlib.md5(
+		":".join(str(value) for value in (version, *vary_on)).encode(),
+		usedforsecurity=False,
+	).hexdigest()
+
+	return f"{FRAGMENT_KEY_PREFIX}:{name}:{task.pk}:{digest}"
+
+
+def record(hit: bool) -> None:
+	"""Count a fragment lookup in the metrics of the current request."""
+	if (request_metrics := metrics.get_current()) is None:
+		return
+	if hit:
+		request_metrics.fragment_hits += 1
+	else:
+		request_metrics.fragment_misses += 1
+
+
+def get_stats() -> dict[str, int]:
+	"""Return the fragment cache hit and miss counts of every process."""
+	totals = {
+		"request_fragment_cache_hits": 0,
+		"request_fragment_cache_misses": 0,
+	}
+	for (metric, *_), sample in metrics.store.collect().items():
+		if metric in totals:
+			totals[metric] += int(sample[1])
+
+	return {
+		"hits": totals["request_fragment_cache_hits"],
+		"misses": totals["request_fragment_cache_misses"],
+	}
+
+
+def _version_key(task_id: int) -> str:
+	return f"{VERSION_KEY_PREFIX}:{task_id}"
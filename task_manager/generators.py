@@ -0,0 +1,230 @@
+"""
+Deterministic synthetic datasets for reproducing production volumes.
+Rows are generated in fixed batches, each from its own seeded random
+generator, so the data only depends on the seed and the sizes, not on
+how many processes inserted it. Inserts go through ``bulk_create`` and
+keep counters and search indexes in step, since they skip signals.
+"""
+import datetime
+import multiprocessing
+import random
+from collections.abc import Callable
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import connections, transaction
+
+from task_manager import counters, page_cache, search
+from task_manager.models import Counter, Position, Task, TaskType, Worker
+
+BATCH_SIZE = 5000
+PRIORITY_WEIGHTS = {4: 1, 3: 2, 2: 4, 1: 3}
+
+TaskAssignment = Task.assignees.through
+
+# Set in worker processes, which inherit it when forked.
+_generator: "DataGenerator | None" = None
+
+
+class DataGenerator:
+	def __init__(
+		self,
+		workers: int = 1000,
+		tasks: int = 10000,
+		positions: int = 10,
+		task_types: int = 10,
+		priority_weights: dict[int, float] | None = None,
+		deadline_days: tuple[int, int] = (-30, 90),
+		completed_ratio: float = 0.3,
+		assignees: tuple[int, int] = (1, 3),
+		seed: int = 0,
+		prefix: str = "generated",
+		batch_size: int = BATCH_SIZE,
+		using: str = "default",
+	) -> None:
+		self.workers = workers
+		self.tasks = tasks
+		self.positions = positions
+		self.task_types = task_types
+		self.priority_weights = priority_weights or PRIORITY_WEIGHTS
+		self.deadline_days = deadline_days
+		self.completed_ratio = completed_ratio
+		self.assignees = assignees
+		self.seed = seed
+		self.prefix = prefix
+		self.batch_size = batch_size
+		self.using = using
+		self.today = datetime.date.today()
+		self.position_ids: list[int] = []
+		self.task_type_ids: list[int] = []
+		self.worker_ids: list[int] = []
+
+	def can_run_in_parallel(self) -> bool:
+		"""SQLite allows a single writer, so processes would only queue."""
+		return connections[self.using].vendor != "sqlite"
+
+	def exists(self) -> bool:
+		"""Tell whether rows with this prefix were generated before."""
+		return (
+			Worker.objects.using(self.using).filter(
+				username__startswith=f"{self.prefix}-"
+			).exists()
+			or Task.objects.using(self.using).filter(
+				name__startswith=f"{self.prefix}-"
+			).exists()
+		)
+
+	def generate(self, processes: int = 1) -> dict[str, int]:
+		"""Generate every model and return how many rows each got."""
+		if not self.can_run_in_parallel():
+			processes = 1
+
+		self.position_ids = self._create_named(Position, self.positions)
+		self.task_type_ids = self._create_named(TaskType, self.task_types)
+		self._run(self.generate_workers, self.workers, processes)
+		workers = Worker.objects.using(self.using).filter(
+			username__startswith=f"{self.prefix}-"
+		)
+		# Parallel batches insert in any order, so list the pks in the
+		# order of the generated indexes rather than by pk.
+		pks = dict(workers.values_list("username", "pk"))
+		self.worker_ids = [
+			pks[self._username(index)] for index in range(self.workers)
+		]
+		self._run(self.generate_tasks, self.tasks, processes)
+		counters.refresh_worker_task_counts(workers)
+		page_cache.purge(
+			{page_cache.TASK_LIST, page_cache.WORKER_LIST}, self.using
+		)
+
+		return {
+			"positions": self.positions,
+			"task types": self.task_types,
+			"workers": self.workers,
+			"tasks": self.tasks,
+		}
+
+	def generate_workers(self, batch: int) -> None:
+		rng = self._random("workers", batch)
+		workers = [
+			Worker(
+				username=self._username(index),
+				first_name=f"First{index}",
+				last_name=f"Last{index}",
+				email=f"{self._username(index)}@example.com",
+				password=UNUSABLE_PASSWORD_PREFIX,
+				position_id=(
+					rng.choice(self.position_ids)
+					if self.position_ids else None
+				),
+			)
+			for index in self._indexes(batch, self.workers)
+		]
+
+		with transaction.atomic(using=self.using):
+			Worker.objects.using(self.using).bulk_create(workers)
+			counters.increment(
+				{Counter.TOTAL_USERS: len(workers)}, using=self.using
+			)
+			search.index_sqlite_rows(
+				Worker, [worker.pk for worker in workers], using=self.using
+			)
+
+	def generate_tasks(self, batch: int) -> None:
+		rng = self._random("tasks", batch)
+		priorities = list(self.priority_weights)
+		weights = list(self.priority_weights.values())
+		tasks, assignees = [], []
+
+		for index in self._indexes(batch, self.tasks):
+			tasks.append(
+				Task(
+					name=f"{self.prefix}-task-{index}",
+					description=f"Generated task {index}.",
+					deadline=self.today + datetime.timedelta(
+						days=rng.randint(*self.deadline_days)
+					),
+					is_completed=rng.random() < self.completed_ratio,
+					priority=rng.choices(priorities, weights)[0],
+					task_type_id=(
+						rng.choice(self.task_type_ids)
+						if self.task_type_ids else None
+					),
+				)
+			)
+			count = min(rng.randint(*self.assignees), len(self.worker_ids))
+			assignees.append(rng.sample(self.worker_ids, count))
+
+		with transaction.atomic(using=self.using):
+			Task.objects.using(self.using).bulk_create(tasks)
+			TaskAssignment.objects.using(self.using).bulk_create(
+				[
+					TaskAssignment(task_id=task.pk, worker_id=worker_id)
+					for task, worker_ids in zip(tasks, assignees)
+					for worker_id in worker_ids
+				]
+			)
+			counters.increment(
+				{
+					Counter.TOTAL_TASKS: len(tasks),
+					Counter.ACTIVE_TASKS: sum(
+						not task.is_completed for task in tasks
+					),
+				},
+				using=self.using,
+			)
+			search.index_sqlite_rows(
+				Task, [task.pk for task in tasks], using=self.using
+			)
+
+	def _create_named(self, model, count: int) -> list[int]:
+		label = model._meta.model_name
+		objs = model.objects.using(self.using).bulk_create(
+			[model(name=f"{self.prefix}-{label}-{i}") for i in range(count)]
+		)
+
+		return [obj.pk for obj in objs]
+
+	def _run(
+		self, generate: Callable[[int], None], total: int, processes: int
+	) -> None:
+		batches = range((total + self.batch_size - 1) // self.batch_size)
+
+		if processes <= 1 or len(batches) <= 1:
+			for batch in batches:
+				generate(batch)
+			return
+
+		# Forked processes must open their own database connections.
+		connections.close_all()
+		context = multiprocessing.get_context("fork")
+		with context.Pool(
+			processes, initializer=_set_generator, initargs=(self,)
+		) as pool:
+			pool.map(
+				_run_batch,
+				[(generate.__name__, batch) for batch in batches],
+			)
+
+	def _username(self, index: int) -> str:
+		return f"{self.prefix}-worker-{index}"
+
+	def _indexes(self, batch: int, total: int) -> range:
+		start = batch * self.batch_size
+
+		return range(start, min(start + self.batch_size, total))
+
+	def _random(self, name: str, batch: int) -> random.Random:
+		return random.Random(f"{self.seed}:{name}:{batch}")
+
+
+def _set_generator(generator: DataGenerator) -> None:
+	global _generator
+	_generator = generator
+
+
+def _run_batch(args: tuple[str, int]) -> None:
+	method, batch = args
+	try:
+		getattr(_generator, method)(batch)
+	finally:
+		connections.close_all()
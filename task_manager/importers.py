@@ -0,0 +1,447 @@
+"""
+Bulk importers for tasks and workers. Records are read from CSV or NDJSON
+in chunks; each chunk is validated in Python, checked for existing rows
+with one IN query per unique field, and written set-based: COPY into a
+staging table plus a merging INSERT on PostgreSQL, ``bulk_create`` on
+other databases. Inserts skip signals, so the importers update counters
+and search indexes themselves.
+"""
+import csv
+import io
+import json
+import time
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.db.models import Model
+
+from task_manager import counters, page_cache, search
+from task_manager.models import Counter, Position, Task, TaskType, Worker
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+BATCH_SIZE = 1000
+
+TRUE_VALUES = ("1", "t", "true", "y", "yes")
+FALSE_VALUES = ("", "0", "f", "false", "n", "no")
+
+TaskAssignment = Task.assignees.through
+
+
+class ImportStats:
+	def __init__(self) -> None:
+		self.created = 0
+		self.skipped = 0
+		self.errors: list[str] = []
+		self.started = time.perf_counter()
+		self.finished: float | None = None
+
+	@property
+	def processed(self) -> int:
+		return self.created + self.skipped + len(self.errors)
+
+	@property
+	def elapsed(self) -> float:
+		return (self.finished or time.perf_counter()) - self.started
+
+	@property
+	def rows_per_second(self) -> float:
+		return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+def read_records(stream: Iterable[str], format: str) -> Iterator[dict]:
+	"""Yield one dict per CSV row or NDJSON line, skipping blank lines."""
+	if format == CSV:
+		yield from csv.DictReader(stream)
+	elif format == NDJSON:
+		for number, line in enumerate(stream, start=1):
+			if not line.strip():
+				continue
+			try:
+				yield json.loads(line)
+			except json.JSONDecodeError as error:
+				raise ValueError(f"Line {number}: {error}.")
+	else:
+		raise ValueError(f"Unknown format: {format}.")
+
+
+def parse_list(value) -> list[str]:
+	"""Split a comma separated string, or clean up an NDJSON list."""
+	if not value:
+		return []
+	if isinstance(value, str):
+		value = value.split(",")
+
+	return [str(item).strip() for item in value if str(item).strip()]
+
+
+def parse_bool(value) -> bool:
+	if isinstance(value, bool):
+		return value
+
+	value = str(value if value is not None else "").strip().lower()
+	if value in TRUE_VALUES:
+		return True
+	if value in FALSE_VALUES:
+		return False
+
+	raise ValidationError(f"“{value}” is not a boolean.")
+
+
+class BaseImporter:
+	model: type[Model]
+	unique_field: str
+
+	def __init__(
+		self, using: str = "default", batch_size: int = BATCH_SIZE
+	) -> None:
+		self.using = using
+		self.batch_size = batch_size
+		self.connection = connections[using]
+
+	def run(self, records: Iterable[dict]) -> ImportStats:
+		stats = ImportStats()
+		records = enumerate(records, start=1)
+
+		while chunk := list(islice(records, self.batch_size)):
+			with transaction.atomic(using=self.using):
+				self.import_chunk(chunk, stats)
+
+		stats.finished = time.perf_counter()
+
+		return stats
+
+	def import_chunk(
+		self, chunk: list[tuple[int, dict]], stats: ImportStats
+	) -> None:
+		existing = self.get_existing(
+			str(record.get(self.unique_field) or "").strip()
+			for _, record in chunk
+		)
+		objs = {}
+
+		for number, record in chunk:
+			try:
+				obj = self.build(record)
+			except ValidationError as error:
+				stats.errors.append(f"Row {number}: {_format_error(error)}")
+				continue
+
+			key = getattr(obj, self.unique_field)
+			if key in existing or key in objs:
+				stats.skipped += 1
+			else:
+				objs[key] = (number, obj, record)
+
+		if not objs:
+			return
+
+		rejected = self.resolve(
+			[(obj, record) for _, obj, record in objs.values()]
+		)
+		for key, message in rejected.items():
+			number, _, _ = objs.pop(key)
+			stats.errors.append(f"Row {number}: {message}")
+
+		if not objs:
+			return
+
+		pks = self.insert([obj for _, obj, _ in objs.values()])
+		created = []
+		for key, (_, obj, record) in objs.items():
+			if key in pks:
+				obj.pk = pks[key]
+				obj._state.adding = False
+				obj._state.db = self.using
+				created.append((obj, record))
+
+		stats.created += len(created)
+		stats.skipped += len(objs) - len(created)
+		if created:
+			self.after_insert(created)
+
+	def get_existing(self, values: Iterable[str]) -> set[str]:
+		"""Return which of the values are taken, with a single IN query."""
+		return set(
+			self.model.objects.using(self.using).filter(
+				**{f"{self.unique_field}__in": set(values)}
+			).order_by().values_list(self.unique_field, flat=True)
+		)
+
+	def build(self, record: dict) -> Model:
+		"""Return an unsaved, validated instance for the record."""
+		raise NotImplementedError
+
+	def resolve(self, objs: list[tuple[Model, dict]]) -> dict[str, str]:
+		"""
+		Set foreign keys of the chunk's instances with batched queries and
+		return error messages of the rows that can't be imported.
+		"""
+		return {}
+
+	def after_insert(self, created: list[tuple[Model, dict]]) -> None:
+		"""Update what signals would have for the inserted instances."""
+
+	def insert(self, objs: list[Model]) -> dict[str, int]:
+		"""
+		Insert the instances, skipping rows taken in the meantime, and
+		return the primary keys of the inserted ones by unique value.
+		"""
+		if self.connection.vendor == "postgresql":
+			return self._copy(objs)
+
+		self.model.objects.using(self.using).bulk_create(objs)
+
+		return {getattr(obj, self.unique_field): obj.pk for obj in objs}
+
+	def _copy(self, objs: list[Model]) -> dict[str, int]:
+		fields = [
+			field for field in self.model._meta.concrete_fields
+			if not field.primary_key
+		]
+		table = self.model._meta.db_table
+		staging = f"{table}_import"
+		columns = ", ".join(f'"{field.column}"' for field in fields)
+		data = io.StringIO()
+
+		for obj in objs:
+			data.write(
+				",".join(
+					_copy_value(field.get_db_prep_save(
+						field.pre_save(obj, add=True), self.connection
+					))
+					for field in fields
+				) + "\n"
+			)
+		data.seek(0)
+
+		with self.connection.cursor() as cursor:
+			cursor.execute(
+				f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" '
+				f'ON COMMIT DROP AS SELECT {columns} FROM "{table}" '
+				f"WITH NO DATA"
+			)
+			cursor.execute(f'TRUNCATE "{staging}"')
+			_copy_from(
+				cursor.cursor,
+				f'COPY "{staging}" ({columns}) FROM STDIN '
+				f"WITH (FORMAT csv, NULL '\\N')",
+				data,
+			)
+			cursor.execute(
+				f'INSERT INTO "{table}" ({columns}) '
+				f'SELECT {columns} FROM "{staging}" '
+				f'ON CONFLICT ("{self.unique_field}") DO NOTHING '
+				f'RETURNING "{self.unique_field}", "id"'
+			)
+
+			return dict(cursor.fetchall())
+
+	def _get_or_create_names(
+		self, model: type[Model], names: set[str]
+	) -> dict[str, int]:
+		"""Return ids of the named rows, creating the missing ones."""
+		names.discard("")
+		queryset = model.objects.using(self.using)
+		ids = dict(
+			queryset.filter(name__in=names).order_by().values_list(
+				"name", "pk"
+			)
+		)
+
+		if missing := names - set(ids):
+			queryset.bulk_create(
+				[model(name=name) for name in missing], ignore_conflicts=True
+			)
+			ids.update(
+				queryset.filter(name__in=missing).order_by().values_list(
+					"name", "pk"
+				)
+			)
+
+		return ids
+
+
+class TaskImporter(BaseImporter):
+	"""
+	Imports tasks. ``task_type`` is a name, created when missing, and
+	``assignees`` lists usernames of existing workers.
+	"""
+
+	model = Task
+	unique_field = "name"
+
+	def build(self, record: dict) -> Task:
+		task = Task(
+			name=str(record.get("name") or "").strip(),
+			description=record.get("description") or "",
+			deadline=record.get("deadline") or None,
+			priority=record.get("priority") or None,
+		)
+		try:
+			task.is_completed = parse_bool(record.get("is_completed"))
+		except ValidationError as error:
+			raise ValidationError({"is_completed": error.messages})
+
+		task.clean_fields(exclude=["task_type"])
+		task.clean()
+		_clean_name(TaskType, "task_type", _get_name(record, "task_type"))
+
+		return task
+
+	def resolve(self, objs: list[tuple[Task, dict]]) -> dict[str, str]:
+		task_types = self._get_or_create_names(
+			TaskType, {_get_name(record, "task_type") for _, record in objs}
+		)
+		usernames = {
+			username
+			for _, record in objs
+			for username in parse_list(record.get("assignees"))
+		}
+		workers = dict(
+			Worker.objects.using(self.using).filter(
+				username__in=usernames
+			).values_list("username", "pk")
+		)
+		rejected = {}
+
+		for task, record in objs:
+			assignees = parse_list(record.get("assignees"))
+			if unknown := sorted(set(assignees) - set(workers)):
+				rejected[task.name] = (
+					f"assignees: Unknown users: {', '.join(unknown)}."
+				)
+				continue
+
+			task.task_type_id = task_types.get(_get_name(record, "task_type"))
+			task._assignee_ids = [workers[username] for username in assignees]
+
+		return rejected
+
+	def after_insert(self, created: list[tuple[Task, dict]]) -> None:
+		tasks = [task for task, _ in created]
+		TaskAssignment.objects.using(self.using).bulk_create(
+			[
+				TaskAssignment(task_id=task.pk, worker_id=worker_id)
+				for task in tasks
+				for worker_id in task._assignee_ids
+			],
+			ignore_conflicts=True,
+		)
+		counters.increment(
+			{
+				Counter.TOTAL_TASKS: len(tasks),
+				Counter.ACTIVE_TASKS: sum(
+					not task.is_completed for task in tasks
+				),
+			},
+			using=self.using,
+		)
+		counters.refresh_worker_task_counts(
+			Worker.objects.using(self.using).filter(
+				pk__in={
+					worker_id
+					for task in tasks
+					for worker_id in task._assignee_ids
+				}
+			)
+		)
+		search.index_sqlite_rows(
+			Task, [task.pk for task in tasks], using=self.using
+		)
+		page_cache.purge(
+			{page_cache.TASK_LIST, page_cache.WORKER_LIST}, self.using
+		)
+
+
+class WorkerImporter(BaseImporter):
+	"""
+	Imports workers. ``position`` is a name, created when missing. Workers
+	without a ``password`` get an unusable one.
+	"""
+
+	model = Worker
+	unique_field = "username"
+
+	def build(self, record: dict) -> Worker:
+		worker = Worker(
+			username=str(record.get("username") or "").strip(),
+			first_name=record.get("first_name") or "",
+			last_name=record.get("last_name") or "",
+			email=record.get("email") or "",
+		)
+		worker.clean_fields(exclude=["password", "position"])
+		_clean_name(Position, "position", _get_name(record, "position"))
+
+		if password := record.get("password"):
+			worker.set_password(password)
+		else:
+			worker.set_unusable_password()
+
+		return worker
+
+	def resolve(self, objs: list[tuple[Worker, dict]]) -> dict[str, str]:
+		positions = self._get_or_create_names(
+			Position, {_get_name(record, "position") for _, record in objs}
+		)
+
+		for worker, record in objs:
+			worker.position_id = positions.get(_get_name(record, "position"))
+
+		return {}
+
+	def after_insert(self, created: list[tuple[Worker, dict]]) -> None:
+		counters.increment(
+			{Counter.TOTAL_USERS: len(created)}, using=self.using
+		)
+		search.index_sqlite_rows(
+			Worker, [worker.pk for worker, _ in created], using=self.using
+		)
+		page_cache.purge({page_cache.WORKER_LIST}, self.using)
+
+
+def _copy_from(cursor, sql: str, data: io.StringIO) -> None:
+	"""Run ``COPY ... FROM STDIN`` with psycopg 3 or psycopg2."""
+	from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+	if is_psycopg3:
+		with cursor.copy(sql) as copy:
+			copy.write(data.getvalue())
+	else:
+		cursor.copy_expert(sql, data)
+
+
+def _copy_value(value) -> str:
+	"""Quote a value for COPY's CSV format, where \\N stands for NULL."""
+	if value is None:
+		return "\\N"
+
+	return '"' + str(value).replace('"', '""') + '"'
+
+
+def _get_name(record: dict, key: str) -> str:
+	return str(record.get(key) or "").strip()
+
+
+def _clean_name(model: type[Model], key: str, name: str) -> None:
+	"""Validate the name a related row would be created with."""
+	if not name:
+		return
+
+	try:
+		model._meta.get_field("name").clean(name, None)
+	except ValidationError as error:
+		raise ValidationError({key: error.messages})
+
+
+def _format_error(error: ValidationError) -> str:
+	if hasattr(error, "error_dict"):
+		return "; ".join(
+			f"{field}: {' '.join(messages)}"
+			for field, messages in error.message_dict.items()
+		)
+
+	return " ".join(error.messages)
@@ -0,0 +1,138 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (
+	setup_test_environment,
+	teardown_test_environment,
+)
+
+from task_manager.benchmarks import (
+	BASELINE_PATH,
+	REPEAT,
+	SIZES,
+	THRESHOLD,
+	ViewBenchmark,
+	build_dataset,
+	find_regressions,
+	load_baseline,
+	save_baseline,
+)
+
+
+class Command(BaseCommand):
+	help = (
+		"Benchmark the views against generated datasets in a test database "
+		"and compare wall time, SQL time and query counts with a baseline."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--sizes",
+			help="Comma separated dataset sizes, in tasks. Defaults to "
+			"the sizes in the baseline, or to every size when updating it.",
+		)
+		parser.add_argument(
+			"--routes",
+			help="Comma separated routes to run, all by default.",
+		)
+		parser.add_argument("--repeat", type=int, default=REPEAT)
+		parser.add_argument(
+			"--baseline",
+			type=Path,
+			default=BASELINE_PATH,
+			help="JSON file with the stored results.",
+		)
+		parser.add_argument(
+			"--update-baseline",
+			action="store_true",
+			help="Store the results instead of comparing with them.",
+		)
+		parser.add_argument(
+			"--threshold",
+			type=float,
+			default=THRESHOLD,
+			help="Slowdown ratio over the baseline that fails the run.",
+		)
+		parser.add_argument(
+			"--keepdb",
+			action="store_true",
+			help="Keep the test database and its datasets between runs.",
+		)
+		parser.add_argument(
+			"--database",
+			default="default",
+			help="Database alias whose test database is used.",
+		)
+
+	def handle(self, *args, **options):
+		baseline = load_baseline(options["baseline"])
+		if not baseline and not options["update_baseline"]:
+			raise CommandError(
+				f"No baseline at {options['baseline']} to compare with, "
+				f"run with --update-baseline."
+			)
+
+		if options["sizes"]:
+			sizes = options["sizes"].split(",")
+		else:
+			sizes = SIZES if options["update_baseline"] else list(baseline)
+		try:
+			sizes = sorted(int(size) for size in sizes)
+		except ValueError:
+			raise CommandError("--sizes must be comma separated integers.")
+		routes = options["routes"] and options["routes"].split(",")
+		using = options["database"]
+		connection = connections[using]
+		old_name = connection.settings_dict["NAME"]
+		results = {}
+
+		setup_test_environment()
+		connection.creation.create_test_db(
+			verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+		)
+		try:
+			for size in sizes:
+				self.stdout.write(f"Building a dataset of {size} tasks...")
+				build_dataset(size, using=using)
+				try:
+					results[str(size)] = ViewBenchmark(
+						repeat=options["repeat"], using=using
+					).run(routes)
+				except KeyError as error:
+					raise CommandError(f"Unknown route: {error}.")
+				self.write_results(size, results[str(size)])
+		finally:
+			connection.creation.destroy_test_db(
+				old_name, verbosity=0, keepdb=options["keepdb"]
+			)
+			teardown_test_environment()
+
+		if options["update_baseline"]:
+			for size, routes in results.items():
+				baseline.setdefault(size, {}).update(routes)
+			save_baseline(options["baseline"], baseline)
+			self.stdout.write(
+				self.style.SUCCESS(
+					f"Saved the baseline to {options['baseline']}."
+				)
+			)
+			return
+
+		if regressions := find_regressions(
+			results, baseline, options["threshold"]
+		):
+			raise CommandError(
+				"Regressions over the baseline:\n" + "\n".join(regressions)
+			)
+		self.stdout.write(self.style.SUCCESS("No regressions."))
+
+	def write_results(self, size: int, results: dict) -> None:
+		self.stdout.write(
+			f"{'route':<24}{'wall ms':>10}{'sql ms':>10}{'queries':>9}"
+		)
+		for route, result in results.items():
+			self.stdout.write(
+				f"{route:<24}{result['wall_ms']:>10.2f}"
+				f"{result['sql_ms']:>10.2f}{result['queries']:>9}"
+			)
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import (
+	LOAD_CONNECTIONS,
+	LOAD_DURATION,
+	LOAD_ROUTES,
+	LoadBenchmark,
+	benchmark_session,
+	build_dataset,
+	get_load_paths,
+)
+from task_manager.models import Task
+
+
+class Command(BaseCommand):
+	help = (
+		"Compare the throughput of running servers, such as the WSGI and "
+		"the ASGI deployments, under concurrent connections. The servers "
+		"must serve from the --database database, where the dataset and "
+		"a benchmark user are created; the user and its session are "
+		"deleted when the run ends."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"servers",
+			nargs="+",
+			help="Servers to compare, as name=url, e.g. "
+			"sync=http://127.0.0.1:8000 async=http://127.0.0.1:8001.",
+		)
+		parser.add_argument(
+			"--size",
+			type=int,
+			help="Grow the dataset to this many tasks first.",
+		)
+		parser.add_argument(
+			"--routes",
+			default=",".join(LOAD_ROUTES),
+			help="Comma separated routes requested in turn.",
+		)
+		parser.add_argument(
+			"--connections", type=int, default=LOAD_CONNECTIONS
+		)
+		parser.add_argument(
+			"--duration",
+			type=float,
+			default=LOAD_DURATION,
+			help="Seconds each server is loaded for.",
+		)
+		parser.add_argument(
+			"--database",
+			default="benchmark",
+			help="Database alias the servers under test serve from, "
+			"never the production one.",
+		)
+
+	def handle(self, *args, **options):
+		try:
+			servers = dict(
+				server.split("=", 1) for server in options["servers"]
+			)
+		except ValueError:
+			raise CommandError("Servers must be given as name=url.")
+		using = options["database"]
+		if using not in settings.DATABASES:
+			raise CommandError(
+				f"No {using!r} database is configured, set "
+				"POSTGRES_BENCHMARK_DB or pass --database."
+			)
+
+		if options["size"]:
+			self.stdout.write(
+				f"Building a dataset of {options['size']} tasks..."
+			)
+		build_dataset(options["size"] or 0, using=using)
+		if not Task.objects.using(using).exists():
+			raise CommandError("The database has no tasks, pass --size.")
+		all_paths = get_load_paths(using)
+		try:
+			paths = [all_paths[name] for name in options["routes"].split(",")]
+		except KeyError as error:
+			raise CommandError(f"Unknown route: {error}.")
+
+		self.stdout.write(
+			f"{'server':<12}{'requests':>10}{'req/s':>10}"
+			f"{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}"
+		)
+		with benchmark_session(using) as cookie:
+			for name, url in servers.items():
+				result = LoadBenchmark(
+					url,
+					paths,
+					cookie,
+					connections=options["connections"],
+					duration=options["duration"],
+				).run()
+				self.stdout.write(
+					f"{name:<12}{result['requests']:>10}"
+					f"{result['requests_per_second']:>10.1f}"
+					f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+					f"{result['errors']:>8}"
+				)
@@ -0,0 +1,135 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.generators import (
+	BATCH_SIZE,
+	PRIORITY_WEIGHTS,
+	DataGenerator,
+)
+
+
+def parse_range(value: str) -> tuple[int, int]:
+	"""Parse ``min:max`` into a pair of integers."""
+	try:
+		low, high = (int(part) for part in value.split(":"))
+	except ValueError:
+		raise CommandError(f"Expected min:max, got {value!r}.")
+	if low > high:
+		raise CommandError(f"{value!r}: min is greater than max.")
+
+	return low, high
+
+
+def parse_weights(value: str) -> dict[int, float]:
+	"""Parse ``priority:weight,...`` into a mapping."""
+	try:
+		weights = {
+			int(priority): float(weight)
+			for priority, weight in (
+				item.split(":") for item in value.split(",")
+			)
+		}
+	except ValueError:
+		raise CommandError(f"Expected priority:weight,..., got {value!r}.")
+	if unknown := set(weights) - set(PRIORITY_WEIGHTS):
+		raise CommandError(f"Unknown priorities: {sorted(unknown)}.")
+
+	return weights
+
+
+class Command(BaseCommand):
+	help = (
+		"Generate a deterministic synthetic dataset of positions, task "
+		"types, workers and tasks with bulk inserts."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--workers", type=int, default=1000)
+		parser.add_argument("--tasks", type=int, default=10000)
+		parser.add_argument("--positions", type=int, default=10)
+		parser.add_argument("--task-types", type=int, default=10)
+		parser.add_argument(
+			"--priority-weights",
+			default=",".join(f"{p}:{w}" for p, w in PRIORITY_WEIGHTS.items()),
+			help="Relative weight of each priority, as priority:weight,...",
+		)
+		parser.add_argument(
+			"--deadline-days",
+			default="-30:90",
+			help="Range of deadlines in days from today, as min:max.",
+		)
+		parser.add_argument(
+			"--completed-ratio",
+			type=float,
+			default=0.3,
+			help="Share of tasks that are completed.",
+		)
+		parser.add_argument(
+			"--assignees",
+			default="1:3",
+			help="Range of assignees per task, as min:max.",
+		)
+		parser.add_argument("--seed", type=int, default=0)
+		parser.add_argument(
+			"--prefix",
+			default="generated",
+			help="Prefix of generated names, which must not be in use.",
+		)
+		parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+		parser.add_argument(
+			"--processes",
+			type=int,
+			default=os.cpu_count() or 1,
+			help="Processes inserting batches, ignored on SQLite.",
+		)
+		parser.add_argument(
+			"--database",
+			default="default",
+			help="Database alias to fill.",
+		)
+
+	def handle(self, *args, **options):
+		if not 0 <= options["completed_ratio"] <= 1:
+			raise CommandError("--completed-ratio must be between 0 and 1.")
+		if options["batch_size"] < 1:
+			raise CommandError("--batch-size must be positive.")
+
+		generator = DataGenerator(
+			workers=options["workers"],
+			tasks=options["tasks"],
+			positions=options["positions"],
+			task_types=options["task_types"],
+			priority_weights=parse_weights(options["priority_weights"]),
+			deadline_days=parse_range(options["deadline_days"]),
+			completed_ratio=options["completed_ratio"],
+			assignees=parse_range(options["assignees"]),
+			seed=options["seed"],
+			prefix=options["prefix"],
+			batch_size=options["batch_size"],
+			using=options["database"],
+		)
+		if generator.exists():
+			raise CommandError(
+				f"Data with the prefix {options['prefix']!r} exists, "
+				f"pass another --prefix."
+			)
+
+		processes = options["processes"]
+		if processes > 1 and not generator.can_run_in_parallel():
+			self.stderr.write(
+				"The database allows a single writer, using 1 process."
+			)
+
+		started = time.perf_counter()
+		created = generator.generate(processes=processes)
+		elapsed = time.perf_counter() - started
+
+		for name, count in created.items():
+			self.stdout.write(f"{name}: {count}")
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Generated {sum(created.values())} row(s) in {elapsed:.2f}s."
+			)
+		)
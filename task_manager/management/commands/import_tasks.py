@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.importers import (
+	BATCH_SIZE,
+	CSV,
+	FORMATS,
+	NDJSON,
+	TaskImporter,
+	read_records,
+)
+
+
+class Command(BaseCommand):
+	help = (
+		"Import tasks from a CSV or NDJSON file, or '-' for stdin. Columns: "
+		"name, description, deadline, priority, is_completed, task_type, "
+		"assignees (comma separated usernames). Existing names are skipped."
+	)
+	importer_class = TaskImporter
+	label = "task"
+
+	def add_arguments(self, parser):
+		parser.add_argument("path", help="File to import, or '-' for stdin.")
+		parser.add_argument(
+			"--format",
+			choices=FORMATS,
+			help="Input format. Guessed from the file extension by default.",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=BATCH_SIZE,
+			help="Rows validated and inserted per query.",
+		)
+		parser.add_argument(
+			"--database",
+			default="default",
+			help="Database alias to import into.",
+		)
+
+	def handle(self, *args, **options):
+		path = options["path"]
+		format = options["format"] or self.guess_format(path)
+		importer = self.importer_class(
+			using=options["database"], batch_size=options["batch_size"]
+		)
+
+		try:
+			if path == "-":
+				stats = importer.run(read_records(sys.stdin, format))
+			else:
+				with open(path, newline="", encoding="utf-8") as stream:
+					stats = importer.run(read_records(stream, format))
+		except (OSError, ValueError) as error:
+			raise CommandError(error)
+
+		for error in stats.errors:
+			self.stderr.write(error)
+
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Imported {stats.created} {self.label}(s), skipped "
+				f"{stats.skipped} existing, {len(stats.errors)} invalid "
+				f"in {stats.elapsed:.2f}s ({stats.rows_per_second:.0f} rows/s)."
+			)
+		)
+
+	@staticmethod
+	def guess_format(path: str) -> str:
+		suffix = Path(path).suffix.lower()
+		if suffix in (".ndjson", ".jsonl"):
+			return NDJSON
+		if suffix == ".csv":
+			return CSV
+
+		raise CommandError("Can't guess the format, pass --format.")
@@ -0,0 +1,14 @@
+from task_manager.importers import WorkerImporter
+from task_manager.management.commands.import_tasks import (
+	Command as ImportTasksCommand,
+)
+
+
+class Command(ImportTasksCommand):
+	help = (
+		"Import workers from a CSV or NDJSON file, or '-' for stdin. "
+		"Columns: username, first_name, last_name, email, position, "
+		"password. Existing usernames are skipped."
+	)
+	importer_class = WorkerImporter
+	label = "worker"
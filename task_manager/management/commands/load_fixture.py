@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from task_manager.fixture_loader import BATCH_SIZE, FixtureLoader
+
+
+class Command(BaseCommand):
+	help = (
+		"Load JSON or JSON Lines fixtures, like loaddata, streaming them in "
+		"batches instead of reading whole files and saving row by row."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("fixtures", nargs="+", help="Fixture files.")
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=BATCH_SIZE,
+			help="Objects buffered per model before they are inserted.",
+		)
+		parser.add_argument(
+			"--database",
+			default="default",
+			help="Database alias to load into.",
+		)
+		parser.add_argument(
+			"--ignorenonexistent",
+			"-i",
+			action="store_true",
+			help="Ignore fields in the fixtures that no longer exist.",
+		)
+
+	def handle(self, *args, **options):
+		for path in options["fixtures"]:
+			loader = FixtureLoader(
+				using=options["database"],
+				batch_size=options["batch_size"],
+				ignorenonexistent=options["ignorenonexistent"],
+			)
+			started = time.perf_counter()
+
+			try:
+				with open(path, encoding="utf-8") as stream:
+					loaded = loader.load(stream)
+			except (OSError, ValueError, DatabaseError) as error:
+				raise CommandError(f"Could not load {path}: {error}")
+
+			elapsed = time.perf_counter() - started
+			total = sum(loaded.values())
+
+			for model, count in loaded.items():
+				self.stdout.write(f"{model._meta.label}: {count}")
+			self.stdout.write(
+				self.style.SUCCESS(
+					f"Installed {total} object(s) from {path} in "
+					f"{elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} "
+					f"objects/s)."
+				)
+			)
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.memory import RECORD, summarize
+from task_manager.profiling import get_directory_name
+
+
+class Command(BaseCommand):
+	help = (
+		"Report the peak and retained memory of the traced requests per "
+		"URL name, heaviest first, with their top allocating lines."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"views", nargs="*", help="URL names, such as task_manager:index."
+		)
+		parser.add_argument(
+			"--dir",
+			type=Path,
+			default=None,
+			help="Defaults to MEMORY_PROFILER_DIR.",
+		)
+		parser.add_argument(
+			"--limit",
+			type=int,
+			default=10,
+			help="Allocating lines to list per URL name.",
+		)
+
+	def handle(self, *args, **options):
+		directory = options["dir"] or Path(settings.MEMORY_PROFILER_DIR)
+		if options["views"]:
+			directories = [
+				directory / get_directory_name(view)
+				for view in options["views"]
+			]
+		else:
+			directories = sorted(
+				path for path in directory.glob("*") if path.is_dir()
+			)
+
+		reports = {
+			path.name: summarize(sorted(path.glob(f"*{RECORD}")))
+			for path in directories
+		}
+		reports = {
+			name: report
+			for name, report in reports.items()
+			if report["requests"]
+		}
+		if not reports:
+			raise CommandError(f"No memory profiles found in {directory}.")
+
+		for name, report in sorted(
+			reports.items(),
+			key=lambda item: item[1]["mean_peak"],
+			reverse=True,
+		):
+			self.write_report(name, report, options["limit"])
+
+	def write_report(self, name: str, report: dict, limit: int) -> None:
+		self.stdout.write(
+			f"{name}: {report['requests']} request(s), peak "
+			f"{report['mean_peak'] / 1024:.1f} KiB mean, "
+			f"{report['max_peak'] / 1024:.1f} KiB max, retained "
+			f"{report['mean_retained'] / 1024:.1f} KiB mean"
+		)
+		self.stdout.write(
+			f"  {'KiB/request':>11}{'blocks':>9}{'requests':>10}  line"
+		)
+		for location, size, count, requests in report["lines"][:limit]:
+			self.stdout.write(
+				f"  {size / report['requests'] / 1024:>11.1f}"
+				f"{count // report['requests']:>9}{requests:>10}  {location}"
+			)
@@ -0,0 +1,77 @@
+import pstats
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.profiling import (
+	COLLAPSED,
+	PSTATS,
+	get_directory_name,
+	merge_collapsed,
+)
+
+
+class Command(BaseCommand):
+	help = (
+		"Merge the request profiles of the given URL names, or of every "
+		"URL name, into collapsed stacks for flame graph tools and "
+		"optionally into one pstats file."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"views", nargs="*", help="URL names, such as task_manager:index."
+		)
+		parser.add_argument(
+			"--dir", type=Path, default=None, help="Defaults to PROFILER_DIR."
+		)
+		parser.add_argument(
+			"-o",
+			"--output",
+			type=Path,
+			help="File for the collapsed stacks, standard output by default.",
+		)
+		parser.add_argument(
+			"--pstats", type=Path, help="File for the merged pstats."
+		)
+
+	def handle(self, *args, **options):
+		directory = options["dir"] or Path(settings.PROFILER_DIR)
+		if options["views"]:
+			directories = [
+				directory / get_directory_name(view)
+				for view in options["views"]
+			]
+		else:
+			directories = sorted(
+				path for path in directory.glob("*") if path.is_dir()
+			)
+
+		collapsed = [
+			path
+			for directory in directories
+			for path in sorted(directory.glob(f"*{COLLAPSED}"))
+		]
+		if not collapsed:
+			raise CommandError(f"No profiles found in {directory}.")
+
+		stacks = merge_collapsed(collapsed)
+		lines = "".join(
+			f"{stack} {count}\n" for stack, count in sorted(stacks.items())
+		)
+		if options["output"]:
+			options["output"].write_text(lines)
+		else:
+			self.stdout.write(lines, ending="")
+
+		if options["pstats"]:
+			paths = [path.with_suffix(PSTATS) for path in collapsed]
+			pstats.Stats(
+				*(str(path) for path in paths if path.exists())
+			).dump_stats(options["pstats"])
+
+		self.stderr.write(
+			f"Merged {len(collapsed)} profile(s), "
+			f"{sum(stacks.values())} sample(s)."
+		)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.counters import reconcile
+
+
+class Command(BaseCommand):
+	help = "Recount the dashboard counters and fix any drift."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--database",
+			default="default",
+			help="Database alias to reconcile.",
+		)
+
+	def handle(self, *args, **options):
+		fixed = reconcile(using=options["database"])
+
+		for name, (stored, actual) in fixed.items():
+			self.stdout.write(f"{name}: {stored} -> {actual}")
+
+		if fixed:
+			self.stdout.write(
+				self.style.SUCCESS(f"Fixed {len(fixed)} counter(s).")
+			)
+		else:
+			self.stdout.write(self.style.SUCCESS("Counters are in sync."))
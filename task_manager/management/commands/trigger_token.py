@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.middleware import (
+	MEMORY_PROFILE,
+	PROFILE,
+	SERVER_TIMING,
+	make_trigger_token,
+)
+
+HEADERS = {
+	SERVER_TIMING: ("X-Server-Timing-Token", "SERVER_TIMING_TOKEN_MAX_AGE"),
+	PROFILE: ("X-Profile-Token", "PROFILER_TOKEN_MAX_AGE"),
+	MEMORY_PROFILE: (
+		"X-Memory-Profile-Token", "MEMORY_PROFILER_TOKEN_MAX_AGE"
+	),
+}
+
+
+class Command(BaseCommand):
+	help = (
+		"Print a signed token that adds a Server-Timing header to the "
+		"responses, or profiles the time or memory of the requests, that "
+		"send it."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("purpose", choices=list(HEADERS))
+
+	def handle(self, *args, **options):
+		header, max_age = HEADERS[options["purpose"]]
+		self.stdout.write(make_trigger_token(options["purpose"]))
+		self.stderr.write(
+			f"Send it as the {header} header. It is valid for "
+			f"{getattr(settings, max_age)} seconds."
+		)
@@ -0,0 +1,137 @@
+"""
+Memory profiling with tracemalloc. A traced request records its peak
+traced memory and the memory it retained, allocated during the request
+and still alive once the response is ready, and attributes the latter to
+source lines. The response and the context a TemplateResponse keeps are
+alive then, so the querysets rendered count. Records are JSON files in a
+directory per URL name that keeps only the newest ones.
+
+tracemalloc traces the whole process, so only one request is traced at
+a time and allocations of other threads meanwhile count towards it.
+"""
+import json
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterable
+from pathlib import Path
+
+from task_manager.profiling import get_directory_name, rotate
+
+RECORD = ".json"
+
+FILTERS = [
+	tracemalloc.Filter(False, tracemalloc.__file__),
+	tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+	tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+	tracemalloc.Filter(False, "<unknown>"),
+]
+
+_lock = threading.Lock()
+
+
+class MemoryTracer:
+	"""
+	Traces the allocations made while entered. ``traced`` is False when
+	another request holds tracemalloc, and nothing is recorded then.
+	"""
+
+	def __init__(self, frames: int = 1) -> None:
+		self.frames = frames
+		self.traced = False
+		self.started = False
+		self.peak = 0
+		self.retained = 0
+		self.statistics: list[tracemalloc.StatisticDiff] = []
+
+	def __enter__(self) -> "MemoryTracer":
+		if not _lock.acquire(blocking=False):
+			return self
+
+		self.traced = True
+		if not tracemalloc.is_tracing():
+			tracemalloc.start(self.frames)
+			self.started = True
+		self.before = tracemalloc.take_snapshot().filter_traces(FILTERS)
+		tracemalloc.reset_peak()
+		self.current = tracemalloc.get_traced_memory()[0]
+
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		if not self.traced:
+			return
+
+		try:
+			current, peak = tracemalloc.get_traced_memory()
+			after = tracemalloc.take_snapshot().filter_traces(FILTERS)
+			self.peak = peak - self.current
+			self.retained = current - self.current
+			self.statistics = after.compare_to(self.before, "lineno")
+		finally:
+			if self.started:
+				tracemalloc.stop()
+			del self.before
+			_lock.release()
+
+	def get_record(self, limit: int) -> dict:
+		"""Return the peak, the retained memory and the top lines."""
+		return {
+			"peak": self.peak,
+			"retained": self.retained,
+			"lines": [
+				[str(stat.traceback[0]), stat.size_diff, stat.count_diff]
+				for stat in self.statistics[:limit]
+				if stat.size_diff > 0
+			],
+		}
+
+	def save(
+		self, directory: Path, name: str, limit: int, max_files: int
+	) -> Path:
+		"""
+		Write the record under the URL name, drop the oldest records past
+		``max_files`` and return its path.
+		"""
+		directory = Path(directory) / get_directory_name(name)
+		directory.mkdir(parents=True, exist_ok=True)
+		path = directory / f"{time.time_ns()}-{threading.get_ident()}{RECORD}"
+
+		path.write_text(json.dumps(self.get_record(limit)))
+		rotate(directory, max_files, (RECORD,))
+
+		return path
+
+
+def summarize(paths: Iterable[Path]) -> dict:
+	"""
+	Add up the records of one URL name: the request count, the mean and
+	largest peak, the mean retained memory and, per line, the size and
+	blocks allocated and the number of requests it allocated in.
+	"""
+	requests = peak = max_peak = retained = 0
+	lines: dict[str, list[int]] = {}
+
+	for path in paths:
+		record = json.loads(path.read_text())
+		requests += 1
+		peak += record["peak"]
+		max_peak = max(max_peak, record["peak"])
+		retained += record["retained"]
+		for location, size, count in record["lines"]:
+			totals = lines.setdefault(location, [0, 0, 0])
+			totals[0] += size
+			totals[1] += count
+			totals[2] += 1
+
+	return {
+		"requests": requests,
+		"mean_peak": peak / requests if requests else 0,
+		"max_peak": max_peak,
+		"mean_retained": retained / requests if requests else 0,
+		"lines": sorted(
+			([location, *totals] for location, totals in lines.items()),
+			key=lambda line: line[1],
+			reverse=True,
+		),
+	}
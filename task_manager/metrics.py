@@ -0,0 +1,297 @@
+"""
+Request metrics in the Prometheus text format. Each process aggregates
+its requests in memory and, at most every ``METRICS_FLUSH_INTERVAL``
+seconds, writes a snapshot to its own file in ``METRICS_DIR``; the
+``/metrics`` view adds up the files of every gunicorn worker. Without a
+``METRICS_DIR`` the view shows the serving process only.
+
+A file is named after the pid and the start time of its process, so a
+worker that reuses the pid of an exited one never overwrites the
+exited worker's totals, and the files of exited workers stay to keep
+the counters from going backwards. The gunicorn master removes them all
+when it starts (``on_starting`` in ``gunicorn.conf.py``), which
+Prometheus reads as the counter reset a restart is.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import (
+	DjangoTemplates,
+	Template,
+	reraise,
+)
+from django.template.exceptions import TemplateDoesNotExist
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "django_http"
+LATENCY_BUCKETS = (
+	0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Name: (type, help, buckets of histograms).
+METRICS = {
+	"request_duration_seconds": (
+		"histogram", "Time to build the response.", LATENCY_BUCKETS
+	),
+	"request_db_queries": (
+		"histogram", "Database queries run per request.", QUERY_BUCKETS
+	),
+	"response_size_bytes": (
+		"histogram", "Size of the response body.", SIZE_BUCKETS
+	),
+	"request_db_seconds": (
+		"summary", "Time spent running database queries.", ()
+	),
+	"request_template_seconds": (
+		"summary", "Time spent rendering templates.", ()
+	),
+	"request_fragment_cache_hits": (
+		"summary", "Task fragments served from the cache.", ()
+	),
+	"request_fragment_cache_misses": (
+		"summary", "Task fragments rendered and cached.", ()
+	),
+}
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar(
+	"request_metrics", default=None
+)
+
+
+class MetricsStore:
+	"""
+	Cumulative counts, sums and bucket counts of one process, keyed by
+	metric name and labels, shared with other processes through files.
+	"""
+
+	def __init__(
+		self,
+		directory: str | Path | None = None,
+		flush_interval: float = 1.0,
+		name: str | None = None,
+	) -> None:
+		self.directory = Path(directory) if directory else None
+		self.flush_interval = flush_interval
+		self.name = name
+		self.lock = threading.Lock()
+		self.reset()
+
+	def reset(self) -> None:
+		"""
+		Forget the samples and take a file of its own, as forked workers
+		must do.
+		"""
+		with self.lock:
+			self.samples: dict[tuple, list] = {}
+			self.next_flush = 0.0
+			self.file_name = self.name or f"{os.getpid()}-{time.time_ns()}"
+
+	def clear(self) -> None:
+		"""Remove the snapshots of every process."""
+		if self.directory is None:
+			return
+
+		for path in [
+			*self.directory.glob("*.json"),
+			*self.directory.glob(".*.json.tmp"),
+		]:
+			path.unlink(missing_ok=True)
+
+	def observe(self, metric: str, labels: tuple[str, ...], value) -> None:
+		"""Add a value to the count, the sum and the bucket it falls in."""
+		buckets = METRICS[metric][2]
+		index = bisect.bisect_left(buckets, value)
+
+		with self.lock:
+			sample = self.samples.get((metric, *labels))
+			if sample is None:
+				sample = [0, 0.0] + [0] * len(buckets)
+				self.samples[(metric, *labels)] = sample
+			sample[0] += 1
+			sample[1] += value
+			if index < len(buckets):
+				sample[2 + index] += 1
+
+	def flush(self, force: bool = False) -> None:
+		"""Write this process's snapshot when the interval has passed."""
+		now = time.monotonic()
+		if self.directory is None or (not force and now < self.next_flush):
+			return
+
+		with self.lock:
+			self.next_flush = now + self.flush_interval
+			data = json.dumps([[*key, s] for key, s in self.samples.items()])
+		name = self.file_name
+		path = self.directory / f"{name}.json"
+		temporary = self.directory / f".{name}.json.tmp"
+		self.directory.mkdir(parents=True, exist_ok=True)
+		temporary.write_text(data)
+		os.replace(temporary, path)
+
+	def collect(self) -> dict[tuple, list]:
+		"""Return the samples of every process that wrote a snapshot."""
+		if self.directory is None:
+			with self.lock:
+				return {key: list(s) for key, s in self.samples.items()}
+
+		self.flush(force=True)
+		samples: dict[tuple, list] = {}
+		for path in self.directory.glob("*.json"):
+			try:
+				snapshot = json.loads(path.read_text())
+			except (OSError, ValueError):
+				continue
+			for *key, sample in snapshot:
+				key = tuple(key)
+				if (total := samples.get(key)) is None:
+					samples[key] = sample
+				else:
+					samples[key] = [a + b for a, b in zip(total, sample)]
+
+		return samples
+
+
+class RequestMetrics:
+	"""
+	Counts the queries and the database and template time of a request
+	while it is entered, which may be more than once for streaming.
+	"""
+
+	def __init__(self) -> None:
+		self.queries = 0
+		self.db_seconds = 0.0
+		self.template_seconds = 0.0
+		self.fragment_hits = 0
+		self.fragment_misses = 0
+		self.stack = ExitStack()
+
+	def __enter__(self) -> "RequestMetrics":
+		for connection in connections.all():
+			self.stack.enter_context(connection.execute_wrapper(self))
+		# Not a reset token: async requests enter and exit in contexts
+		# copied by sync_to_async.
+		self.stack.callback(_current.set, _current.get())
+		_current.set(self)
+
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.stack.close()
+
+	async def __aenter__(self) -> "RequestMetrics":
+		"""
+		Enter in the thread that runs the request's sync code, async
+		queries included, since connections belong to their thread.
+		"""
+		return await sync_to_async(self.__enter__)()
+
+	async def __aexit__(self, *exc_info) -> None:
+		await sync_to_async(self.__exit__)(*exc_info)
+
+	def __call__(self, execute, sql, params, many, context):
+		started = time.perf_counter()
+		try:
+			return execute(sql, params, many, context)
+		finally:
+			self.db_seconds += time.perf_counter() - started
+			self.queries += 1
+
+	def record(
+		self, labels: tuple[str, ...], duration: float, size: int | None
+	) -> None:
+		store.observe("request_duration_seconds", labels, duration)
+		store.observe("request_db_queries", labels, self.queries)
+		store.observe("request_db_seconds", labels, self.db_seconds)
+		store.observe(
+			"request_template_seconds", labels, self.template_seconds
+		)
+		store.observe(
+			"request_fragment_cache_hits", labels, self.fragment_hits
+		)
+		store.observe(
+			"request_fragment_cache_misses", labels, self.fragment_misses
+		)
+		if size is not None:
+			store.observe("response_size_bytes", labels, size)
+		store.flush()
+
+
+def get_current() -> RequestMetrics | None:
+	"""Return the metrics of the request being served, if any."""
+	return _current.get()
+
+
+class TimedTemplate(Template):
+	def render(self, context=None, request=None):
+		started = time.perf_counter()
+		try:
+			return super().render(context, request)
+		finally:
+			if (metrics := _current.get()) is not None:
+				metrics.template_seconds += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+	"""The Django template backend, timing renders for the metrics."""
+
+	def from_string(self, template_code):
+		return TimedTemplate(self.engine.from_string(template_code), self)
+
+	def get_template(self, template_name):
+		try:
+			return TimedTemplate(
+				self.engine.get_template(template_name), self
+			)
+		except TemplateDoesNotExist as error:
+			reraise(error, self)
+
+
+def render_metrics(samples: dict[tuple, list]) -> str:
+	"""Render the samples in the Prometheus text exposition format."""
+	by_metric: dict[str, list] = {metric: [] for metric in METRICS}
+	for (metric, view, method), sample in samples.items():
+		if metric in by_metric:
+			by_metric[metric].append(((view, method), sample))
+
+	lines = []
+	for metric, (kind, help_text, buckets) in METRICS.items():
+		name = f"{PREFIX}_{metric}"
+		lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+		for (view, method), sample in sorted(by_metric[metric]):
+			labels = f'view="{_escape(view)}",method="{_escape(method)}"'
+			cumulative = 0
+			for bound, count in zip(buckets, sample[2:]):
+				cumulative += count
+				lines.append(
+					f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+				)
+			if buckets:
+				lines.append(
+					f'{name}_bucket{{{labels},le="+Inf"}} {sample[0]}'
+				)
+			lines.append(f"{name}_sum{{{labels}}} {sample[1]}")
+			lines.append(f"{name}_count{{{labels}}} {sample[0]}")
+
+	return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+	return (
+		value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+	)
+
+
+store = MetricsStore(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+# Samples recorded before gunicorn forks belong to the master process.
+os.register_at_fork(after_in_child=store.reset)
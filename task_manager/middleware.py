@@ -0,0 +1,485 @@
+import logging
+import random
+import time
+
+from asgiref.sync import (
+	iscoroutinefunction,
+	markcoroutinefunction,
+	sync_to_async,
+)
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core import signing
+from django.urls import Resolver404, resolve
+
+from task_manager.memory import MemoryTracer
+from task_manager import page_cache
+from task_manager.metrics import RequestMetrics
+from task_manager.profiling import RequestProfiler
+from task_manager.query_budget import (
+	QueryBudgetExceeded,
+	QueryShapeRecorder,
+	get_query_budget,
+)
+from task_manager.routers import use_primary
+
+logger = logging.getLogger("task_manager.queries")
+
+SERVER_TIMING = "server-timing"
+PROFILE = "profile"
+MEMORY_PROFILE = "memory-profile"
+
+
+class AsyncCapableMiddleware:
+	"""
+	Base of middleware serving sync and async requests alike, so that
+	ASGI requests don't change threads at each layer. ``__call__``
+	hands async requests to ``__acall__``, as Django's MiddlewareMixin
+	does.
+	"""
+
+	sync_capable = True
+	async_capable = True
+
+	def __init__(self, get_response) -> None:
+		self.get_response = get_response
+		if iscoroutinefunction(get_response):
+			markcoroutinefunction(self)
+
+
+class NPlusOneMiddleware(AsyncCapableMiddleware):
+	"""
+	Logs SQL shapes repeated ``NPLUSONE_THRESHOLD`` times within a request,
+	with the template line or code that ran them, and requests going over
+	their view's query budget, which raise QueryBudgetExceeded in tests
+	instead. Only ``NPLUSONE_SAMPLE_RATE`` of requests are recorded, so it
+	can stay on in production.
+	"""
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+		if random.random() >= settings.NPLUSONE_SAMPLE_RATE:
+			return self.get_response(request)
+
+		with QueryShapeRecorder(settings.NPLUSONE_THRESHOLD) as recorder:
+			response = self.get_response(request)
+		self.report(request, recorder)
+
+		return response
+
+	async def __acall__(self, request):
+		if random.random() >= settings.NPLUSONE_SAMPLE_RATE:
+			return await self.get_response(request)
+
+		async with QueryShapeRecorder(
+			settings.NPLUSONE_THRESHOLD
+		) as recorder:
+			response = await self.get_response(request)
+		self.report(request, recorder)
+
+		return response
+
+	def report(self, request, recorder: QueryShapeRecorder) -> None:
+		for shape, count, trigger in recorder.get_repeated():
+			logger.warning(
+				"%s %s ran the same query %d times, first repeated at %s: %s",
+				request.method, request.path, count, trigger, shape,
+			)
+		budget = self.get_query_budget(request)
+		if budget is None or recorder.count <= budget:
+			return
+
+		message = "%s %s ran %d queries, over its budget of %d." % (
+			request.method, request.path, recorder.count, budget,
+		)
+		if settings.TESTING:
+			raise QueryBudgetExceeded(message)
+		logger.warning(message)
+
+	@staticmethod
+	def get_query_budget(request) -> int | None:
+		match = request.resolver_match
+		if match is None:
+			try:
+				match = resolve(request.path_info)
+			except Resolver404:
+				return None
+
+		return get_query_budget(match.func, request.method)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+	"""
+	Records latency, queries, template time and response size per URL
+	name for the ``/metrics`` view. Streaming responses are recorded once
+	they have been sent, so the queries run while streaming count.
+	"""
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+
+		started = time.perf_counter()
+		with RequestMetrics() as metrics:
+			request.metrics = metrics
+			response = self.get_response(request)
+
+		return self.record(request, response, metrics, started)
+
+	async def __acall__(self, request):
+		started = time.perf_counter()
+		async with RequestMetrics() as metrics:
+			request.metrics = metrics
+			response = await self.get_response(request)
+
+		return self.record(request, response, metrics, started)
+
+	def record(
+		self, request, response, metrics: RequestMetrics, started: float
+	):
+		match = request.resolver_match
+		labels = (match.view_name if match else "unresolved", request.method)
+		if not response.streaming:
+			metrics.record(
+				labels, time.perf_counter() - started, len(response.content)
+			)
+		elif response.is_async:
+			metrics.record(labels, time.perf_counter() - started, None)
+		else:
+			response.streaming_content = self.stream(
+				response.streaming_content, metrics, labels, started
+			)
+
+		return response
+
+	@staticmethod
+	def stream(content, metrics: RequestMetrics, labels, started: float):
+		size = 0
+		try:
+			with metrics:
+				for chunk in content:
+					size += len(chunk)
+					yield chunk
+		finally:
+			metrics.record(labels, time.perf_counter() - started, size)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+	"""
+	Adds a Server-Timing header with the database, template, view and
+	total time and the query count of the request, for the requesters
+	``SERVER_TIMING_ALLOW`` lets see it: "staff" users and requests with
+	a valid X-Server-Timing-Token from ``make_trigger_token``.
+	Queries run while a response streams come after the header.
+	"""
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+		if not settings.SERVER_TIMING_ALLOW:
+			return self.get_response(request)
+
+		started = time.perf_counter()
+		if getattr(request, "metrics", None) is not None:
+			response = self.get_response(request)
+		else:
+			with RequestMetrics() as request.metrics:
+				response = self.get_response(request)
+
+		return self.add_header(request, response, started)
+
+	async def __acall__(self, request):
+		if not settings.SERVER_TIMING_ALLOW:
+			return await self.get_response(request)
+
+		started = time.perf_counter()
+		if getattr(request, "metrics", None) is not None:
+			response = await self.get_response(request)
+		else:
+			async with RequestMetrics() as request.metrics:
+				response = await self.get_response(request)
+
+		return self.add_header(request, response, started)
+
+	def add_header(self, request, response, started: float):
+		if (
+			getattr(request, "metrics", None) is not None
+			and self.is_allowed(request)
+		):
+			response.headers["Server-Timing"] = self.get_header(
+				request, time.perf_counter() - started
+			)
+
+		return response
+
+	def process_view(self, request, view_func, view_args, view_kwargs):
+		# Requests skipped in __call__ may not be measured at all.
+		if (metrics := getattr(request, "metrics", None)) is None:
+			return
+		request.server_timing_view = (
+			time.perf_counter(), metrics.db_seconds, metrics.template_seconds
+		)
+
+	@staticmethod
+	def is_allowed(request) -> bool:
+		allow = settings.SERVER_TIMING_ALLOW
+		token = request.headers.get("X-Server-Timing-Token")
+		if "token" in allow and token and is_trigger_token(
+			token, SERVER_TIMING, settings.SERVER_TIMING_TOKEN_MAX_AGE
+		):
+			return True
+
+		# Checked only when the request loaded the user, so that the
+		# header never costs queries.
+		user = getattr(request, "_cached_user", None)
+
+		return "staff" in allow and user is not None and user.is_staff
+
+	@staticmethod
+	def get_header(request, total: float) -> str:
+		metrics = request.metrics
+		entries = [
+			f'db;dur={metrics.db_seconds * 1000:.1f};'
+			f'desc="{metrics.queries} queries"',
+			f"tmpl;dur={metrics.template_seconds * 1000:.1f}",
+		]
+		if view := getattr(request, "server_timing_view", None):
+			started, db_seconds, template_seconds = view
+			seconds = (
+				time.perf_counter() - started
+				- (metrics.db_seconds - db_seconds)
+				- (metrics.template_seconds - template_seconds)
+			)
+			entries.append(f"view;dur={seconds * 1000:.1f}")
+		entries.append(f"total;dur={total * 1000:.1f}")
+
+		return ", ".join(entries)
+
+
+class ProfilerMiddleware:
+	"""
+	Profiles one in ``PROFILER_SAMPLE_EVERY`` requests, and requests with
+	a valid X-Profile-Token from ``make_trigger_token``, into
+	``PROFILER_DIR``. Other requests only pay for the dice roll.
+	"""
+
+	def __init__(self, get_response) -> None:
+		self.get_response = get_response
+
+	def __call__(self, request):
+		if not self.should_profile(request):
+			return self.get_response(request)
+
+		with RequestProfiler(settings.PROFILER_INTERVAL) as profiler:
+			response = self.get_response(request)
+
+		match = request.resolver_match
+		profiler.save(
+			settings.PROFILER_DIR,
+			match.view_name if match else "unresolved",
+			settings.PROFILER_MAX_FILES,
+		)
+
+		return response
+
+	@staticmethod
+	def should_profile(request) -> bool:
+		every = settings.PROFILER_SAMPLE_EVERY
+		if every and random.randrange(every) == 0:
+			return True
+
+		token = request.headers.get("X-Profile-Token")
+
+		return bool(token) and is_trigger_token(
+			token, PROFILE, settings.PROFILER_TOKEN_MAX_AGE
+		)
+
+
+class MemoryProfilerMiddleware:
+	"""
+	Traces the allocations of one in ``MEMORY_PROFILER_SAMPLE_EVERY``
+	requests, and of requests with a valid X-Memory-Profile-Token from
+	``make_trigger_token``, into ``MEMORY_PROFILER_DIR``. tracemalloc
+	slows down the whole process while tracing, so keep sampling rare.
+	"""
+
+	def __init__(self, get_response) -> None:
+		self.get_response = get_response
+
+	def __call__(self, request):
+		if not self.should_trace(request):
+			return self.get_response(request)
+
+		with MemoryTracer(settings.MEMORY_PROFILER_FRAMES) as tracer:
+			response = self.get_response(request)
+
+		if tracer.traced:
+			match = request.resolver_match
+			tracer.save(
+				settings.MEMORY_PROFILER_DIR,
+				match.view_name if match else "unresolved",
+				settings.MEMORY_PROFILER_TOP_LINES,
+				settings.MEMORY_PROFILER_MAX_FILES,
+			)
+
+		return response
+
+	@staticmethod
+	def should_trace(request) -> bool:
+		every = settings.MEMORY_PROFILER_SAMPLE_EVERY
+		if every and random.randrange(every) == 0:
+			return True
+
+		token = request.headers.get("X-Memory-Profile-Token")
+
+		return bool(token) and is_trigger_token(
+			token, MEMORY_PROFILE, settings.MEMORY_PROFILER_TOKEN_MAX_AGE
+		)
+
+
+class ReplicaStickinessMiddleware(AsyncCapableMiddleware):
+	"""
+	Reads the primary database during requests that may write, and
+	during the requests that follow within ``REPLICA_STICKY_SECONDS``,
+	marked by a cookie, so that users see their writes before the
+	replicas catch up. A cookie rather than the session, since the
+	session is itself read from the database.
+	"""
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+		if not self.is_sticky(request):
+			return self.get_response(request)
+
+		with use_primary():
+			response = self.get_response(request)
+
+		return self.stick(request, response)
+
+	async def __acall__(self, request):
+		if not self.is_sticky(request):
+			return await self.get_response(request)
+
+		with use_primary():
+			response = await self.get_response(request)
+
+		return self.stick(request, response)
+
+	@staticmethod
+	def is_sticky(request) -> bool:
+		return bool(settings.DATABASE_REPLICAS) and (
+			not is_safe(request)
+			or settings.REPLICA_STICKY_COOKIE in request.COOKIES
+		)
+
+	def stick(self, request, response):
+		if response.streaming:
+			stream = self.astream if response.is_async else self.stream
+			response.streaming_content = stream(response.streaming_content)
+
+		if not is_safe(request):
+			response.set_cookie(
+				settings.REPLICA_STICKY_COOKIE,
+				"1",
+				max_age=settings.REPLICA_STICKY_SECONDS,
+				secure=settings.SESSION_COOKIE_SECURE,
+				httponly=True,
+				samesite="Lax",
+			)
+
+		return response
+
+	@staticmethod
+	def stream(content):
+		with use_primary():
+			yield from content
+
+	@staticmethod
+	async def astream(content):
+		with use_primary():
+			async for chunk in content:
+				yield chunk
+
+
+class AnonymousPageCacheMiddleware(AsyncCapableMiddleware):
+	"""
+	Serves the pages of views with a page cache timeout to anonymous
+	visitors from the page cache, caching the pages it renders for them.
+	Visitors with a session or pending messages always get a fresh page.
+	"""
+
+	def __call__(self, request):
+		if iscoroutinefunction(self):
+			return self.__acall__(request)
+
+		response = self.get_response(request)
+		if (timeout := self.get_timeout(request, response)) is not None:
+			page_cache.set_page(request, response, timeout)
+
+		return response
+
+	async def __acall__(self, request):
+		response = await self.get_response(request)
+		if (timeout := self.get_timeout(request, response)) is not None:
+			await sync_to_async(page_cache.set_page)(
+				request, response, timeout
+			)
+
+		return response
+
+	@staticmethod
+	def get_timeout(request, response) -> int | None:
+		"""Return the page's cache timeout, if the response may be cached."""
+		timeout = getattr(request, "page_cache_timeout", None)
+		if (
+			timeout is None
+			or response.status_code != 200
+			or response.streaming
+			or response.cookies
+		):
+			return None
+
+		return timeout
+
+	def process_view(self, request, view_func, view_args, view_kwargs):
+		timeout = page_cache.get_page_cache_timeout(view_func)
+		if (
+			timeout is None
+			or request.method not in ("GET", "HEAD")
+			or settings.SESSION_COOKIE_NAME in request.COOKIES
+			or CookieStorage.cookie_name in request.COOKIES
+		):
+			return None
+
+		if (response := page_cache.get_page(request)) is not None:
+			return response
+
+		request.page_cache_timeout = timeout
+		request.page_cache_started = time.time_ns()
+		request.surrogate_keys = set()
+
+		return None
+
+
+def is_safe(request) -> bool:
+	return request.method in ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+def make_trigger_token(purpose: str) -> str:
+	"""Return a signed token that turns on ``purpose`` for a while."""
+	return signing.TimestampSigner(salt=f"task_manager.{purpose}").sign(
+		purpose
+	)
+
+
+def is_trigger_token(token: str, purpose: str, max_age: int) -> bool:
+	try:
+		value = signing.TimestampSigner(
+			salt=f"task_manager.{purpose}"
+		).unsign(token, max_age=max_age)
+	except signing.BadSignature:
+		return False
+
+	return value == purpose
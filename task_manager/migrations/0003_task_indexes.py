@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+from task_manager.operations import (
+    AddIndexConcurrentlyOnPostgres,
+    AddThroughIndex,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, so the indexes
+    # are split from the atomic 0002_task_ordering migration.
+    atomic = False
+
+    dependencies = [
+        ("task_manager", "0002_task_ordering"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="task",
+            index=models.Index(
+                fields=["-priority", "deadline", "id"],
+                name="task_priority_deadline_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["deadline"],
+                name="task_open_deadline_idx",
+            ),
+        ),
+        AddThroughIndex(
+            model_name="task",
+            field_name="assignees",
+            index=models.Index(
+                fields=["worker", "task"],
+                name="task_assignees_worker_idx",
+            ),
+        ),
+    ]
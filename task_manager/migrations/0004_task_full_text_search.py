@@ -0,0 +1,49 @@
+from django.db import migrations
+
+from task_manager.operations import RunSQLOnVendor
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0003_task_indexes"),
+    ]
+
+    operations = [
+        RunSQLOnVendor(
+            "postgresql",
+            sql="""
+                ALTER TABLE "task_manager_task"
+                ADD COLUMN "search_vector" tsvector
+                GENERATED ALWAYS AS (
+                    setweight(
+                        to_tsvector('english'::regconfig, coalesce("name", '')),
+                        'A'
+                    )
+                    || setweight(
+                        to_tsvector(
+                            'english'::regconfig, coalesce("description", '')
+                        ),
+                        'B'
+                    )
+                ) STORED
+            """,
+            reverse_sql="""
+                ALTER TABLE "task_manager_task" DROP COLUMN "search_vector"
+            """,
+        ),
+        RunSQLOnVendor(
+            "sqlite",
+            sql=[
+                """
+                CREATE VIRTUAL TABLE "task_manager_task_fts"
+                USING fts5(name, description)
+                """,
+                """
+                INSERT INTO "task_manager_task_fts" (rowid, name, description)
+                SELECT "id", "name", "description" FROM "task_manager_task"
+                """,
+            ],
+            reverse_sql='DROP TABLE "task_manager_task_fts"',
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from task_manager.operations import AddRawIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, so the index
+    # is split from the atomic 0004_task_full_text_search migration.
+    atomic = False
+
+    dependencies = [
+        ("task_manager", "0004_task_full_text_search"),
+    ]
+
+    operations = [
+        AddRawIndexConcurrentlyOnPostgres(
+            name="task_search_vector_idx",
+            table="task_manager_task",
+            using='GIN ("search_vector")',
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from task_manager.operations import RunSQLOnVendor
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0005_task_full_text_search_index"),
+    ]
+
+    operations = [
+        RunSQLOnVendor(
+            "postgresql",
+            sql="CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        RunSQLOnVendor(
+            "sqlite",
+            sql=[
+                """
+                CREATE VIRTUAL TABLE "task_manager_worker_trgm"
+                USING fts5(username, first_name, last_name, tokenize='trigram')
+                """,
+                """
+                INSERT INTO "task_manager_worker_trgm"
+                    (rowid, username, first_name, last_name)
+                SELECT "id", "username", "first_name", "last_name"
+                FROM "task_manager_worker"
+                """,
+            ],
+            reverse_sql='DROP TABLE "task_manager_worker_trgm"',
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from task_manager.operations import AddRawIndexConcurrentlyOnPostgres
+
+TRIGRAM_FIELDS = ("username", "first_name", "last_name")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, so the indexes
+    # are split from the atomic 0006_worker_trigram_search migration.
+    atomic = False
+
+    dependencies = [
+        ("task_manager", "0006_worker_trigram_search"),
+    ]
+
+    # icontains compiles to UPPER("field"::text) LIKE UPPER(%s), so the
+    # indexes are built on that expression.
+    operations = [
+        AddRawIndexConcurrentlyOnPostgres(
+            name=f"worker_{field}_trgm_idx",
+            table="task_manager_worker",
+            using=f'GIN (UPPER("{field}"::text) gin_trgm_ops)',
+        )
+        for field in TRIGRAM_FIELDS
+    ]
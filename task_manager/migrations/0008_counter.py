@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:50
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    Counter = apps.get_model("task_manager", "Counter")
+    Task = apps.get_model("task_manager", "Task")
+    Worker = apps.get_model("task_manager", "Worker")
+    using = schema_editor.connection.alias
+
+    Counter.objects.using(using).bulk_create(
+        [
+            Counter(name="total_tasks", value=Task.objects.using(using).count()),
+            Counter(
+                name="active_tasks",
+                value=Task.objects.using(using).filter(is_completed=False).count(),
+            ),
+            Counter(name="total_users", value=Worker.objects.using(using).count()),
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0007_worker_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
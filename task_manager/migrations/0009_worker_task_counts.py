@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_worker_tasks(apps, schema_editor):
+    Task = apps.get_model("task_manager", "Task")
+    Worker = apps.get_model("task_manager", "Worker")
+    using = schema_editor.connection.alias
+
+    def count_assigned_tasks(is_completed):
+        assignments = (
+            Task.assignees.through.objects.using(using)
+            .filter(worker_id=OuterRef("pk"), task__is_completed=is_completed)
+            .order_by()
+            .values("worker_id")
+            .annotate(count=Count("*"))
+        )
+        return Coalesce(Subquery(assignments.values("count")), 0)
+
+    Worker.objects.using(using).update(
+        active_task_count=count_assigned_tasks(False),
+        resolved_task_count=count_assigned_tasks(True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager", "0008_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="active_task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="resolved_task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_worker_tasks, migrations.RunPython.noop),
+    ]
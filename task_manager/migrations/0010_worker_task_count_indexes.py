@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:52
+
+from django.db import migrations, models
+
+from task_manager.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, so the indexes
+    # are split from the atomic 0009_worker_task_counts backfill.
+    atomic = False
+
+    dependencies = [
+        ("task_manager", "0009_worker_task_counts"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="worker",
+            index=models.Index(
+                fields=["-active_task_count", "username", "id"],
+                name="worker_active_tasks_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="worker",
+            index=models.Index(
+                fields=["-resolved_task_count", "username", "id"],
+                name="worker_resolved_tasks_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+from task_manager.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, so the indexes
+    # are split from the atomic 0011_updated_at migration.
+    atomic = False
+
+    dependencies = [
+        ("task_manager", "0011_updated_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="task",
+            index=models.Index(
+                fields=["updated_at"], name="task_updated_at_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="worker",
+            index=models.Index(
+                fields=["updated_at"], name="worker_updated_at_idx"
+            ),
+        ),
+    ]
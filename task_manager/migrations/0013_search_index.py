@@ -0,0 +1,69 @@
+# Generated by Django 5.1.3 on 2026-10-18 22:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import task_manager.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0012_updated_at_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSearchIndex",
+            fields=[
+                (
+                    "task",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="sqlite_index",
+                        serialize=False,
+                        to="task_manager.task",
+                    ),
+                ),
+                (
+                    "document",
+                    task_manager.search.SearchDocumentField(
+                        db_column="task_manager_task_fts"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "task_manager_task_fts",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="WorkerSearchIndex",
+            fields=[
+                (
+                    "worker",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="sqlite_index",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "document",
+                    task_manager.search.SearchDocumentField(
+                        db_column="task_manager_worker_trgm"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "task_manager_worker_trgm",
+                "managed": False,
+            },
+        ),
+    ]
@@ -1,4 +1,16 @@
+import hashlib
+from calendar import timegm
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
 from task_manager.forms import SearchForm
+from task_manager.pagination import KeysetPaginator
+from task_manager.search import SearchBackend
 
 
 class PreviousPageMixin:
@@ -11,15 +23,176 @@ class PreviousPageMixin:
 		return context
 
 
+class CachedObjectMixin:
+	"""
+	Fetches the view's object once, though permission checks in
+	``dispatch`` and the handlers both ask for it.
+	"""
+
+	def get_object(self, queryset=None):
+		if queryset is not None:
+			return super().get_object(queryset)
+		if not hasattr(self, "_object"):
+			self._object = super().get_object()
+
+		return self._object
+
+
 class SearchMixin:
-	"""Adds a search form with the query parameter to the context."""
+	"""
+	Filters the queryset through the view's search backend and adds a
+	search form with the query parameter to the context. Ranked results
+	are ordered by relevance first.
+	"""
+
+	search_backend: SearchBackend | None = None
+
+	def get_search_query(self) -> str:
+		return str(self.request.GET.get("query", "")).strip()
+
+	def get_search_backend(self) -> SearchBackend | None:
+		return self.search_backend
+
+	def get_queryset(self):
+		queryset = super().get_queryset()
+		search_backend = self.get_search_backend()
+
+		if search_backend and (search_query := self.get_search_query()):
+			queryset = search_backend.search(queryset, search_query)
+
+		return queryset
+
+	def get_keyset_ordering(self) -> tuple[str, ...]:
+		ordering = super().get_keyset_ordering()
+		search_backend = self.get_search_backend()
+
+		if search_backend and self.get_search_query():
+			return search_backend.rank_ordering + ordering
+
+		return ordering
 
 	def get_context_data(self, **kwargs) -> dict:
 		context = super().get_context_data(**kwargs)
-		search_query = str(self.request.GET.get("query", "")).strip()
 
 		context["search_form"] = SearchForm(
-			initial={"query": search_query}
+			initial={"query": self.get_search_query()}
 		)
 
 		return context
+
+
+class KeysetPaginationMixin:
+	"""
+	Paginates list views with opaque ``?cursor=`` tokens seeking on
+	``keyset_ordering``. Requests carrying ``?page=`` keep the numbered
+	paginator so existing links still resolve.
+	"""
+
+	cursor_kwarg = "cursor"
+	keyset_ordering: tuple[str, ...] = ("id",)
+
+	def get_keyset_ordering(self) -> tuple[str, ...]:
+		return self.keyset_ordering
+
+	def paginate_queryset(self, queryset, page_size):
+		ordering = self.get_keyset_ordering()
+
+		if self.page_kwarg in self.request.GET:
+			return super().paginate_queryset(
+				queryset.order_by(*ordering), page_size
+			)
+
+		paginator = KeysetPaginator(queryset, page_size, ordering)
+		page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+
+		return paginator, page, page.object_list, page.has_other_pages()
+
+	async def apaginate_queryset(self, queryset, page_size):
+		ordering = self.get_keyset_ordering()
+
+		if self.page_kwarg in self.request.GET:
+			# Django's paginator counts and slices synchronously.
+			return await sync_to_async(super().paginate_queryset)(
+				queryset.order_by(*ordering), page_size
+			)
+
+		paginator = KeysetPaginator(queryset, page_size, ordering)
+		page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+
+		return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ConditionalGetMixin:
+	"""
+	Answers conditional GETs with 304 Not Modified before the object or
+	list is loaded. The ETag hashes ``get_probe()``, a cheap query of
+	what the page shows, such as the latest ``updated_at`` and a count,
+	with what else goes into the page: the user, the CSRF secret, the
+	URL and the day, which overdue badges depend on. Pages with pending
+	messages are always rendered, since showing them consumes them.
+	"""
+
+	def get_probe(self) -> tuple | None:
+		"""Return the probe values, or None to render the page as usual."""
+		raise NotImplementedError
+
+	async def aget_probe(self) -> tuple | None:
+		return await sync_to_async(self.get_probe)()
+
+	def get_last_modified(self, probe: tuple) -> datetime | None:
+		return None
+
+	def get_etag(self, probe: tuple) -> str:
+		request = self.request
+		parts = (
+			probe,
+			request.user.pk,
+			getattr(request.user, "updated_at", None),
+			request.META.get("CSRF_COOKIE"),
+			request.get_full_path(),
+			date.today(),
+		)
+		digest = hashlib.md5(
+			repr(parts).encode(), usedforsecurity=False
+		).hexdigest()
+
+		return f'W/"{digest}"'
+
+	def get(self, request, *args, **kwargs):
+		if len(get_messages(request)) or (probe := self.get_probe()) is None:
+			return super().get(request, *args, **kwargs)
+
+		if (response := self.get_not_modified(probe)) is None:
+			response = super().get(request, *args, **kwargs)
+		self.add_validators(response, probe)
+
+		return response
+
+	def get_not_modified(self, probe: tuple) -> HttpResponse | None:
+		"""Return a 304 response if the client's copy is current."""
+		return get_conditional_response(
+			self.request,
+			etag=self.get_etag(probe),
+			last_modified=self._get_timestamp(probe),
+		)
+
+	def add_validators(self, response: HttpResponse, probe: tuple) -> None:
+		if hasattr(response, "add_post_render_callback"):
+			# Rendering may set the CSRF cookie the next ETag will cover.
+			response.add_post_render_callback(
+				lambda rendered: self.set_validators(rendered, probe)
+			)
+		else:
+			self.set_validators(response, probe)
+
+	def set_validators(self, response: HttpResponse, probe: tuple) -> None:
+		if response.status_code in (200, 304):
+			response.headers["ETag"] = self.get_etag(probe)
+			if timestamp := self._get_timestamp(probe):
+				response.headers["Last-Modified"] = http_date(timestamp)
+
+	def _get_timestamp(self, probe: tuple) -> int | None:
+		if last_modified := self.get_last_modified(probe):
+			return timegm(last_modified.utctimetuple())
+
+		return None
@@ -1,54 +1,218 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Now
 from django.utils.timezone import now
 
+from task_manager.search import SearchDocumentField
 
-class TaskType(models.Model):
+
+class FieldTrackerMixin:
+	"""
+	Remembers field values as loaded from or last saved to the database,
+	so saves of existing rows write only the changed columns and callers
+	can validate only what changed without re-reading the row.
+	"""
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._snapshot()
+
+		return instance
+
+	def get_loaded_value(self, field_name: str, default=None):
+		"""Return the field's value as last loaded or saved."""
+		attname = self._meta.get_field(field_name).attname
+
+		return getattr(self, "_loaded_values", {}).get(attname, default)
+
+	def get_dirty_fields(self) -> set[str]:
+		"""Return names of the fields changed since the last load or save."""
+		loaded = getattr(self, "_loaded_values", None)
+		fields = self._meta.concrete_fields
+
+		if self._state.adding or loaded is None:
+			return {field.name for field in fields if not field.primary_key}
+
+		return {
+			field.name for field in fields
+			if not field.primary_key
+			# Deferred fields that were never loaded can't have changed.
+			and field.attname in self.__dict__
+			and (
+				field.attname not in loaded
+				or loaded[field.attname] != self.__dict__[field.attname]
+			)
+		}
+
+	def get_clean_fields(self) -> list[str]:
+		"""
+		Return names of the fields unchanged since the last load or save,
+		or already validated with their current value.
+		"""
+		dirty = self.get_dirty_fields()
+		validated = getattr(self, "_validated_values", {})
+
+		return [
+			field.name for field in self._meta.concrete_fields
+			if field.name not in dirty
+			or (
+				field.attname in validated
+				and validated[field.attname]
+				== self.__dict__.get(field.attname)
+			)
+		]
+
+	def mark_validated(self, field_names) -> None:
+		"""
+		Remember the values of fields a model form validated, uniqueness
+		and foreign keys included, so that saving doesn't query them again.
+		"""
+		field_names = set(field_names)
+		self._validated_values = {
+			field.attname: self.__dict__[field.attname]
+			for field in self._meta.concrete_fields
+			if field.name in field_names and field.attname in self.__dict__
+		}
+
+	def save(self, *args, **kwargs):
+		if (
+			not self._state.adding
+			and kwargs.get("update_fields") is None
+			and not kwargs.get("force_insert")
+			and hasattr(self, "_loaded_values")
+		):
+			# An empty update_fields makes Django skip the save entirely.
+			if dirty := self.get_dirty_fields():
+				# auto_now fields change on every save but are never dirty.
+				dirty |= {
+					field.name for field in self._meta.concrete_fields
+					if getattr(field, "auto_now", False)
+				}
+			kwargs["update_fields"] = dirty
+
+		super().save(*args, **kwargs)
+		self._snapshot(kwargs.get("update_fields"))
+		self.__dict__.pop("_validated_values", None)
+
+	def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+		super().refresh_from_db(
+			using=using, fields=fields, from_queryset=from_queryset
+		)
+		self._snapshot(fields)
+
+	def _snapshot(self, field_names=None) -> None:
+		loaded = self.__dict__.setdefault("_loaded_values", {})
+
+		for field in self._meta.concrete_fields:
+			if field_names is not None and not (
+				field.name in field_names or field.attname in field_names
+			):
+				continue
+			if field.attname in self.__dict__:
+				loaded[field.attname] = self.__dict__[field.attname]
+
+
+class CountedMixin:
+	"""
+	Sends ``post_save`` inside the save's transaction, so the counters
+	``task_manager.signals`` update commit or roll back with the row.
+	Deletes and assignment changes already send their signals inside one.
+	"""
+
+	def save_base(self, *args, using=None, **kwargs):
+		with transaction.atomic(using=using, savepoint=False):
+			super().save_base(*args, using=using, **kwargs)
+
+
+class TaskType(FieldTrackerMixin, models.Model):
 	name = models.CharField(max_length=100, unique=True)
 
 	class Meta:
 		ordering = ["name"]
 
 	def save(self, *args, **kwargs):
-		self.full_clean()
+		self.full_clean(exclude=self.get_clean_fields())
 		super().save(*args, **kwargs)
 
 	def __str__(self) -> str:
 		return self.name
 
 
-class Position(models.Model):
+class Position(FieldTrackerMixin, models.Model):
 	name = models.CharField(max_length=100, unique=True)
 
 	class Meta:
 		ordering = ["name"]
 
 	def save(self, *args, **kwargs):
-		self.full_clean()
+		self.full_clean(exclude=self.get_clean_fields())
 		super().save(*args, **kwargs)
 
 	def __str__(self) -> str:
 		return self.name
 
 
-class Worker(AbstractUser):
+class Worker(CountedMixin, FieldTrackerMixin, AbstractUser):
 	position = models.ForeignKey(
 		Position,
 		on_delete=models.SET_NULL,
 		null=True,
 		related_name="workers",
 	)
+	active_task_count = models.IntegerField(default=0, editable=False)
+	resolved_task_count = models.IntegerField(default=0, editable=False)
+	updated_at = models.DateTimeField(auto_now=True, db_default=Now())
 
 	class Meta(AbstractUser.Meta):
 		verbose_name = "Worker"
 		verbose_name_plural = "Workers"
+		indexes = [
+			models.Index(
+				fields=["-active_task_count", "username", "id"],
+				name="worker_active_tasks_idx",
+			),
+			models.Index(
+				fields=["-resolved_task_count", "username", "id"],
+				name="worker_resolved_tasks_idx",
+			),
+			models.Index(fields=["updated_at"], name="worker_updated_at_idx"),
+		]
 
 	def __str__(self) -> str:
 		return self.username
 
+	@property
+	def total_task_count(self) -> int:
+		return self.active_task_count + self.resolved_task_count
 
-class Task(models.Model):
+
+class TaskQuerySet(models.QuerySet):
+	def editable_by(self, user) -> "TaskQuerySet":
+		"""
+		Keep the tasks the user may edit or delete: every task for
+		superusers, the tasks they are assigned to for everyone else.
+		"""
+		if user.is_superuser:
+			return self
+		if not user.is_authenticated:
+			return self.none()
+
+		return self.filter(assignees__pk=user.pk)
+
+	def with_editable(self, user) -> "TaskQuerySet":
+		"""Annotate each task with whether ``editable_by(user)`` keeps it."""
+		return self.annotate(
+			editable=models.Exists(
+				self.model.objects.filter(pk=models.OuterRef("pk")).editable_by(
+					user
+				)
+			)
+		)
+
+
+class Task(CountedMixin, FieldTrackerMixin, models.Model):
 	DEADLINE_ERROR_MESSAGE = "The deadline cannot be in the past."
 	PRIORITY_CHOICES = [
 		(4, "Urgent"),
@@ -60,6 +224,7 @@ class Task(models.Model):
 	name = models.CharField(max_length=100, unique=True, db_index=True)
 	description = models.TextField()
 	created_at = models.DateField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True, db_default=Now())
 	deadline = models.DateField()
 	is_completed = models.BooleanField(default=False)
 	priority = models.IntegerField(choices=PRIORITY_CHOICES)
@@ -71,11 +236,25 @@ class Task(models.Model):
 	)
 	assignees = models.ManyToManyField(Worker, related_name="tasks")
 
+	objects = TaskQuerySet.as_manager()
+
 	class Meta:
-		ordering = ["-priority", "deadline"]
+		ordering = ["-priority", "deadline", "id"]
+		indexes = [
+			models.Index(
+				fields=["-priority", "deadline", "id"],
+				name="task_priority_deadline_idx",
+			),
+			models.Index(
+				fields=["deadline"],
+				condition=models.Q(is_completed=False),
+				name="task_open_deadline_idx",
+			),
+			models.Index(fields=["updated_at"], name="task_updated_at_idx"),
+		]
 
 	def clean(self):
-		if self.pk and Task.objects.get(pk=self.pk).deadline == self.deadline:
+		if "deadline" not in self.get_dirty_fields():
 			return
 		if not self.deadline or self.deadline < now().date():
 			raise ValidationError(
@@ -83,8 +262,62 @@ class Task(models.Model):
 			)
 
 	def save(self, *args, **kwargs):
-		self.full_clean()
+		self.full_clean(exclude=self.get_clean_fields())
 		super().save(*args, **kwargs)
 
 	def __str__(self) -> str:
 		return self.name
+
+
+class Counter(models.Model):
+	"""
+	A denormalized row count, kept up to date by ``task_manager.signals``
+	and repaired by the ``reconcile_counters`` command.
+	"""
+
+	TOTAL_TASKS = "total_tasks"
+	ACTIVE_TASKS = "active_tasks"
+	TOTAL_USERS = "total_users"
+
+	name = models.CharField(max_length=50, unique=True)
+	value = models.BigIntegerField(default=0)
+
+	def __str__(self) -> str:
+		return f"{self.name}: {self.value}"
+
+
+class TaskSearchIndex(models.Model):
+	"""
+	The SQLite FTS5 table of task names and descriptions, created by a
+	migration and kept up to date by ``task_manager.search``.
+	"""
+
+	task = models.OneToOneField(
+		Task,
+		on_delete=models.DO_NOTHING,
+		primary_key=True,
+		db_column="rowid",
+		related_name="sqlite_index",
+	)
+	document = SearchDocumentField(db_column="task_manager_task_fts")
+
+	class Meta:
+		managed = False
+		db_table = "task_manager_task_fts"
+
+
+class WorkerSearchIndex(models.Model):
+	"""The SQLite FTS5 trigram table of worker names."""
+
+	worker = models.OneToOneField(
+		Worker,
+		on_delete=models.DO_NOTHING,
+		primary_key=True,
+		db_column="rowid",
+		related_name="sqlite_index",
+	)
+	document = SearchDocumentField(db_column="task_manager_worker_trgm")
+
+	class Meta:
+		managed = False
+		db_table = "task_manager_worker_trgm"
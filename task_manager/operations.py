@@ -0,0 +1,147 @@
+from django.db import migrations, models
+
+
+class AddIndexConcurrentlyOnPostgres(migrations.AddIndex):
+	"""
+	Adds an index with ``CREATE INDEX CONCURRENTLY`` on PostgreSQL so it can
+	ship to a live table, and with a plain ``CREATE INDEX`` elsewhere.
+	Migrations using it must set ``atomic = False``.
+	"""
+
+	def database_forwards(self, app_label, schema_editor, from_state, to_state):
+		model = to_state.apps.get_model(app_label, self.model_name)
+		if self.allow_migrate_model(schema_editor.connection.alias, model):
+			schema_editor.add_index(
+				model, self.index, **_concurrently(schema_editor)
+			)
+
+	def database_backwards(self, app_label, schema_editor, from_state, to_state):
+		model = from_state.apps.get_model(app_label, self.model_name)
+		if self.allow_migrate_model(schema_editor.connection.alias, model):
+			schema_editor.remove_index(
+				model, self.index, **_concurrently(schema_editor)
+			)
+
+
+class AddThroughIndex(migrations.operations.base.Operation):
+	"""
+	Adds an index to the auto-created through table of a many-to-many
+	field. The through model has no ``Meta`` of its own, so the index only
+	exists in the database and leaves the migration state untouched.
+	"""
+
+	reduces_to_sql = True
+	reversible = True
+
+	def __init__(self, model_name: str, field_name: str, index: models.Index):
+		self.model_name = model_name
+		self.field_name = field_name
+		self.index = index
+
+	def state_forwards(self, app_label, state):
+		pass
+
+	def database_forwards(self, app_label, schema_editor, from_state, to_state):
+		through = self._get_through(app_label, to_state)
+		if self.allow_migrate_model(schema_editor.connection.alias, through):
+			schema_editor.add_index(
+				through, self.index, **_concurrently(schema_editor)
+			)
+
+	def database_backwards(self, app_label, schema_editor, from_state, to_state):
+		through = self._get_through(app_label, from_state)
+		if self.allow_migrate_model(schema_editor.connection.alias, through):
+			schema_editor.remove_index(
+				through, self.index, **_concurrently(schema_editor)
+			)
+
+	def describe(self) -> str:
+		return (
+			f"Create index {self.index.name} on "
+			f"{self.model_name}.{self.field_name} through table"
+		)
+
+	@property
+	def migration_name_fragment(self) -> str:
+		return f"{self.model_name}_{self.index.name.lower()}"
+
+	def deconstruct(self):
+		return (
+			self.__class__.__qualname__,
+			[],
+			{
+				"model_name": self.model_name,
+				"field_name": self.field_name,
+				"index": self.index,
+			},
+		)
+
+	def _get_through(self, app_label, state):
+		model = state.apps.get_model(app_label, self.model_name)
+
+		return model._meta.get_field(self.field_name).remote_field.through
+
+
+class RunSQLOnVendor(migrations.RunSQL):
+	"""Runs raw SQL only when migrating a database of the given vendor."""
+
+	def __init__(self, vendor: str, *args, **kwargs):
+		self.vendor = vendor
+		super().__init__(*args, **kwargs)
+
+	def database_forwards(self, app_label, schema_editor, from_state, to_state):
+		if schema_editor.connection.vendor == self.vendor:
+			super().database_forwards(
+				app_label, schema_editor, from_state, to_state
+			)
+
+	def database_backwards(self, app_label, schema_editor, from_state, to_state):
+		if schema_editor.connection.vendor == self.vendor:
+			super().database_backwards(
+				app_label, schema_editor, from_state, to_state
+			)
+
+	def describe(self) -> str:
+		return f"Raw SQL operation for {self.vendor}"
+
+	def deconstruct(self):
+		name, args, kwargs = super().deconstruct()
+
+		return name, args, {"vendor": self.vendor, **kwargs}
+
+
+class AddRawIndexConcurrentlyOnPostgres(RunSQLOnVendor):
+	"""
+	Adds an index the migration state can't describe, such as a GIN index
+	on a generated column or an expression, with ``CREATE INDEX
+	CONCURRENTLY`` on PostgreSQL only. Migrations using it must set
+	``atomic = False``.
+	"""
+
+	def __init__(self, name: str, table: str, using: str):
+		self.name = name
+		self.table = table
+		self.using = using
+		super().__init__(
+			"postgresql",
+			sql=f'CREATE INDEX CONCURRENTLY "{name}" ON "{table}" '
+			f"USING {using}",
+			reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+		)
+
+	def describe(self) -> str:
+		return f"Create index {self.name} on {self.table} for postgresql"
+
+	def deconstruct(self):
+		return (
+			self.__class__.__qualname__,
+			[],
+			{"name": self.name, "table": self.table, "using": self.using},
+		)
+
+
+def _concurrently(schema_editor) -> dict:
+	if schema_editor.connection.vendor == "postgresql":
+		return {"concurrently": True}
+
+	return {}
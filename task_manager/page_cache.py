@@ -0,0 +1,251 @@
+"""
+Full-page cache for anonymous visitors. Views opt in with a
+``page_cache_timeout`` attribute, or the ``cache_anonymous_page``
+decorator, and tag the pages they render with surrogate keys such as
+``task:1`` or ``task-list``. Each key has a version in the cache, like
+the task fragment versions; a page is served only while the versions of
+its keys are the ones it was rendered with, so purging a key is one
+write however many pages carry it.
+
+Cached responses also get ``Cache-Control`` and ``Surrogate-Key``
+headers for a reverse proxy in front of Django, which
+``PAGE_CACHE_PURGE_URL`` is told about purges. PURGE requests are sent
+from a background thread, merging the purges queued meanwhile, so that
+writes never wait for the proxy.
+"""
+import hashlib
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+logger = logging.getLogger("task_manager.page_cache")
+
+VERSION_TIMEOUT = None
+# Tracking parameters don't change the page.
+IGNORED_PARAMS = ("utm_", "fbclid", "gclid")
+
+TASK_LIST = "task-list"
+WORKER_LIST = "worker-list"
+
+PURGE_TIMEOUT = 2
+
+# Purges for the proxy, as (url, keys), sent by the purger thread.
+_purges: queue.Queue = queue.Queue()
+_purger: threading.Thread | None = None
+_purger_lock = threading.Lock()
+
+
+def cache_anonymous_page(timeout: int) -> Callable:
+	"""Cache a function view's anonymous pages for ``timeout`` seconds."""
+	def decorator(view: Callable) -> Callable:
+		view.page_cache_timeout = timeout
+
+		return view
+
+	return decorator
+
+
+def get_page_cache_timeout(view: Callable) -> int | None:
+	"""Return the timeout of a view function or of an ``as_view()`` view."""
+	return getattr(
+		getattr(view, "view_class", view), "page_cache_timeout", None
+	)
+
+
+def get_cache() -> BaseCache:
+	return caches[settings.CACHE_MIDDLEWARE_ALIAS]
+
+
+def task_key(task_id: int) -> str:
+	return f"task:{task_id}"
+
+
+def worker_key(worker_id: int) -> str:
+	return f"worker:{worker_id}"
+
+
+def add_keys(request: HttpRequest, *keys: str) -> None:
+	"""Tag the page being rendered, if it may be cached."""
+	if (page_keys := getattr(request, "surrogate_keys", None)) is not None:
+		page_keys.update(keys)
+
+
+def make_page_key(request: HttpRequest) -> str:
+	"""
+	Key the page by host, path and query, with the parameters sorted and
+	empty and tracking ones dropped.
+	"""
+	query = urlencode(
+		sorted(
+			(name, value)
+			for name, value in parse_qsl(request.META.get("QUERY_STRING", ""))
+			if not name.startswith(IGNORED_PARAMS)
+		)
+	)
+	digest = hashlib.md5(
+		f"{request.get_host()}{request.path}?{query}".encode(),
+		usedforsecurity=False,
+	).hexdigest()
+
+	return f"{settings.CACHE_MIDDLEWARE_KEY_PREFIX}:page:{digest}"
+
+
+def get_versions(
+	keys: Iterable[str], fresh_version: int | None = None
+) -> dict[str, int]:
+	"""
+	Return the version of every surrogate key, giving keys without one a
+	fresh version, the current time by default, so pages cached under an
+	evicted one are never served.
+	"""
+	cache = get_cache()
+	version_keys = {_version_key(key): key for key in keys}
+	versions = {
+		version_keys[version_key]: version
+		for version_key, version in cache.get_many(version_keys).items()
+	}
+
+	if missing := set(version_keys.values()) - set(versions):
+		fresh = dict.fromkeys(missing, fresh_version or time.time_ns())
+		cache.set_many(
+			{_version_key(key): v for key, v in fresh.items()},
+			VERSION_TIMEOUT,
+		)
+		versions.update(fresh)
+
+	return versions
+
+
+def get_page(request: HttpRequest) -> HttpResponse | None:
+	cache = get_cache()
+	page = cache.get(make_page_key(request))
+	if page is None:
+		return None
+
+	content, headers, versions = page
+	if get_versions(versions) != versions:
+		return None
+
+	response = HttpResponse(content)
+	for name, value in headers:
+		response.headers[name] = value
+	response.headers["X-Page-Cache"] = "hit"
+
+	return response
+
+
+def set_page(
+	request: HttpRequest, response: HttpResponse, timeout: int
+) -> None:
+	"""
+	Cache the page and add headers for the proxy to cache it too, unless
+	a key was purged since ``request.page_cache_started``: the page may
+	then have been rendered from rows changed since.
+	"""
+	keys = sorted(request.surrogate_keys)
+	started = request.page_cache_started
+	versions = get_versions(keys, started)
+	if any(version > started for version in versions.values()):
+		return
+
+	response.headers["Cache-Control"] = (
+		f"public, max-age=0, s-maxage={timeout}"
+	)
+	response.headers["Surrogate-Key"] = " ".join(keys)
+	# Hits never read the session, which adds this header otherwise.
+	patch_vary_headers(response, ["Cookie"])
+	get_cache().set(
+		make_page_key(request),
+		(response.content, list(response.headers.items()), versions),
+		timeout,
+	)
+	response.headers["X-Page-Cache"] = "miss"
+
+
+def purge(keys: Iterable[str], using: str = DEFAULT_DB_ALIAS) -> None:
+	"""
+	Drop the pages tagged with any of the keys, now and again once the
+	transaction commits, so that a page rendered meanwhile from the old
+	rows can't stay cached under the new versions.
+	"""
+	keys = set(keys)
+	if not keys:
+		return
+
+	_bump_versions(keys)
+	transaction.on_commit(lambda: _purge(keys), using=using)
+
+
+def _purge(keys: set[str]) -> None:
+	_bump_versions(keys)
+
+	if url := settings.PAGE_CACHE_PURGE_URL:
+		_start_purger()
+		_purges.put((url, keys))
+
+
+def _start_purger() -> None:
+	"""Start the purger thread, again in processes forked since."""
+	global _purger
+
+	with _purger_lock:
+		if _purger is None or not _purger.is_alive():
+			_purger = threading.Thread(
+				target=_send_purges, name="page-cache-purger", daemon=True
+			)
+			_purger.start()
+
+
+def _send_purges() -> None:
+	while True:
+		pending = [_purges.get()]
+		# Merge the purges queued while the last request was sent.
+		while True:
+			try:
+				pending.append(_purges.get_nowait())
+			except queue.Empty:
+				break
+
+		batches: dict[str, set[str]] = {}
+		for url, keys in pending:
+			batches.setdefault(url, set()).update(keys)
+		try:
+			for url, keys in batches.items():
+				_send_purge(url, keys)
+		finally:
+			for _ in pending:
+				_purges.task_done()
+
+
+def _send_purge(url: str, keys: set[str]) -> None:
+	request = urllib.request.Request(
+		url,
+		method="PURGE",
+		headers={"Surrogate-Key": " ".join(sorted(keys))},
+	)
+	try:
+		urllib.request.urlopen(request, timeout=PURGE_TIMEOUT).close()
+	except OSError:
+		logger.exception("Could not purge %s from %s.", keys, url)
+
+
+def _bump_versions(keys: set[str]) -> None:
+	version = time.time_ns()
+	get_cache().set_many(
+		{_version_key(key): version for key in keys}, VERSION_TIMEOUT
+	)
+
+
+def _version_key(key: str) -> str:
+	return f"{settings.CACHE_MIDDLEWARE_KEY_PREFIX}:surrogate-key:{key}"
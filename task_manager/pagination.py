@@ -0,0 +1,201 @@
+import operator
+from functools import reduce
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+
+CURSOR_SALT = "task_manager.pagination.cursor"
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class KeysetPage:
+	"""A page of results fetched by seeking past a cursor."""
+
+	def __init__(
+		self,
+		object_list: list,
+		paginator: "KeysetPaginator",
+		next_cursor: str | None = None,
+		previous_cursor: str | None = None,
+	) -> None:
+		self.object_list = object_list
+		self.paginator = paginator
+		self.next_cursor = next_cursor
+		self.previous_cursor = previous_cursor
+
+	def __len__(self) -> int:
+		return len(self.object_list)
+
+	def __iter__(self):
+		return iter(self.object_list)
+
+	def __getitem__(self, index):
+		return self.object_list[index]
+
+	def has_next(self) -> bool:
+		return self.next_cursor is not None
+
+	def has_previous(self) -> bool:
+		return self.previous_cursor is not None
+
+	def has_other_pages(self) -> bool:
+		return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+	"""
+	Paginates a queryset by seeking on its ordering key instead of using
+	OFFSET, so every page costs the same whatever its depth. The ordering
+	must end with a unique field (usually ``id``) to keep pages stable.
+	Cursors are signed tokens holding the boundary row's key values.
+	"""
+
+	def __init__(
+		self,
+		queryset: QuerySet,
+		per_page: int,
+		ordering: tuple[str, ...],
+	) -> None:
+		self.queryset = queryset
+		self.per_page = int(per_page)
+		self.ordering = tuple(ordering)
+		self.fields = tuple(key.lstrip("-") for key in self.ordering)
+
+	def seek(self, cursor: str | None = None) -> tuple[str, bool, QuerySet]:
+		"""
+		Return the cursor's direction, whether it pointed anywhere, and
+		the rows past it ordered away from the cursor. One row more than
+		a page is selected so callers can tell whether more remain.
+		"""
+		direction, values = self.decode_cursor(cursor)
+		queryset = self.queryset
+
+		if values is not None:
+			queryset = queryset.filter(
+				self._seek_filter(values, reverse=direction == PREVIOUS)
+			)
+
+		ordering = self.ordering
+		if direction == PREVIOUS:
+			ordering = tuple(self._flip(key) for key in ordering)
+
+		return (
+			direction,
+			values is not None,
+			queryset.order_by(*ordering)[:self.per_page + 1],
+		)
+
+	def page(self, cursor: str | None = None) -> KeysetPage:
+		"""Return the page after or before the given cursor."""
+		direction, has_cursor, queryset = self.seek(cursor)
+
+		return self._make_page(direction, has_cursor, list(queryset))
+
+	async def apage(self, cursor: str | None = None) -> KeysetPage:
+		direction, has_cursor, queryset = self.seek(cursor)
+
+		return self._make_page(
+			direction, has_cursor, [row async for row in queryset]
+		)
+
+	def _make_page(
+		self, direction: str, has_cursor: bool, rows: list
+	) -> KeysetPage:
+		has_more = len(rows) > self.per_page
+		rows = rows[:self.per_page]
+
+		if direction == PREVIOUS:
+			rows.reverse()
+			has_next, has_previous = True, has_more
+		else:
+			has_next, has_previous = has_more, has_cursor
+
+		return KeysetPage(
+			rows,
+			self,
+			next_cursor=(
+				self.encode_cursor(rows[-1], NEXT)
+				if rows and has_next else None
+			),
+			previous_cursor=(
+				self.encode_cursor(rows[0], PREVIOUS)
+				if rows and has_previous else None
+			),
+		)
+
+	def encode_cursor(self, row, direction: str) -> str:
+		"""Return a cursor pointing past the row, a model or a dict."""
+		if isinstance(row, dict):
+			values = [row[field] for field in self.fields]
+		else:
+			values = [getattr(row, field) for field in self.fields]
+
+		return signing.dumps(
+			{"d": direction, "v": [self._to_json(v) for v in values]},
+			salt=CURSOR_SALT,
+			compress=True,
+		)
+
+	def decode_cursor(self, cursor: str | None) -> tuple[str, list | None]:
+		"""
+		Return the direction and key values stored in the cursor. Missing,
+		tampered or stale cursors fall back to the first page.
+		"""
+		if not cursor:
+			return NEXT, None
+
+		try:
+			payload = signing.loads(cursor, salt=CURSOR_SALT)
+			direction, values = payload["d"], payload["v"]
+			if direction not in (NEXT, PREVIOUS):
+				raise ValueError(direction)
+			if len(values) != len(self.fields):
+				raise ValueError(values)
+			values = [
+				self._to_python(field, value)
+				for field, value in zip(self.fields, values)
+			]
+		except (
+			signing.BadSignature, KeyError, TypeError, ValueError,
+			ValidationError,
+		):
+			return NEXT, None
+
+		return direction, values
+
+	def _seek_filter(self, values: list, reverse: bool = False) -> Q:
+		"""
+		Build ``(a > x) OR (a = x AND b > y) OR ...`` for the ordering key,
+		flipping each comparison for descending fields.
+		"""
+		conditions = []
+		equal = Q()
+
+		for key, field, value in zip(self.ordering, self.fields, values):
+			descending = key.startswith("-") != reverse
+			lookup = "lt" if descending else "gt"
+			conditions.append(equal & Q(**{f"{field}__{lookup}": value}))
+			equal &= Q(**{field: value})
+
+		return reduce(operator.or_, conditions)
+
+	def _to_python(self, field: str, value):
+		try:
+			model_field = self.queryset.model._meta.get_field(field)
+		except FieldDoesNotExist:
+			return value
+
+		return model_field.to_python(value)
+
+	@staticmethod
+	def _to_json(value):
+		if hasattr(value, "isoformat"):
+			return value.isoformat()
+
+		return value
+
+	@staticmethod
+	def _flip(key: str) -> str:
+		return key[1:] if key.startswith("-") else f"-{key}"
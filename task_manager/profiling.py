@@ -0,0 +1,123 @@
+"""
+Live request profiling. A profiled request runs under cProfile while a
+thread samples its stack every few milliseconds, and both results are
+written to a directory per URL name that keeps only the newest files:
+pstats for call counts and cumulative times, collapsed stacks, one
+``frame;frame;frame count`` line per stack, for flame graphs.
+"""
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from types import FrameType
+
+COLLAPSED = ".collapsed"
+PSTATS = ".pstats"
+
+
+def collapse(frame: FrameType | None) -> str:
+	"""Return the stack ending at the frame, outermost frame first."""
+	frames = []
+	while frame is not None:
+		code = frame.f_code
+		module = frame.f_globals.get("__name__", code.co_filename)
+		frames.append(f"{module}:{code.co_qualname}")
+		frame = frame.f_back
+
+	return ";".join(reversed(frames))
+
+
+class StackSampler(threading.Thread):
+	"""Counts the stacks a thread is seen in, sampled every interval."""
+
+	def __init__(self, thread_id: int, interval: float) -> None:
+		super().__init__(name="stack-sampler", daemon=True)
+		self.thread_id = thread_id
+		self.interval = interval
+		self.stacks: Counter[str] = Counter()
+		self.stopped = threading.Event()
+
+	def run(self) -> None:
+		while not self.stopped.wait(self.interval):
+			frame = sys._current_frames().get(self.thread_id)
+			if frame is not None:
+				self.stacks[collapse(frame)] += 1
+
+	def stop(self) -> None:
+		self.stopped.set()
+		self.join()
+
+
+class RequestProfiler:
+	"""Profiles the calling thread while entered."""
+
+	def __init__(self, interval: float) -> None:
+		self.profile = cProfile.Profile()
+		self.sampler = StackSampler(threading.get_ident(), interval)
+
+	def __enter__(self) -> "RequestProfiler":
+		self.sampler.start()
+		self.profile.enable()
+
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.profile.disable()
+		self.sampler.stop()
+
+	def save(self, directory: Path, name: str, max_files: int) -> Path:
+		"""
+		Write the profile under the URL name, drop the oldest profiles
+		past ``max_files`` and return the path without its suffix.
+		"""
+		directory = Path(directory) / get_directory_name(name)
+		directory.mkdir(parents=True, exist_ok=True)
+		path = directory / f"{time.time_ns()}-{threading.get_ident()}"
+
+		self.profile.dump_stats(path.with_suffix(PSTATS))
+		path.with_suffix(COLLAPSED).write_text(
+			"".join(
+				f"{stack} {count}\n"
+				for stack, count in self.sampler.stacks.most_common()
+			)
+		)
+		rotate(directory, max_files)
+
+		return path
+
+
+def get_directory_name(name: str) -> str:
+	"""URL names contain colons, which some file systems reject."""
+	return name.replace(":", ".")
+
+
+def rotate(
+	directory: Path,
+	max_files: int,
+	suffixes: tuple[str, ...] = (PSTATS, COLLAPSED),
+) -> None:
+	"""
+	Keep the newest ``max_files`` profiles of the directory, a profile
+	being the files named alike with the given suffixes.
+	"""
+	profiles = sorted(directory.glob(f"*{suffixes[0]}"))
+
+	for path in profiles[:max(0, len(profiles) - max_files)]:
+		for suffix in suffixes:
+			path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def merge_collapsed(paths: Iterable[Path]) -> Counter[str]:
+	"""Add up the sample counts of collapsed stack files."""
+	stacks: Counter[str] = Counter()
+
+	for path in paths:
+		for line in path.read_text().splitlines():
+			stack, _, count = line.rpartition(" ")
+			if stack and count.isdigit():
+				stacks[stack] += int(count)
+
+	return stacks
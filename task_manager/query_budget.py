@@ -0,0 +1,139 @@
+"""
+Query budgets and repeated query detection. Views declare how many
+queries a request may run with a ``query_budget`` attribute, an int or a
+dict by method, counting the session and user reads of a request with
+cold caches. NPlusOneMiddleware enforces it, and ``QueryShapeRecorder``
+spots the same SQL running over and over in one request, the usual sign
+of a lazy relation read in a loop.
+"""
+import re
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable
+from contextlib import ExitStack
+from types import FrameType
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.base import Node
+
+# Parameter lists of IN lookups vary with the number of values.
+IN_PARAMS_RE = re.compile(r"\(%s(?:, %s)+\)")
+
+
+class QueryBudgetExceeded(Exception):
+	"""Raised by NPlusOneMiddleware for requests over budget in tests."""
+
+
+def query_budget(budget: int | dict[str, int]) -> Callable:
+	"""Declare the query budget of a function view."""
+	def decorator(view: Callable) -> Callable:
+		view.query_budget = budget
+
+		return view
+
+	return decorator
+
+
+def get_query_budget(view: Callable, method: str = "GET") -> int | None:
+	"""
+	Return the budget of a view function or of an ``as_view()`` view for
+	requests with the method.
+	"""
+	budget = getattr(
+		getattr(view, "view_class", view), "query_budget", None
+	)
+	if isinstance(budget, dict):
+		return budget.get(method)
+
+	return budget
+
+
+def get_query_shape(sql: str) -> str:
+	return IN_PARAMS_RE.sub("(%s, ...)", sql)
+
+
+def find_trigger(frame: FrameType | None) -> str:
+	"""
+	Return the template and line of the innermost template node in the
+	stack, or else the innermost frame of the project's own code.
+	"""
+	project_dir = str(settings.BASE_DIR)
+	fallback = None
+
+	while frame is not None:
+		node = frame.f_locals.get("self")
+		if isinstance(node, Node) and getattr(node, "token", None):
+			return f"{node.origin.name}:{node.token.lineno}"
+
+		filename = frame.f_code.co_filename
+		if (
+			fallback is None
+			and filename.startswith(project_dir)
+			and "site-packages" not in filename
+			and filename != __file__
+		):
+			fallback = f"{filename}:{frame.f_lineno}"
+		frame = frame.f_back
+
+	return fallback or "unknown"
+
+
+class QueryShapeRecorder:
+	"""
+	Database execute wrapper counting queries per SQL shape, on every
+	connection while entered. Only queries of the entering thread count,
+	as connections may be shared, like the live server's in-memory SQLite
+	database. The stack is only inspected when a shape reaches the
+	threshold, so the wrapper is cheap for requests that run each query
+	once.
+	"""
+
+	def __init__(self, threshold: int) -> None:
+		self.threshold = threshold
+		self.count = 0
+		self.shapes: Counter[str] = Counter()
+		self.triggers: dict[str, str] = {}
+		self.stack = ExitStack()
+		self.thread: int | None = None
+
+	def __enter__(self) -> "QueryShapeRecorder":
+		self.thread = threading.get_ident()
+		for connection in connections.all():
+			self.stack.enter_context(connection.execute_wrapper(self))
+
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.stack.close()
+
+	async def __aenter__(self) -> "QueryShapeRecorder":
+		"""
+		Enter in the thread that runs the request's sync code, where the
+		async ORM's queries run too.
+		"""
+		return await sync_to_async(self.__enter__)()
+
+	async def __aexit__(self, *exc_info) -> None:
+		await sync_to_async(self.__exit__)(*exc_info)
+
+	def __call__(self, execute, sql, params, many, context):
+		if self.thread not in (None, threading.get_ident()):
+			return execute(sql, params, many, context)
+
+		shape = get_query_shape(sql)
+		self.count += 1
+		self.shapes[shape] += 1
+		if self.shapes[shape] == self.threshold:
+			self.triggers[shape] = find_trigger(sys._getframe(1))
+
+		return execute(sql, params, many, context)
+
+	def get_repeated(self) -> list[tuple[str, int, str]]:
+		"""Return the repeated shapes with their counts and triggers."""
+		return [
+			(shape, self.shapes[shape], trigger)
+			for shape, trigger in self.triggers.items()
+		]
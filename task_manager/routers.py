@@ -0,0 +1,66 @@
+"""
+Read replica routing. Reads go to a random alias of
+``DATABASE_REPLICAS`` and writes to the primary, the default database.
+Reads go to the primary too inside ``use_primary()``, which the
+ReplicaStickinessMiddleware enters for the requests of users who have
+just written, and inside transactions on the primary.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+
+@contextmanager
+def use_primary():
+	"""Send the reads made within to the primary."""
+	token = _use_primary.set(True)
+	try:
+		yield
+	finally:
+		_use_primary.reset(token)
+
+
+class ReplicaRouter:
+	def db_for_read(self, model, **hints) -> str | None:
+		replicas = settings.DATABASE_REPLICAS
+		if not replicas or not self.is_routed(hints):
+			return None
+		if (
+			_use_primary.get()
+			or connections[DEFAULT_DB_ALIAS].in_atomic_block
+		):
+			return DEFAULT_DB_ALIAS
+
+		return random.choice(replicas)
+
+	def db_for_write(self, model, **hints) -> str | None:
+		return DEFAULT_DB_ALIAS if self.is_routed(hints) else None
+
+	def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+		databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+		if obj1._state.db in databases and obj2._state.db in databases:
+			return True
+
+		return None
+
+	def allow_migrate(self, db, app_label, **hints) -> bool | None:
+		return False if db in settings.DATABASE_REPLICAS else None
+
+	@staticmethod
+	def is_routed(hints: dict) -> bool:
+		"""
+		Objects of other databases, such as the benchmark one, stay where
+		they are.
+		"""
+		instance = hints.get("instance")
+		if instance is None or instance._state.db is None:
+			return True
+
+		return instance._state.db in (
+			DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS
+		)
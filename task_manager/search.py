@@ -0,0 +1,263 @@
+from functools import reduce
+import operator
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import (
+	F,
+	FloatField,
+	Func,
+	Lookup,
+	Model,
+	Q,
+	QuerySet,
+	TextField,
+	Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+POSTGRES_SEARCH_CONFIG = "english"
+SQLITE_TRIGRAM_LENGTH = 3
+
+
+class SearchDocumentField(TextField):
+	"""
+	The hidden column of an SQLite FTS5 table, named after the table,
+	which ``MATCH`` and the ranking functions such as ``bm25()`` take.
+	"""
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+	lookup_name = "match"
+
+	def as_sql(self, compiler, connection) -> tuple[str, list]:
+		lhs, lhs_params = self.process_lhs(compiler, connection)
+		rhs, rhs_params = self.process_rhs(compiler, connection)
+
+		return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class SearchBackend:
+	"""
+	Filters a queryset by a free-text query. Backends that rank results
+	annotate ``search_rank`` and list it in ``rank_ordering``.
+	"""
+
+	rank_ordering: tuple[str, ...] = ()
+
+	def search(self, queryset: QuerySet, query: str) -> QuerySet:
+		raise NotImplementedError
+
+
+class ContainsSearchBackend(SearchBackend):
+	"""Matches the query as a substring of any of the given fields."""
+
+	def __init__(self, *fields: str) -> None:
+		self.fields = fields
+
+	def search(self, queryset: QuerySet, query: str) -> QuerySet:
+		return queryset.filter(_contains_any(self.fields, query))
+
+
+class TaskFullTextSearchBackend(SearchBackend):
+	"""
+	Searches task names and descriptions with the database's full-text
+	engine, ranking name matches above description matches. PostgreSQL
+	uses the generated ``search_vector`` column and its GIN index, SQLite
+	uses the FTS5 table kept in sync by ``task_manager.signals``.
+	"""
+
+	rank_ordering = ("-search_rank",)
+
+	def search(self, queryset: QuerySet, query: str) -> QuerySet:
+		vendor = connections[queryset.db].vendor
+
+		if vendor == "postgresql":
+			return self._search_postgresql(queryset, query)
+		if vendor == "sqlite":
+			return _search_sqlite_index(
+				queryset, to_fts5_query(query), weights=(10.0, 1.0)
+			)
+
+		return ContainsSearchBackend("name", "description").search(
+			queryset, query
+		).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+	@staticmethod
+	def _search_postgresql(queryset: QuerySet, query: str) -> QuerySet:
+		from django.contrib.postgres.search import (
+			SearchQuery,
+			SearchRank,
+			SearchVectorField,
+		)
+
+		table = connections[queryset.db].ops.quote_name(
+			queryset.model._meta.db_table
+		)
+		vector = RawSQL(
+			f'{table}."search_vector"', [], output_field=SearchVectorField()
+		)
+		search_query = SearchQuery(
+			query, config=POSTGRES_SEARCH_CONFIG, search_type="websearch"
+		)
+
+		return queryset.annotate(
+			search_vector=vector,
+			search_rank=SearchRank(vector, search_query),
+		).filter(search_vector=search_query)
+
+
+class WorkerTrigramSearchBackend(SearchBackend):
+	"""
+	Matches every word of the query as a substring of the worker's
+	username, first or last name, ranked by trigram similarity.
+	PostgreSQL answers the substring filter from the ``pg_trgm`` GIN
+	indexes, SQLite from an FTS5 table with the trigram tokenizer.
+	"""
+
+	fields = ("username", "first_name", "last_name")
+	rank_ordering = ("-search_rank",)
+
+	def search(self, queryset: QuerySet, query: str) -> QuerySet:
+		vendor = connections[queryset.db].vendor
+		words = query.split()
+
+		if vendor == "postgresql":
+			return self._search_postgresql(queryset, query, words)
+		if vendor == "sqlite" and all(
+			len(word) >= SQLITE_TRIGRAM_LENGTH for word in words
+		):
+			return _search_sqlite_index(
+				queryset, to_fts5_query(query, prefix=False)
+			)
+
+		return queryset.filter(
+			*(_contains_any(self.fields, word) for word in words)
+		).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+	def _search_postgresql(
+		self, queryset: QuerySet, query: str, words: list[str]
+	) -> QuerySet:
+		from django.contrib.postgres.search import TrigramWordSimilarity
+
+		return queryset.filter(
+			*(_contains_any(self.fields, word) for word in words)
+		).annotate(
+			search_rank=Greatest(
+				*(TrigramWordSimilarity(query, field) for field in self.fields)
+			)
+		)
+
+
+def get_task_search_backend() -> SearchBackend:
+	"""Return the backend configured by ``TASK_SEARCH_BACKEND``."""
+	return import_string(settings.TASK_SEARCH_BACKEND)()
+
+
+def to_fts5_query(query: str, prefix: bool = True) -> str:
+	"""
+	Quote every word of the user query as an FTS5 phrase, so that operators
+	and punctuation typed by users can't break the MATCH syntax.
+	"""
+	words = query.replace('"', " ").split()
+	suffix = "*" if prefix else ""
+
+	return " ".join(f'"{word}"{suffix}' for word in words) or '""'
+
+
+def get_sqlite_index(model: type[Model]) -> tuple[str, tuple[str, ...]]:
+	"""Return the FTS5 table and indexed fields of the model."""
+	from task_manager.models import Task, Worker
+
+	return {
+		Task: ("task_manager_task_fts", ("name", "description")),
+		Worker: (
+			"task_manager_worker_trgm",
+			("username", "first_name", "last_name"),
+		),
+	}[model]
+
+
+def update_sqlite_index(instance: Model, using: str) -> None:
+	"""Replace the instance's row in its FTS5 table."""
+	table, fields = get_sqlite_index(type(instance))
+
+	with connections[using].cursor() as cursor:
+		cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [instance.pk])
+		cursor.execute(
+			f"INSERT INTO {table} (rowid, {', '.join(fields)}) "
+			f"VALUES (%s, {', '.join(['%s'] * len(fields))})",
+			[instance.pk, *(getattr(instance, field) for field in fields)],
+		)
+
+
+def delete_from_sqlite_index(instance: Model, using: str) -> None:
+	table, _ = get_sqlite_index(type(instance))
+
+	with connections[using].cursor() as cursor:
+		cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [instance.pk])
+
+
+def index_sqlite_rows(
+	model: type[Model], pks: list[int], using: str = "default"
+) -> None:
+	"""Add freshly inserted rows to the model's FTS5 table in one INSERT."""
+	if not pks or connections[using].vendor != "sqlite":
+		return
+
+	table, fields = get_sqlite_index(model)
+	columns = ", ".join(fields)
+
+	with connections[using].cursor() as cursor:
+		cursor.execute(
+			f"INSERT INTO {table} (rowid, {columns}) "
+			f"SELECT id, {columns} FROM {model._meta.db_table} "
+			f"WHERE id IN ({', '.join(['%s'] * len(pks))})",
+			pks,
+		)
+
+
+def rebuild_sqlite_index(model: type[Model], using: str = "default") -> None:
+	"""
+	Repopulate the model's FTS5 table, for rows written by paths that skip
+	signals such as ``bulk_create``.
+	"""
+	if connections[using].vendor != "sqlite":
+		return
+
+	table, fields = get_sqlite_index(model)
+	columns = ", ".join(fields)
+
+	with connections[using].cursor() as cursor:
+		cursor.execute(f"DELETE FROM {table}")
+		cursor.execute(
+			f"INSERT INTO {table} (rowid, {columns}) "
+			f"SELECT id, {columns} FROM {model._meta.db_table}"
+		)
+
+
+def _contains_any(fields: tuple[str, ...], value: str) -> Q:
+	return reduce(
+		operator.or_, (Q(**{f"{field}__icontains": value}) for field in fields)
+	)
+
+
+def _search_sqlite_index(
+	queryset: QuerySet, match: str, weights: tuple[float, ...] = ()
+) -> QuerySet:
+	# Joining the FTS5 table through the model's ``sqlite_index`` runs
+	# the MATCH once; ranking in a correlated subquery would re-run it for
+	# every matching row.
+	return queryset.filter(sqlite_index__document__match=match).annotate(
+		# bm25() is lower for better matches; negate it so every backend
+		# sorts by descending rank.
+		search_rank=-Func(
+			F("sqlite_index__document"),
+			*(Value(weight) for weight in weights),
+			function="bm25",
+			output_field=FloatField(),
+		)
+	)
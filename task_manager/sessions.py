@@ -0,0 +1,24 @@
+"""
+The ``cached_db`` session store, deleting sessions with a single DELETE
+instead of loading the row first, so that ending a stale session, as
+after a password change, fits the query budget of the page.
+"""
+from django.contrib.sessions.backends import cached_db
+
+
+class SessionStore(cached_db.SessionStore):
+	def delete(self, session_key=None):
+		if session_key is None:
+			if self.session_key is None:
+				return
+			session_key = self.session_key
+		self.model.objects.filter(session_key=session_key).delete()
+		self._cache.delete(self.cache_key_prefix + session_key)
+
+	async def adelete(self, session_key=None):
+		if session_key is None:
+			if self.session_key is None:
+				return
+			session_key = self.session_key
+		await self.model.objects.filter(session_key=session_key).adelete()
+		await self._cache.adelete(self.cache_key_prefix + session_key)
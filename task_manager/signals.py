@@ -0,0 +1,294 @@
+from django.db import connections
+from django.db.models import F
+from django.db.models.signals import (
+	m2m_changed,
+	post_delete,
+	post_save,
+	pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager import counters, fragment_cache, page_cache, search
+from task_manager.backends import invalidate_positions, invalidate_user
+from task_manager.models import Counter, Position, Task, TaskType, Worker
+
+# Changes to these fields can move a row to another list page, or out of
+# search results, or change the dashboard counters.
+TASK_LIST_FIELDS = {"name", "description", "priority", "deadline"}
+WORKER_LIST_FIELDS = {"username", "first_name", "last_name"}
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+def update_search_index(
+	sender, instance, using: str, update_fields=None, **kwargs
+) -> None:
+	if connections[using].vendor != "sqlite":
+		return
+
+	_, fields = search.get_sqlite_index(sender)
+	# Logins save only last_login; skip saves not touching indexed fields.
+	if update_fields is None or set(update_fields) & set(fields):
+		search.update_sqlite_index(instance, using)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+def delete_from_search_index(sender, instance, using: str, **kwargs) -> None:
+	if connections[using].vendor == "sqlite":
+		search.delete_from_sqlite_index(instance, using)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(
+	sender,
+	instance: Task,
+	created: bool,
+	using: str,
+	update_fields=None,
+	**kwargs,
+) -> None:
+	is_active = not instance.is_completed
+	# Saves snapshot the new values only after post_save is sent.
+	was_completed = instance.get_loaded_value("is_completed")
+
+	if created:
+		counters.increment(
+			{Counter.TOTAL_TASKS: 1, Counter.ACTIVE_TASKS: int(is_active)},
+			using,
+		)
+	elif update_fields is not None and "is_completed" not in update_fields:
+		return
+	elif was_completed not in (None, instance.is_completed):
+		counters.increment(
+			{Counter.ACTIVE_TASKS: 1 if is_active else -1}, using
+		)
+		counters.shift_worker_task_counts(
+			Worker.objects.using(using).filter(tasks=instance),
+			instance.is_completed,
+		)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance: Task, using: str, **kwargs) -> None:
+	counters.increment(
+		{
+			Counter.TOTAL_TASKS: -1,
+			Counter.ACTIVE_TASKS: -int(not instance.is_completed),
+		},
+		using,
+	)
+
+
+@receiver(post_save, sender=Worker)
+def count_saved_worker(sender, created: bool, using: str, **kwargs) -> None:
+	if created:
+		counters.increment({Counter.TOTAL_USERS: 1}, using)
+
+
+@receiver(post_delete, sender=Worker)
+def count_deleted_worker(sender, using: str, **kwargs) -> None:
+	counters.increment({Counter.TOTAL_USERS: -1}, using)
+
+
+@receiver(pre_delete, sender=Task)
+def uncount_deleted_task_assignees(
+	sender, instance: Task, using: str, **kwargs
+) -> None:
+	# The assignment rows are gone by post_delete, so count them down now.
+	if instance.is_completed:
+		field = "resolved_task_count"
+	else:
+		field = "active_task_count"
+
+	Worker.objects.using(using).filter(tasks=instance).update(
+		**{field: F(field) - 1}, updated_at=timezone.now()
+	)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def count_assigned_tasks(
+	sender, instance, action: str, reverse: bool, pk_set, using: str, **kwargs
+) -> None:
+	if reverse:
+		worker_ids = {instance.pk}
+	elif action == "pre_clear":
+		instance._cleared_assignee_ids = set(
+			sender.objects.using(using).filter(
+				task_id=instance.pk
+			).values_list("worker_id", flat=True)
+		)
+		return
+	elif action == "post_clear":
+		worker_ids = instance.__dict__.pop("_cleared_assignee_ids", set())
+	else:
+		worker_ids = pk_set
+
+	if action in ("post_add", "post_remove", "post_clear") and worker_ids:
+		counters.refresh_worker_task_counts(
+			Worker.objects.using(using).filter(pk__in=worker_ids)
+		)
+
+
+@receiver(post_save, sender=Task)
+def invalidate_saved_task_fragments(sender, instance: Task, **kwargs) -> None:
+	fragment_cache.bump_versions([instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def touch_assigned_tasks(
+	sender, instance, action: str, reverse: bool, pk_set, using: str, **kwargs
+) -> None:
+	if not reverse:
+		if instance.__dict__.get("_saving_assignees"):
+			# TaskForm saves the task next, which updates it anyway.
+			return
+		task_ids = {instance.pk}
+	elif action == "pre_clear":
+		instance._cleared_task_ids = set(
+			sender.objects.using(using).filter(
+				worker_id=instance.pk
+			).values_list("task_id", flat=True)
+		)
+		return
+	elif action == "post_clear":
+		task_ids = instance.__dict__.pop("_cleared_task_ids", set())
+	else:
+		task_ids = pk_set
+
+	if action in ("post_add", "post_remove", "post_clear") and task_ids:
+		Task.objects.using(using).filter(pk__in=task_ids).update(
+			updated_at=timezone.now()
+		)
+		fragment_cache.bump_versions(task_ids)
+
+
+@receiver(pre_delete, sender=Worker)
+def touch_deleted_worker_tasks(
+	sender, instance: Worker, using: str, **kwargs
+) -> None:
+	# Assignments are deleted without m2m_changed, so touch the tasks now.
+	Task.objects.using(using).filter(assignees=instance).update(
+		updated_at=timezone.now()
+	)
+
+
+@receiver(post_save, sender=TaskType)
+@receiver(pre_delete, sender=TaskType)
+def touch_task_type_tasks(
+	sender, instance: TaskType, using: str, created: bool = False, **kwargs
+) -> None:
+	# Tasks show their type's name, which renames and deletes change.
+	if not created:
+		Task.objects.using(using).filter(task_type=instance).update(
+			updated_at=timezone.now()
+		)
+
+
+@receiver(post_save, sender=Position)
+@receiver(pre_delete, sender=Position)
+def touch_position_workers(
+	sender, instance: Position, using: str, created: bool = False, **kwargs
+) -> None:
+	if not created:
+		Worker.objects.using(using).filter(position=instance).update(
+			updated_at=timezone.now()
+		)
+
+
+@receiver(post_save, sender=Task)
+def purge_saved_task_pages(
+	sender,
+	instance: Task,
+	created: bool,
+	using: str,
+	update_fields=None,
+	**kwargs,
+) -> None:
+	keys = {page_cache.task_key(instance.pk)}
+	fields = set(TASK_LIST_FIELDS if update_fields is None else update_fields)
+	if created or fields & TASK_LIST_FIELDS:
+		keys.add(page_cache.TASK_LIST)
+	if "is_completed" in fields:
+		# Workers' task counts change along with the task.
+		keys.update((page_cache.TASK_LIST, page_cache.WORKER_LIST))
+
+	page_cache.purge(keys, using)
+
+
+@receiver(post_delete, sender=Task)
+def purge_deleted_task_pages(
+	sender, instance: Task, using: str, **kwargs
+) -> None:
+	page_cache.purge(
+		{
+			page_cache.task_key(instance.pk),
+			page_cache.TASK_LIST,
+			page_cache.WORKER_LIST,
+		},
+		using,
+	)
+
+
+@receiver(post_save, sender=Worker)
+def purge_saved_worker_pages(
+	sender,
+	instance: Worker,
+	created: bool,
+	using: str,
+	update_fields=None,
+	**kwargs,
+) -> None:
+	if update_fields is not None and set(update_fields) <= {"last_login"}:
+		return
+
+	keys = {page_cache.worker_key(instance.pk)}
+	if created or update_fields is None or (
+		set(update_fields) & WORKER_LIST_FIELDS
+	):
+		keys.add(page_cache.WORKER_LIST)
+
+	page_cache.purge(keys, using)
+
+
+@receiver(post_delete, sender=Worker)
+def purge_deleted_worker_pages(
+	sender, instance: Worker, using: str, **kwargs
+) -> None:
+	page_cache.purge(
+		{page_cache.worker_key(instance.pk), page_cache.WORKER_LIST}, using
+	)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def purge_assigned_task_pages(
+	sender, action: str, using: str, **kwargs
+) -> None:
+	# Assignments change task counts, which order the worker list.
+	if action in ("post_add", "post_remove", "post_clear"):
+		page_cache.purge({page_cache.WORKER_LIST}, using)
+
+
+@receiver(post_save, sender=TaskType)
+@receiver(post_delete, sender=TaskType)
+def purge_task_type_pages(sender, using: str, **kwargs) -> None:
+	page_cache.purge({page_cache.TASK_LIST}, using)
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def purge_position_pages(sender, using: str, **kwargs) -> None:
+	page_cache.purge({page_cache.WORKER_LIST}, using)
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def invalidate_cached_user(sender, instance: Worker, **kwargs) -> None:
+	invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def invalidate_cached_user_positions(sender, **kwargs) -> None:
+	invalidate_positions()
@@ -0,0 +1,69 @@
+from django import template
+
+from task_manager import fragment_cache
+
+register = template.Library()
+
+
+class TaskFragmentNode(template.Node):
+	def __init__(self, nodelist, name, task, vary_on):
+		self.nodelist = nodelist
+		self.name = name
+		self.task = task
+		self.vary_on = vary_on
+
+	def render(self, context) -> str:
+		task = self.task.resolve(context)
+		key = fragment_cache.make_fragment_key(
+			self.name.resolve(context),
+			task,
+			*fragment_cache.get_vary_on(
+				*(value.resolve(context) for value in self.vary_on)
+			),
+		)
+		cache = fragment_cache.get_cache()
+		# Fragments fetched in bulk by fragment_cache.load_fragments().
+		fetched = task.__dict__.get("_fragments", {})
+		content = fetched[key] if key in fetched else cache.get(key)
+
+		if content is not None:
+			fragment_cache.record(hit=True)
+			return content
+
+		fragment_cache.record(hit=False)
+		content = self.nodelist.render(context)
+		cache.set(key, content, fragment_cache.FRAGMENT_TIMEOUT)
+
+		return content
+
+
+@register.tag("taskfragment")
+def do_task_fragment(parser, token):
+	"""
+	Cache the enclosed template fragment of a task until the task changes
+	or the day ends.
+
+	Usage::
+
+		{% taskfragment "row" task [vary_on ...] %}
+			...
+		{% endtaskfragment %}
+
+	The fragment must not depend on the current user; pass anything else
+	it depends on besides the task as extra ``vary_on`` arguments.
+	"""
+	nodelist = parser.parse(("endtaskfragment",))
+	parser.delete_first_token()
+	bits = token.split_contents()
+
+	if len(bits) < 3:
+		raise template.TemplateSyntaxError(
+			f"'{bits[0]}' tag requires at least 2 arguments."
+		)
+
+	return TaskFragmentNode(
+		nodelist,
+		parser.compile_filter(bits[1]),
+		parser.compile_filter(bits[2]),
+		[parser.compile_filter(bit) for bit in bits[3:]],
+	)
@@ -33,6 +33,17 @@ class PositionTestCase(TestCase):
 		with self.assertRaises(ValidationError):
 			test_position.save()
 
+	def test_update_skips_unchanged_unique_check(self) -> None:
+		position = Position.objects.get(pk=self.position.pk)
+		position.name = "Lead"
+
+		# The unique check, the update and touching the position's workers.
+		with self.assertNumQueries(3):
+			position.save()
+
+		with self.assertNumQueries(0):
+			position.save()
+
 	def test_ascending_ordering(self) -> None:
 		create_position("Manager")
 		create_position("Analyst")
@@ -60,6 +60,65 @@ class TaskModelTest(TestCase):
 			context, Task.DEADLINE_ERROR_MESSAGE
 		)
 
+	def test_unchanged_past_deadline_passes_validation_on_update(
+		self
+	) -> None:
+		Task.objects.filter(pk=self.task.pk).update(
+			deadline=get_past_deadline()
+		)
+		task = Task.objects.get(pk=self.task.pk)
+		task.priority = 2
+		task.save()
+
+		self.assertEqual(Task.objects.get(pk=task.pk).priority, 2)
+
+	def test_update_issues_a_single_query(self) -> None:
+		task = Task.objects.get(pk=self.task.pk)
+		task.priority = 4
+
+		with self.assertNumQueries(1) as context:
+			task.save()
+
+		update = context.captured_queries[0]["sql"]
+		self.assertTrue(update.startswith("UPDATE"))
+		self.assertIn('"priority" = 4 WHERE', update)
+		self.assertIn('SET "updated_at" = ', update)
+
+	def test_save_without_changes_issues_no_query(self) -> None:
+		task = Task.objects.get(pk=self.task.pk)
+
+		with self.assertNumQueries(0):
+			task.save()
+
+	def test_dirty_fields(self) -> None:
+		task = Task.objects.get(pk=self.task.pk)
+		task.name = "renamed"
+		task.task_type = None
+
+		self.assertEqual(task.get_dirty_fields(), {"name", "task_type"})
+
+		task.refresh_from_db()
+
+		self.assertEqual(task.get_dirty_fields(), set())
+
+	def test_validated_fields_are_not_validated_again(self) -> None:
+		task = Task.objects.get(pk=self.task.pk)
+		task.task_type = create_task_type(name="Feature")
+		task.mark_validated(["task_type"])
+
+		# The UPDATE only, without checking that the task type exists.
+		with self.assertNumQueries(1):
+			task.save()
+
+	def test_fields_changed_after_validation_are_validated(self) -> None:
+		test_task = create_task()
+		test_task.name = "renamed"
+		test_task.mark_validated(["name"])
+		test_task.name = self.task.name
+
+		with self.assertRaises(ValidationError):
+			test_task.save()
+
 	def test_is_completed_field_set_false_by_default(self) -> None:
 		task = Task.objects.create(
 			name="test-name",
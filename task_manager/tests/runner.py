@@ -0,0 +1,18 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+	"""
+	Runs the tests with ``TESTING`` set, however the runner was started,
+	so that requests over their query budget fail instead of logging.
+	"""
+
+	def setup_test_environment(self, **kwargs) -> None:
+		super().setup_test_environment(**kwargs)
+		self.testing = override_settings(TESTING=True)
+		self.testing.enable()
+
+	def teardown_test_environment(self, **kwargs) -> None:
+		self.testing.disable()
+		super().teardown_test_environment(**kwargs)
@@ -0,0 +1,168 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve, reverse
+
+from task_manager import async_views, metrics
+from task_manager.query_budget import get_query_budget
+from task_manager.tests.utils import (
+	create_position,
+	create_task,
+	create_worker,
+)
+
+urlpatterns = [
+	path("", include("task_manager.async_urls", namespace="task_manager")),
+	path("accounts/", include("django.contrib.auth.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewsTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.position = create_position()
+		cls.workers = [
+			create_worker(username=f"worker{i}", position=cls.position)
+			for i in range(3)
+		]
+		cls.worker = cls.workers[0]
+		cls.tasks = [create_task(name=f"task{i}") for i in range(12)]
+		for task in cls.tasks:
+			task.assignees.add(*cls.workers)
+
+	def setUp(self) -> None:
+		cache.clear()
+
+	def get_urls(self) -> list[str]:
+		return [
+			reverse("task_manager:index"),
+			reverse("task_manager:worker_list"),
+			reverse("task_manager:worker_detail", args=[self.worker.pk]),
+			reverse("task_manager:task_list"),
+			reverse("task_manager:task_detail", args=[self.tasks[0].pk]),
+		]
+
+	def get(self, url: str):
+		"""Request from sync code, where the async ORM's queries run."""
+		return async_to_sync(self.async_client.get)(url)
+
+	def test_pages_are_served_by_async_views(self) -> None:
+		for url in self.get_urls():
+			with self.subTest(url):
+				view = getattr(resolve(url).func, "view_class", None)
+
+				self.assertIn(
+					view or resolve(url).func, vars(async_views).values()
+				)
+
+	def test_pages_stay_within_budget(self) -> None:
+		self.async_client.force_login(self.worker)
+
+		for url in self.get_urls():
+			with (
+				self.subTest(url),
+				CaptureQueriesContext(connection) as context,
+			):
+				response = self.get(url)
+
+				self.assertEqual(response.status_code, 200)
+				self.assertLessEqual(
+					len(context),
+					get_query_budget(resolve(url).func),
+					"\n".join(query["sql"] for query in context),
+				)
+
+	async def test_list_pages_paginate(self) -> None:
+		await self.async_client.aforce_login(self.worker)
+		task_list = reverse("task_manager:task_list")
+
+		response = await self.async_client.get(task_list)
+
+		self.assertContains(response, "task0")
+		self.assertEqual(len(response.context["task_list"]), 10)
+		self.assertTrue(response.context["is_paginated"])
+		for task in response.context["task_list"]:
+			self.assertIsNotNone(task.task_type)
+
+		response = await self.async_client.get(
+			task_list, {"cursor": response.context["page_obj"].next_cursor}
+		)
+
+		self.assertEqual(len(response.context["task_list"]), 2)
+
+	async def test_numbered_pages(self) -> None:
+		await self.async_client.aforce_login(self.worker)
+
+		response = await self.async_client.get(
+			reverse("task_manager:task_list"), {"page": 2}
+		)
+
+		self.assertEqual(response.context["page_obj"].number, 2)
+		self.assertEqual(len(response.context["task_list"]), 2)
+
+	async def test_unchanged_pages_are_not_modified(self) -> None:
+		await self.async_client.aforce_login(self.worker)
+
+		for url in self.get_urls()[1:]:
+			with self.subTest(url):
+				etag = (await self.async_client.get(url))["ETag"]
+
+				response = await self.async_client.get(
+					url, headers={"if-none-match": etag}
+				)
+
+				self.assertEqual(response.status_code, 304)
+
+	async def test_anonymous_users_are_redirected_to_login(self) -> None:
+		for url in (self.get_urls()[2], self.get_urls()[4]):
+			with self.subTest(url):
+				response = await self.async_client.get(url)
+
+				self.assertEqual(response.status_code, 302)
+				self.assertIn(reverse("login"), response.url)
+
+	def test_anonymous_pages_are_cached(self) -> None:
+		for url in (self.get_urls()[0], self.get_urls()[1]):
+			with self.subTest(url):
+				self.get(url)
+
+				with CaptureQueriesContext(connection) as context:
+					response = self.get(url)
+
+				self.assertEqual(response["X-Page-Cache"], "hit")
+				self.assertEqual(len(context), 0)
+
+	async def test_missing_objects_are_not_found(self) -> None:
+		await self.async_client.aforce_login(self.worker)
+
+		for name in ("worker_detail", "task_detail"):
+			with self.subTest(name):
+				response = await self.async_client.get(
+					reverse(f"task_manager:{name}", args=[0])
+				)
+
+				self.assertEqual(response.status_code, 404)
+
+	def test_async_requests_are_measured(self) -> None:
+		metrics.store.reset()
+		self.async_client.force_login(self.worker)
+		url = reverse("task_manager:task_list")
+
+		with CaptureQueriesContext(connection) as context:
+			response = self.get(url)
+
+		samples = metrics.store.collect()
+		labels = ("task_manager:task_list", "GET")
+		self.assertEqual(
+			samples[("request_db_queries", *labels)][1], len(context)
+		)
+		self.assertGreater(
+			samples[("request_template_seconds", *labels)][1], 0
+		)
+		self.assertEqual(
+			samples[("response_size_bytes", *labels)][1],
+			len(response.content),
+		)
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.sessions import SessionStore
+from task_manager.tests.utils import create_position, create_worker
+
+INDEX_URL = reverse("task_manager:index")
+
+
+class CachedModelBackendTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.position = create_position(name="Developer")
+		cls.worker = create_worker(position=cls.position)
+
+	def setUp(self) -> None:
+		cache.clear()
+		self.client.force_login(self.worker)
+
+	def get_user(self):
+		return self.client.get(INDEX_URL).wsgi_request.user
+
+	def test_identifies_warm_users_without_queries(self) -> None:
+		self.client.get(INDEX_URL)
+
+		# The dashboard counters only.
+		with self.assertNumQueries(1):
+			user = self.get_user()
+			self.assertEqual(user.position.name, "Developer")
+
+	def test_worker_saves_invalidate_the_user(self) -> None:
+		self.get_user()
+		self.worker.first_name = "Renamed"
+		self.worker.save()
+
+		self.assertEqual(self.get_user().first_name, "Renamed")
+
+	def test_position_saves_invalidate_the_user(self) -> None:
+		self.get_user()
+		self.position.name = "Manager"
+		self.position.save()
+
+		self.assertEqual(self.get_user().position.name, "Manager")
+
+	def test_password_changes_end_other_sessions(self) -> None:
+		self.get_user()
+		self.worker.set_password("new password")
+		self.worker.save()
+
+		self.assertFalse(self.get_user().is_authenticated)
+
+	def test_inactive_users_are_not_authenticated(self) -> None:
+		self.get_user()
+		self.worker.is_active = False
+		self.worker.save()
+
+		self.assertFalse(self.get_user().is_authenticated)
+
+
+class SessionStoreTest(TestCase):
+	def test_deletes_sessions_with_a_single_query(self) -> None:
+		session = SessionStore()
+		session["key"] = "value"
+		session.create()
+		session_key = session.session_key
+
+		with self.assertNumQueries(1):
+			session.flush()
+
+		self.assertFalse(SessionStore().exists(session_key))
@@ -0,0 +1,154 @@
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, TestCase
+
+from task_manager.benchmarks import (
+	BASELINE_PATH,
+	SIZES,
+	USERNAME,
+	LoadBenchmark,
+	ViewBenchmark,
+	benchmark_session,
+	build_dataset,
+	find_regressions,
+	get_load_paths,
+	load_baseline,
+)
+from task_manager.models import Task, Worker
+
+
+def result(wall_ms: float, sql_ms: float, queries: int) -> dict:
+	return {"wall_ms": wall_ms, "sql_ms": sql_ms, "queries": queries}
+
+
+class FindRegressionsTest(TestCase):
+	def setUp(self) -> None:
+		self.baseline = {"1000": {"task_list": result(40.0, 10.0, 4)}}
+
+	def test_extra_query_is_a_regression(self) -> None:
+		regressions = find_regressions(
+			{"1000": {"task_list": result(40.0, 10.0, 5)}}, self.baseline
+		)
+
+		self.assertEqual(regressions, ["1000/task_list: queries 4 -> 5"])
+
+	def test_slowdown_past_threshold_is_a_regression(self) -> None:
+		regressions = find_regressions(
+			{"1000": {"task_list": result(70.0, 10.0, 4)}}, self.baseline
+		)
+
+		self.assertEqual(regressions, ["1000/task_list: wall_ms 40.0 -> 70.0"])
+
+	def test_small_changes_are_ignored(self) -> None:
+		results = {"1000": {"task_list": result(50.0, 14.0, 3)}}
+
+		self.assertEqual(find_regressions(results, self.baseline), [])
+
+	def test_results_missing_from_the_baseline_fail(self) -> None:
+		results = {
+			"1000": {"task_detail": result(5.0, 1.0, 1)},
+			"100000": {"task_list": result(5.0, 1.0, 1)},
+		}
+
+		self.assertEqual(
+			find_regressions(results, self.baseline),
+			[
+				"1000/task_detail: not in the baseline",
+				"100000/task_list: not in the baseline",
+			],
+		)
+
+
+class BenchmarkCommandTest(TestCase):
+	def test_missing_baseline_fails(self) -> None:
+		with self.assertRaisesMessage(CommandError, "No baseline"):
+			call_command(
+				"benchmark", baseline=Path("/nonexistent/baseline.json")
+			)
+
+	def test_stored_baseline_covers_every_route(self) -> None:
+		build_dataset(30)
+		routes = set(ViewBenchmark(repeat=1).get_routes())
+		baseline = load_baseline(BASELINE_PATH)
+
+		self.assertIn(str(min(SIZES)), baseline)
+		for size_routes in baseline.values():
+			self.assertEqual(set(size_routes), routes)
+
+
+class ViewBenchmarkTest(TestCase):
+	def test_run_measures_every_route(self) -> None:
+		build_dataset(30)
+		build_dataset(60)
+		self.assertEqual(Task.objects.count(), 60)
+
+		results = ViewBenchmark(repeat=1).run()
+
+		self.assertEqual(set(results), set(ViewBenchmark(1).get_routes()))
+		for metrics in results.values():
+			self.assertGreater(metrics["queries"], 0)
+			self.assertGreaterEqual(metrics["wall_ms"], metrics["sql_ms"])
+
+	def test_deep_cursor_reaches_the_deep_page(self) -> None:
+		build_dataset(25)
+		routes = ViewBenchmark(repeat=1).get_routes()
+
+		by_page = routes["task_list_deep_page"]().context["task_list"]
+		by_cursor = routes["task_list_deep_cursor"]().context["task_list"]
+
+		self.assertEqual(len(by_cursor), 5)
+		self.assertEqual(list(by_cursor), list(by_page))
+
+
+class LoadBenchmarkTest(LiveServerTestCase):
+	def test_run_loads_a_running_server(self) -> None:
+		build_dataset(30)
+		paths = list(get_load_paths().values())
+
+		with benchmark_session() as cookie:
+			result = LoadBenchmark(
+				self.live_server_url,
+				paths,
+				cookie,
+				connections=2,
+				duration=0.5,
+			).run()
+
+		self.assertGreaterEqual(result["requests"], len(paths))
+		self.assertGreater(result["requests_per_second"], 0)
+		self.assertGreaterEqual(result["p95_ms"], result["p50_ms"])
+		self.assertEqual(result["errors"], 0)
+
+	def test_failed_requests_are_errors(self) -> None:
+		result = LoadBenchmark(
+			self.live_server_url, ["/missing/"], connections=1, duration=0.2
+		).run()
+
+		self.assertEqual(result["requests"], 0)
+		self.assertGreater(result["errors"], 0)
+
+	def test_command_deletes_the_benchmark_user(self) -> None:
+		stdout = StringIO()
+
+		call_command(
+			"benchmark_servers",
+			f"live={self.live_server_url}",
+			size=30,
+			connections=1,
+			duration=0.2,
+			database="default",
+			stdout=stdout,
+		)
+
+		self.assertRegex(stdout.getvalue(), r"live\s+\d+\s.*\s0\n")
+		self.assertFalse(Worker.objects.filter(username=USERNAME).exists())
+		self.assertFalse(Session.objects.exists())
+
+	def test_command_requires_a_benchmark_database(self) -> None:
+		with self.assertRaisesMessage(
+			CommandError, "No 'benchmark' database is configured"
+		):
+			call_command("benchmark_servers", f"live={self.live_server_url}")
@@ -0,0 +1,233 @@
+from django.contrib.messages import constants
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager import bulk
+from task_manager.forms import TaskForm
+from task_manager.models import Task, Worker
+from task_manager.tests.utils import (
+	create_position,
+	create_task,
+	create_task_type,
+	create_worker,
+	get_actual_deadline,
+)
+
+TASK_LIST_URL = reverse("task_manager:task_list")
+WORKER_LIST_URL = reverse("task_manager:worker_list")
+
+
+class ConditionalGetTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.position = create_position()
+		cls.worker = create_worker(position=cls.position)
+		cls.task_type = create_task_type()
+		cls.task = create_task(name="task", task_type=cls.task_type)
+		cls.task.assignees.add(cls.worker)
+
+	def setUp(self) -> None:
+		cache.clear()
+		self.client.force_login(self.worker)
+
+	def get_task_url(self) -> str:
+		return reverse("task_manager:task_detail", args=[self.task.pk])
+
+	def get_worker_url(self) -> str:
+		return reverse("task_manager:worker_detail", args=[self.worker.pk])
+
+	def rename_worker(self) -> None:
+		worker = Worker.objects.get(pk=self.worker.pk)
+		worker.first_name = "Renamed"
+		worker.save()
+
+	def rename_position(self) -> None:
+		self.position.name = "Lead"
+		self.position.save()
+
+	def test_unchanged_pages_are_not_modified(self) -> None:
+		for url in (
+			self.get_task_url(),
+			self.get_worker_url(),
+			TASK_LIST_URL,
+			WORKER_LIST_URL,
+		):
+			with self.subTest(url):
+				etag = self.client.get(url)["ETag"]
+
+				# The probe alone, with the user and session cached.
+				with self.assertNumQueries(1):
+					response = self.client.get(
+						url, headers={"if-none-match": etag}
+					)
+
+				self.assertEqual(response.status_code, 304)
+				self.assertEqual(response["ETag"], etag)
+				self.assertEqual(response.content, b"")
+
+	def test_detail_pages_answer_if_modified_since(self) -> None:
+		last_modified = self.client.get(self.get_task_url())["Last-Modified"]
+		response = self.client.get(
+			self.get_task_url(), headers={"if-modified-since": last_modified}
+		)
+
+		self.assertEqual(response.status_code, 304)
+
+	def test_task_changes(self) -> None:
+		etag = self.client.get(self.get_task_url())["ETag"]
+		self.task.priority = 4
+		self.task.save()
+
+		response = self.client.get(
+			self.get_task_url(), headers={"if-none-match": etag}
+		)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertNotEqual(response["ETag"], etag)
+
+	def test_assignee_changes(self) -> None:
+		url = self.get_task_url()
+		for change in (
+			self.rename_worker,
+			self.rename_position,
+			lambda: self.task.assignees.remove(self.worker),
+		):
+			etag = self.client.get(url)["ETag"]
+			change()
+
+			response = self.client.get(url, headers={"if-none-match": etag})
+
+			self.assertEqual(response.status_code, 200)
+
+	def test_deleted_tasks_change_worker_pages(self) -> None:
+		etags = {
+			url: self.client.get(url)["ETag"]
+			for url in (self.get_worker_url(), TASK_LIST_URL)
+		}
+		self.task.delete()
+
+		for url, etag in etags.items():
+			with self.subTest(url):
+				response = self.client.get(
+					url, headers={"if-none-match": etag}
+				)
+
+				self.assertEqual(response.status_code, 200)
+
+	def test_task_type_changes_change_the_task_list(self) -> None:
+		etag = self.client.get(TASK_LIST_URL)["ETag"]
+		create_task_type(name="Feature")
+
+		response = self.client.get(
+			TASK_LIST_URL, headers={"if-none-match": etag}
+		)
+
+		self.assertEqual(response.status_code, 200)
+
+	def test_etag_depends_on_the_user(self) -> None:
+		etag = self.client.get(TASK_LIST_URL)["ETag"]
+		self.client.force_login(create_worker(username="other"))
+
+		response = self.client.get(
+			TASK_LIST_URL, headers={"if-none-match": etag}
+		)
+
+		self.assertEqual(response.status_code, 200)
+
+	def test_pages_with_messages_are_rendered(self) -> None:
+		etag = self.client.get(TASK_LIST_URL)["ETag"]
+		request = RequestFactory().get("/")
+		storage = CookieStorage(request)
+		storage.add(constants.SUCCESS, "Task was updated.")
+		response = self.client.get(TASK_LIST_URL)
+		storage.update(response)
+		self.client.cookies.update(response.cookies)
+
+		response = self.client.get(
+			TASK_LIST_URL, headers={"if-none-match": etag}
+		)
+
+		self.assertContains(response, "Task was updated.")
+
+
+class UpdatedAtTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.task_type = create_task_type()
+		cls.position = create_position()
+		cls.worker = create_worker(position=cls.position)
+		cls.task = create_task(name="task", task_type=cls.task_type)
+
+	def get_task_updated_at(self):
+		return Task.objects.get(pk=self.task.pk).updated_at
+
+	def get_worker_updated_at(self):
+		return Worker.objects.get(pk=self.worker.pk).updated_at
+
+	def test_saves_touch_the_row(self) -> None:
+		before = self.get_task_updated_at()
+		task = Task.objects.get(pk=self.task.pk)
+		task.priority = 4
+		task.save()
+
+		self.assertGreater(self.get_task_updated_at(), before)
+
+	def test_bulk_updates_touch_the_tasks(self) -> None:
+		tasks = Task.objects.filter(pk=self.task.pk)
+		for action in (
+			lambda: bulk.set_priority(tasks, 4),
+			lambda: bulk.add_assignees(tasks, [self.worker.pk]),
+			lambda: bulk.remove_assignees(tasks, [self.worker.pk]),
+			lambda: bulk.complete_tasks(tasks),
+		):
+			before = self.get_task_updated_at()
+			action()
+
+			self.assertGreater(self.get_task_updated_at(), before)
+
+	def test_assignments_touch_both_sides(self) -> None:
+		task_before = self.get_task_updated_at()
+		worker_before = self.get_worker_updated_at()
+		self.worker.tasks.add(self.task)
+
+		self.assertGreater(self.get_task_updated_at(), task_before)
+		self.assertGreater(self.get_worker_updated_at(), worker_before)
+
+	def test_task_forms_update_the_task_once(self) -> None:
+		before = self.get_task_updated_at()
+		form = TaskForm(
+			{
+				"name": "task",
+				"description": self.task.description,
+				"deadline": get_actual_deadline(),
+				"priority": 4,
+				"task_type": self.task_type.pk,
+				"assignees": [self.worker.pk],
+			},
+			instance=Task.objects.get(pk=self.task.pk),
+		)
+
+		with CaptureQueriesContext(connection) as context:
+			form.save()
+
+		self.assertGreater(self.get_task_updated_at(), before)
+		task_updates = [
+			query for query in context
+			if query["sql"].startswith('UPDATE "task_manager_task" ')
+		]
+		self.assertEqual(len(task_updates), 1)
+
+	def test_renames_touch_related_rows(self) -> None:
+		task_before = self.get_task_updated_at()
+		worker_before = self.get_worker_updated_at()
+		self.task_type.name = "Feature"
+		self.task_type.save()
+		self.position.name = "Lead"
+		self.position.save()
+
+		self.assertGreater(self.get_task_updated_at(), task_before)
+		self.assertGreater(self.get_worker_updated_at(), worker_before)
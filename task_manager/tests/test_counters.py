@@ -0,0 +1,180 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, TransactionTestCase
+
+from task_manager.counters import get_counters, reconcile
+from task_manager.models import Counter, Task, Worker
+from task_manager.tests.utils import (
+	create_task,
+	create_task_type,
+	create_worker,
+)
+
+
+class CounterSignalsTest(TestCase):
+	def assertCounters(self, total: int, active: int, users: int) -> None:
+		self.assertEqual(
+			get_counters(),
+			{
+				Counter.TOTAL_TASKS: total,
+				Counter.ACTIVE_TASKS: active,
+				Counter.TOTAL_USERS: users,
+			},
+		)
+
+	def test_counters_follow_created_tasks_and_workers(self) -> None:
+		create_task(name="open")
+		create_task(name="done", is_completed=True)
+		create_worker()
+
+		self.assertCounters(total=2, active=1, users=1)
+
+	def test_counters_follow_task_completion(self) -> None:
+		task = create_task()
+		task.is_completed = True
+		task.save()
+
+		self.assertCounters(total=1, active=0, users=0)
+
+		task = Task.objects.get(pk=task.pk)
+		task.is_completed = False
+		task.save()
+
+		self.assertCounters(total=1, active=1, users=0)
+
+	def test_counters_ignore_saves_without_completion_change(self) -> None:
+		task = create_task()
+		task.name = "renamed"
+		task.save()
+		task.save(update_fields=["name"])
+
+		self.assertCounters(total=1, active=1, users=0)
+
+	def test_counters_follow_deletes(self) -> None:
+		create_task(name="open").delete()
+		create_task(name="done", is_completed=True).delete()
+		create_worker().delete()
+
+		self.assertCounters(total=0, active=0, users=0)
+
+
+class CounterAtomicityTest(TransactionTestCase):
+	def setUp(self) -> None:
+		# Flushing the tables removed the counter rows; recreate them.
+		reconcile()
+
+	def test_counters_roll_back_with_failed_saves(self) -> None:
+		task_type = create_task_type()
+		# Purging pages is one of the last post_save receivers, so the
+		# row is saved and counted by the time it fails.
+		with (
+			mock.patch(
+				"task_manager.page_cache.purge", side_effect=DatabaseError
+			),
+			self.assertRaises(DatabaseError),
+		):
+			create_task(task_type=task_type)
+
+		self.assertFalse(Task.objects.exists())
+		self.assertEqual(get_counters()[Counter.TOTAL_TASKS], 0)
+
+
+class WorkerTaskCountsTest(TestCase):
+	def setUp(self) -> None:
+		self.worker = create_worker()
+		self.other = create_worker(username="other")
+		self.task = create_task()
+
+	def assertTaskCounts(
+		self, worker: Worker, active: int, resolved: int
+	) -> None:
+		worker.refresh_from_db()
+		self.assertEqual(
+			(worker.active_task_count, worker.resolved_task_count),
+			(active, resolved),
+		)
+
+	def test_counts_follow_assignments(self) -> None:
+		self.task.assignees.add(self.worker, self.other)
+		create_task(name="done", is_completed=True).assignees.add(self.worker)
+
+		self.assertTaskCounts(self.worker, active=1, resolved=1)
+		self.assertTaskCounts(self.other, active=1, resolved=0)
+
+		self.task.assignees.remove(self.other)
+		self.assertTaskCounts(self.other, active=0, resolved=0)
+
+		self.worker.tasks.clear()
+		self.assertTaskCounts(self.worker, active=0, resolved=0)
+
+	def test_counts_follow_clear_from_task_side(self) -> None:
+		self.task.assignees.set([self.worker, self.other])
+		self.task.assignees.clear()
+
+		self.assertTaskCounts(self.worker, active=0, resolved=0)
+		self.assertTaskCounts(self.other, active=0, resolved=0)
+
+	def test_counts_follow_task_completion(self) -> None:
+		self.task.assignees.add(self.worker)
+		self.task.is_completed = True
+		self.task.save()
+
+		self.assertTaskCounts(self.worker, active=0, resolved=1)
+
+	def test_counts_follow_task_deletion(self) -> None:
+		self.task.assignees.add(self.worker)
+		self.task.delete()
+
+		self.assertTaskCounts(self.worker, active=0, resolved=0)
+
+
+class ReconcileCountersCommandTest(TestCase):
+	def test_reconcile_fixes_drift(self) -> None:
+		create_task()
+		Counter.objects.filter(name=Counter.TOTAL_TASKS).update(value=42)
+		Counter.objects.filter(name=Counter.TOTAL_USERS).delete()
+		out = StringIO()
+
+		call_command("reconcile_counters", stdout=out)
+
+		self.assertIn("total_tasks: 42 -> 1", out.getvalue())
+		self.assertEqual(get_counters()[Counter.TOTAL_TASKS], 1)
+		self.assertTrue(
+			Counter.objects.filter(name=Counter.TOTAL_USERS).exists()
+		)
+
+	def test_reconcile_fixes_worker_task_counts(self) -> None:
+		worker = create_worker()
+		create_task().assignees.add(worker)
+		Worker.objects.update(active_task_count=5, resolved_task_count=5)
+
+		call_command("reconcile_counters", stdout=StringIO())
+		worker.refresh_from_db()
+
+		self.assertEqual(worker.active_task_count, 1)
+		self.assertEqual(worker.resolved_task_count, 0)
+
+	def test_reconcile_leaves_workers_in_sync_alone(self) -> None:
+		worker, drifted = create_worker(), create_worker(username="other")
+		create_task().assignees.add(worker, drifted)
+		Worker.objects.filter(pk=drifted.pk).update(active_task_count=5)
+		updated_at = Worker.objects.get(pk=worker.pk).updated_at
+
+		call_command("reconcile_counters", stdout=StringIO())
+
+		self.assertEqual(
+			Worker.objects.get(pk=worker.pk).updated_at, updated_at
+		)
+		self.assertEqual(
+			Worker.objects.get(pk=drifted.pk).active_task_count, 1
+		)
+
+	def test_reconcile_reports_counters_in_sync(self) -> None:
+		out = StringIO()
+
+		call_command("reconcile_counters", stdout=out)
+
+		self.assertIn("Counters are in sync.", out.getvalue())
@@ -0,0 +1,166 @@
+import datetime
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.test import TestCase
+
+from task_manager.counters import count_rows, get_counters
+from task_manager.fixture_loader import (
+	FixtureLoader,
+	iter_json_objects,
+	sort_models,
+)
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.search import TaskFullTextSearchBackend
+
+
+def make_fixture(tasks: int = 2) -> list[dict]:
+	return [
+		{
+			"model": "task_manager.task",
+			"pk": pk,
+			"fields": {
+				"name": f"Task {pk}",
+				"description": "Imported from the old tracker",
+				"created_at": "2024-12-24",
+				"deadline": "2024-12-31",
+				"is_completed": pk % 2 == 0,
+				"priority": 2,
+				"task_type": 1,
+				"assignees": [1],
+			},
+		}
+		for pk in range(1, tasks + 1)
+	] + [
+		{"model": "task_manager.tasktype", "pk": 1, "fields": {"name": "Bug"}},
+		{
+			"model": "task_manager.worker",
+			"pk": 1,
+			"fields": {
+				"password": "!",
+				"username": "admin",
+				"position": 1,
+				"date_joined": "2024-12-24T12:47:17.101Z",
+			},
+		},
+		{
+			"model": "task_manager.position",
+			"pk": 1,
+			"fields": {"name": "Manager"},
+		},
+	]
+
+
+class IterJsonObjectsTest(TestCase):
+	def test_iter_json_array_across_reads(self) -> None:
+		fixture = make_fixture()
+		stream = StringIO(json.dumps(fixture, indent=4))
+
+		self.assertEqual(list(iter_json_objects(stream, read_size=7)), fixture)
+
+	def test_iter_json_lines(self) -> None:
+		stream = StringIO('{"a": 1}\n\n{"b": [1, 2]}\n')
+
+		self.assertEqual(
+			list(iter_json_objects(stream)), [{"a": 1}, {"b": [1, 2]}]
+		)
+
+	def test_iter_truncated_json(self) -> None:
+		with self.assertRaises(ValueError):
+			list(iter_json_objects(StringIO('[{"a": 1}, {"b": '), 4))
+
+	def test_iter_rejects_non_objects(self) -> None:
+		with self.assertRaises(ValueError):
+			list(iter_json_objects(StringIO("[1, 2]")))
+
+
+class FixtureLoaderTest(TestCase):
+	def load(self, fixture: list[dict], **kwargs) -> dict:
+		return FixtureLoader(**kwargs).load(StringIO(json.dumps(fixture)))
+
+	def test_sort_models_puts_foreign_key_targets_first(self) -> None:
+		ordered = sort_models([Task, Worker, TaskType, Position])
+
+		self.assertLess(ordered.index(TaskType), ordered.index(Task))
+		self.assertLess(ordered.index(Position), ordered.index(Worker))
+
+	def test_load_fixture(self) -> None:
+		loaded = self.load(make_fixture(), batch_size=1)
+
+		self.assertEqual(
+			loaded, {Position: 1, TaskType: 1, Task: 2, Worker: 1}
+		)
+		task = Task.objects.get(pk=1)
+		self.assertEqual(task.created_at, datetime.date(2024, 12, 24))
+		self.assertEqual(task.task_type.name, "Bug")
+		self.assertEqual(list(task.assignees.all()), [Worker.objects.get()])
+		self.assertEqual(Worker.objects.get().position.name, "Manager")
+
+	def test_load_keeps_counters_and_search_index_in_step(self) -> None:
+		self.load(make_fixture())
+
+		self.assertEqual(get_counters(), count_rows())
+		worker = Worker.objects.get()
+		self.assertEqual(worker.active_task_count, 1)
+		self.assertEqual(worker.resolved_task_count, 1)
+		self.assertEqual(
+			TaskFullTextSearchBackend().search(
+				Task.objects.all(), "tracker"
+			).count(),
+			2,
+		)
+
+	def test_load_overwrites_existing_rows(self) -> None:
+		self.load(make_fixture())
+		fixture = make_fixture()
+		fixture[0]["fields"].update(name="Renamed", assignees=[])
+
+		self.load(fixture)
+
+		task = Task.objects.get(pk=1)
+		self.assertEqual(task.name, "Renamed")
+		self.assertFalse(task.assignees.exists())
+		self.assertEqual(Task.objects.count(), 2)
+
+	def test_load_without_primary_keys(self) -> None:
+		fixture = make_fixture()
+		del fixture[0]["pk"]
+
+		self.load(fixture)
+
+		self.assertTrue(
+			Task.objects.get(name="Task 1").assignees.exists()
+		)
+
+	def test_load_checks_foreign_keys(self) -> None:
+		fixture = make_fixture()
+		fixture[0]["fields"]["task_type"] = 99
+
+		with self.assertRaises(IntegrityError):
+			self.load(fixture)
+		self.assertFalse(Task.objects.exists())
+
+	def test_load_query_count_does_not_grow_with_objects(self) -> None:
+		with self.assertNumQueries(31) as few:
+			self.load(make_fixture(2))
+
+		Task.objects.all().delete()
+
+		with self.assertNumQueries(len(few)):
+			self.load(make_fixture(200))
+
+
+class LoadFixtureCommandTest(TestCase):
+	def test_load_fixture_command(self) -> None:
+		out = StringIO()
+
+		call_command("load_fixture", "dump.json", stdout=out)
+
+		self.assertEqual(Task.objects.count(), 6)
+		self.assertIn("Installed 20 object(s) from dump.json", out.getvalue())
+
+	def test_load_fixture_command_missing_file(self) -> None:
+		with self.assertRaisesMessage(CommandError, "missing.json"):
+			call_command("load_fixture", "missing.json")
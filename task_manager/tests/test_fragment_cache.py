@@ -0,0 +1,125 @@
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager import fragment_cache, metrics
+from task_manager.tests.utils import create_task, create_worker
+
+STATS_URL = reverse("task_manager:fragment_cache_stats")
+TEMPLATE = Template(
+	"{% load task_cache %}"
+	"{% taskfragment 'test' task %}{{ task.name }}{% endtaskfragment %}"
+)
+
+
+class TaskFragmentCacheTest(TestCase):
+	def setUp(self) -> None:
+		fragment_cache.get_cache().clear()
+		metrics.store.reset()
+		self.task = create_task()
+
+	def render(self) -> str:
+		with metrics.RequestMetrics() as request_metrics:
+			content = TEMPLATE.render(Context({"task": self.task}))
+		self.hits += request_metrics.fragment_hits
+		self.misses += request_metrics.fragment_misses
+
+		return content
+
+	hits = misses = 0
+
+	def test_second_render_is_a_hit(self) -> None:
+		self.render()
+		self.render()
+
+		self.assertEqual((self.hits, self.misses), (1, 1))
+
+	def test_save_invalidates_fragment(self) -> None:
+		self.render()
+		self.task.name = "renamed"
+		self.task.save()
+
+		self.assertEqual(self.render(), "renamed")
+		self.assertEqual((self.hits, self.misses), (0, 2))
+
+	def test_assignment_invalidates_fragment(self) -> None:
+		self.render()
+		create_worker().tasks.add(self.task)
+		self.render()
+
+		self.assertEqual(self.misses, 2)
+
+	def test_evicted_version_is_never_reused(self) -> None:
+		self.render()
+		fragment_cache.get_cache().delete(
+			fragment_cache._version_key(self.task.pk)
+		)
+		self.render()
+
+		self.assertEqual(self.misses, 2)
+
+	def test_loaded_fragments_are_not_looked_up_again(self) -> None:
+		self.render()
+		task = self.task
+		fragment_cache.load_fragments([task], "test")
+		cache = fragment_cache.get_cache()
+
+		with mock.patch.object(cache, "get", wraps=cache.get) as get:
+			self.assertEqual(self.render(), task.name)
+
+		get.assert_not_called()
+		self.assertEqual((self.hits, self.misses), (1, 1))
+
+	def get_fragment_lookups(self, url: str):
+		"""Request the page, returning it and its single fragment gets."""
+		cache = fragment_cache.get_cache()
+
+		with mock.patch.object(cache, "get", wraps=cache.get) as get:
+			response = self.client.get(url)
+
+		# LocMemCache.get_many() calls get() with a default for each key.
+		return response, [
+			call for call in get.call_args_list
+			if len(call.args) == 1
+			and call.args[0].startswith(fragment_cache.FRAGMENT_KEY_PREFIX)
+		]
+
+	def test_pages_render_fragments_fetched_at_once(self) -> None:
+		worker = create_worker()
+		for i in range(3):
+			create_task(name=f"task{i}").assignees.add(worker)
+		self.client.force_login(worker)
+
+		for name, args, count in (
+			("worker_detail", [worker.pk], 3),
+			("task_list", [], 4),
+		):
+			with self.subTest(name):
+				url = reverse(f"task_manager:{name}", args=args)
+				self.get_fragment_lookups(url)
+				metrics.store.reset()
+
+				response, lookups = self.get_fragment_lookups(url)
+
+				self.assertEqual(lookups, [])
+				self.assertEqual(
+					fragment_cache.get_stats(), {"hits": count, "misses": 0}
+				)
+				self.assertContains(response, "task0")
+
+
+class FragmentCacheStatsViewTest(TestCase):
+	def test_stats_require_staff(self) -> None:
+		self.client.force_login(create_worker())
+		response = self.client.get(STATS_URL)
+
+		self.assertEqual(response.status_code, 403)
+
+	def test_stats_for_staff(self) -> None:
+		self.client.force_login(create_worker(is_staff=True))
+		response = self.client.get(STATS_URL)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(set(response.json()), {"hits", "misses"})
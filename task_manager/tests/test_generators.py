@@ -0,0 +1,144 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from task_manager.counters import count_rows, get_counters
+from task_manager.generators import DataGenerator
+from task_manager.models import Task, Worker
+
+TaskAssignment = Task.assignees.through
+
+
+class DataGeneratorTest(TestCase):
+	def generate(self, processes: int = 1, **kwargs) -> None:
+		options = {"workers": 20, "tasks": 50, "batch_size": 15, **kwargs}
+		DataGenerator(**options).generate(processes)
+
+	def snapshot(self, prefix: str) -> list[tuple]:
+		return list(
+			Task.objects.filter(name__startswith=f"{prefix}-").order_by(
+				"pk"
+			).values_list(
+				"deadline", "is_completed", "priority"
+			).annotate(assignees=Count("assignees"))
+		)
+
+	def test_generate_sizes(self) -> None:
+		self.generate()
+
+		self.assertEqual(Worker.objects.count(), 20)
+		self.assertEqual(Task.objects.count(), 50)
+		self.assertEqual(get_counters(), count_rows())
+
+	def test_generate_is_deterministic_from_seed(self) -> None:
+		self.generate(prefix="a", seed=1)
+		self.generate(prefix="b", seed=1)
+		self.generate(prefix="c", seed=2)
+
+		self.assertEqual(self.snapshot("a"), self.snapshot("b"))
+		self.assertNotEqual(self.snapshot("a"), self.snapshot("c"))
+
+	def assignments(self, prefix: str) -> list[tuple[str, str]]:
+		return sorted(
+			(task.removeprefix(prefix), worker.removeprefix(prefix))
+			for task, worker in TaskAssignment.objects.filter(
+				task__name__startswith=f"{prefix}-"
+			).values_list("task__name", "worker__username")
+		)
+
+	def test_generate_is_deterministic_across_processes(self) -> None:
+		def run_out_of_order(generator, generate, total, processes):
+			# Parallel batches may finish in any order; SQLite can't
+			# share the test database with forked processes.
+			size = generator.batch_size
+			for batch in reversed(range((total + size - 1) // size)):
+				generate(batch)
+
+		self.generate(prefix="a", processes=1)
+		with (
+			mock.patch.object(
+				DataGenerator, "can_run_in_parallel", return_value=True
+			),
+			mock.patch.object(DataGenerator, "_run", run_out_of_order),
+		):
+			self.generate(prefix="b", processes=2)
+
+		self.assertEqual(self.assignments("a"), self.assignments("b"))
+
+	def test_generate_distributions(self) -> None:
+		self.generate(
+			priority_weights={4: 1},
+			deadline_days=(5, 10),
+			completed_ratio=0,
+			assignees=(2, 2),
+		)
+		today = datetime.date.today()
+
+		self.assertFalse(Task.objects.exclude(priority=4).exists())
+		self.assertFalse(Task.objects.filter(is_completed=True).exists())
+		self.assertFalse(
+			Task.objects.exclude(
+				deadline__range=(
+					today + datetime.timedelta(days=5),
+					today + datetime.timedelta(days=10),
+				)
+			).exists()
+		)
+		self.assertEqual(
+			set(
+				Task.objects.annotate(
+					count=Count("assignees")
+				).values_list("count", flat=True)
+			),
+			{2},
+		)
+
+	def test_generate_keeps_worker_task_counts(self) -> None:
+		self.generate()
+		worker = Worker.objects.annotate(
+			assigned=Count("tasks")
+		).order_by("-assigned").first()
+
+		self.assertEqual(worker.total_task_count, worker.assigned)
+
+	def test_generate_query_count_does_not_grow_with_batch_size(self) -> None:
+		with self.assertNumQueries(15) as few:
+			self.generate(workers=10, tasks=10, batch_size=10)
+
+		with self.assertNumQueries(len(few)):
+			self.generate(workers=60, tasks=60, batch_size=60, prefix="x")
+
+
+class GenerateDataCommandTest(TestCase):
+	def test_generate_data_command(self) -> None:
+		out = StringIO()
+
+		call_command(
+			"generate_data", "--workers=5", "--tasks=10", stdout=out
+		)
+
+		self.assertEqual(Task.objects.count(), 10)
+		self.assertIn("Generated 35 row(s)", out.getvalue())
+
+	def test_generate_data_command_refuses_used_prefix(self) -> None:
+		call_command(
+			"generate_data", "--workers=1", "--tasks=1", stdout=StringIO()
+		)
+
+		with self.assertRaisesMessage(CommandError, "--prefix"):
+			call_command("generate_data", "--workers=1", "--tasks=1")
+
+	def test_generate_data_command_validates_options(self) -> None:
+		for option in (
+			"--assignees=3:1",
+			"--deadline-days=soon",
+			"--priority-weights=9:1",
+			"--completed-ratio=2",
+		):
+			with self.subTest(option=option):
+				with self.assertRaises(CommandError):
+					call_command("generate_data", option)
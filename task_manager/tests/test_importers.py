@@ -0,0 +1,209 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from task_manager.counters import count_rows, get_counters
+from task_manager.importers import (
+	CSV,
+	NDJSON,
+	TaskImporter,
+	WorkerImporter,
+	read_records,
+)
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.search import TaskFullTextSearchBackend
+from task_manager.tests.utils import (
+	create_task,
+	create_worker,
+	get_actual_deadline,
+	get_past_deadline,
+)
+
+TASKS_CSV = f"""name,description,deadline,priority,is_completed,task_type,assignees
+Login page,Build the login form,{get_actual_deadline()},3,false,Feature,"alice,bob"
+Fix logout,Logout keeps the session,{get_actual_deadline()},4,true,Bug,bob
+Late task,Deadline has passed,{get_past_deadline()},1,false,Bug,
+"""
+
+
+class ReadRecordsTest(TestCase):
+	def test_read_csv(self) -> None:
+		records = list(read_records(StringIO(TASKS_CSV), CSV))
+
+		self.assertEqual(len(records), 3)
+		self.assertEqual(records[0]["assignees"], "alice,bob")
+
+	def test_read_ndjson_skips_blank_lines(self) -> None:
+		stream = StringIO('{"username": "alice"}\n\n{"username": "bob"}\n')
+
+		self.assertEqual(
+			list(read_records(stream, NDJSON)),
+			[{"username": "alice"}, {"username": "bob"}],
+		)
+
+	def test_read_ndjson_reports_broken_line(self) -> None:
+		with self.assertRaisesMessage(ValueError, "Line 2"):
+			list(read_records(StringIO('{"a": 1}\n{"a": \n'), NDJSON))
+
+
+class TaskImporterTest(TestCase):
+	def setUp(self) -> None:
+		self.alice = create_worker(username="alice")
+		self.bob = create_worker(username="bob")
+
+	def test_import_tasks(self) -> None:
+		stats = TaskImporter().run(read_records(StringIO(TASKS_CSV), CSV))
+
+		self.assertEqual(stats.created, 2)
+		self.assertEqual(len(stats.errors), 1)
+		self.assertIn("Row 3: deadline:", stats.errors[0])
+
+		task = Task.objects.get(name="Login page")
+		self.assertEqual(task.priority, 3)
+		self.assertEqual(task.task_type.name, "Feature")
+		self.assertQuerySetEqual(
+			task.assignees.order_by("username"), [self.alice, self.bob]
+		)
+		self.assertTrue(Task.objects.get(name="Fix logout").is_completed)
+
+	def test_import_keeps_counters_and_search_index_in_step(self) -> None:
+		TaskImporter().run(read_records(StringIO(TASKS_CSV), CSV))
+
+		self.assertEqual(get_counters(), count_rows())
+		self.bob.refresh_from_db()
+		self.assertEqual(self.bob.active_task_count, 1)
+		self.assertEqual(self.bob.resolved_task_count, 1)
+		self.assertQuerySetEqual(
+			TaskFullTextSearchBackend().search(Task.objects.all(), "session"),
+			["Fix logout"],
+			transform=str,
+		)
+
+	def test_import_skips_existing_and_duplicate_names(self) -> None:
+		create_task(name="Login page")
+		records = [
+			{
+				"name": name,
+				"description": "test",
+				"deadline": str(get_actual_deadline()),
+				"priority": 1,
+			}
+			for name in ("Login page", "Signup", "Signup")
+		]
+
+		stats = TaskImporter().run(records)
+
+		self.assertEqual((stats.created, stats.skipped), (1, 2))
+		self.assertEqual(Task.objects.count(), 2)
+
+	def test_import_rejects_unknown_assignees(self) -> None:
+		records = [
+			{
+				"name": "Signup",
+				"description": "test",
+				"deadline": str(get_actual_deadline()),
+				"priority": 2,
+				"assignees": ["alice", "nobody"],
+			}
+		]
+
+		stats = TaskImporter().run(records)
+
+		self.assertEqual(
+			stats.errors, ["Row 1: assignees: Unknown users: nobody."]
+		)
+		self.assertFalse(Task.objects.exists())
+
+	def test_import_query_count_does_not_grow_with_rows(self) -> None:
+		TaskType.objects.create(name="Feature")
+
+		def records(count: int) -> list[dict]:
+			return [
+				{
+					"name": f"task{count}-{i}",
+					"description": "test",
+					"deadline": str(get_actual_deadline()),
+					"priority": 1,
+					"task_type": "Feature",
+					"assignees": "alice",
+				}
+				for i in range(count)
+			]
+
+		with self.assertNumQueries(10) as few:
+			TaskImporter().run(records(2))
+		with self.assertNumQueries(len(few)):
+			TaskImporter().run(records(50))
+
+
+class WorkerImporterTest(TestCase):
+	def test_import_workers(self) -> None:
+		records = [
+			{"username": "alice", "position": "Developer", "password": "pw"},
+			{"username": "bob", "first_name": "Bob", "position": "QA"},
+			{"username": "bad name!"},
+		]
+
+		stats = WorkerImporter().run(records)
+
+		self.assertEqual(stats.created, 2)
+		self.assertIn("Row 3: username:", stats.errors[0])
+		alice = Worker.objects.get(username="alice")
+		self.assertEqual(alice.position.name, "Developer")
+		self.assertTrue(alice.check_password("pw"))
+		self.assertFalse(
+			Worker.objects.get(username="bob").has_usable_password()
+		)
+		self.assertEqual(Position.objects.count(), 2)
+		self.assertEqual(get_counters(), count_rows())
+
+
+class ImportCommandTest(TestCase):
+	def write(self, name: str, content: str) -> str:
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		path = Path(directory.name) / name
+		path.write_text(content)
+
+		return str(path)
+
+	def test_import_workers_command(self) -> None:
+		path = self.write(
+			"workers.ndjson",
+			"\n".join(
+				json.dumps({"username": f"worker{i}"}) for i in range(3)
+			),
+		)
+		out = StringIO()
+
+		call_command("import_workers", path, "--batch-size", "2", stdout=out)
+
+		self.assertEqual(Worker.objects.count(), 3)
+		self.assertIn(
+			"Imported 3 worker(s), skipped 0 existing", out.getvalue()
+		)
+		self.assertIn("rows/s", out.getvalue())
+
+	def test_import_tasks_command_reports_invalid_rows(self) -> None:
+		create_worker(username="alice")
+		create_worker(username="bob")
+		path = self.write("tasks.csv", TASKS_CSV)
+		out, err = StringIO(), StringIO()
+
+		call_command("import_tasks", path, stdout=out, stderr=err)
+
+		self.assertIn(
+			"Imported 2 task(s), skipped 0 existing, 1 invalid",
+			out.getvalue(),
+		)
+		self.assertIn("Row 3", err.getvalue())
+
+	def test_import_command_needs_known_format(self) -> None:
+		path = self.write("tasks.txt", TASKS_CSV)
+
+		with self.assertRaisesMessage(CommandError, "--format"):
+			call_command("import_tasks", path)
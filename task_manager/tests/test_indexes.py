@@ -0,0 +1,128 @@
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.counters import count_rows
+from task_manager.operations import (
+	AddIndexConcurrentlyOnPostgres,
+	AddRawIndexConcurrentlyOnPostgres,
+	AddThroughIndex,
+)
+from task_manager.tests.utils import (
+	create_task,
+	create_task_type,
+	create_worker,
+)
+
+CONCURRENT_INDEX_OPERATIONS = (
+	AddIndexConcurrentlyOnPostgres,
+	AddRawIndexConcurrentlyOnPostgres,
+	AddThroughIndex,
+)
+
+
+def explain(sql: str, params) -> str:
+	"""Return the query plan of a captured query as a single string."""
+	with connection.cursor() as cursor:
+		if connection.vendor == "postgresql":
+			# Tiny test tables would otherwise always be scanned.
+			cursor.execute("SET LOCAL enable_seqscan = off")
+		cursor.execute(
+			f"{connection.ops.explain_query_prefix()} {sql}", params
+		)
+
+		return " ".join(str(row) for row in cursor.fetchall())
+
+
+class IndexUsageTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.worker = create_worker()
+		task_type = create_task_type()
+		for i in range(20):
+			task = create_task(
+				name=f"task{i}",
+				priority=i % 4 + 1,
+				is_completed=i % 3 == 0,
+				task_type=task_type,
+			)
+			task.assignees.add(cls.worker)
+
+	def get_plans(self, url: str, table: str) -> list[str]:
+		"""Fetch the url and return plans of its queries on the table."""
+		self.client.force_login(self.worker)
+		with CaptureQueriesContext(connection) as context:
+			self.client.get(url)
+
+		return [
+			explain(query["sql"], None)
+			for query in context.captured_queries
+			if f'FROM "{table}"' in query["sql"]
+		]
+
+	def assertIndexUsed(self, index_name: str, plans: list[str]) -> None:
+		self.assertTrue(plans)
+		self.assertTrue(
+			any(index_name in plan for plan in plans),
+			f"{index_name} is not used by any of: {plans}",
+		)
+
+	def test_task_list_uses_ordering_index(self) -> None:
+		plans = self.get_plans(
+			reverse("task_manager:task_list"), "task_manager_task"
+		)
+
+		self.assertIndexUsed("task_priority_deadline_idx", plans)
+
+	def test_task_list_next_page_uses_ordering_index(self) -> None:
+		response = self.client.get(reverse("task_manager:task_list"))
+		cursor = response.context["page_obj"].next_cursor
+		plans = self.get_plans(
+			reverse("task_manager:task_list") + f"?cursor={cursor}",
+			"task_manager_task",
+		)
+
+		self.assertIndexUsed("task_priority_deadline_idx", plans)
+
+	def test_worker_detail_uses_assignees_reverse_index(self) -> None:
+		plans = self.get_plans(
+			reverse("task_manager:worker_detail", args=[self.worker.pk]),
+			"task_manager_task",
+		)
+
+		self.assertIndexUsed("task_assignees_worker_idx", plans)
+
+	def test_counter_reconciliation_uses_open_tasks_index(self) -> None:
+		with CaptureQueriesContext(connection) as context:
+			count_rows()
+		plans = [
+			explain(query["sql"], None)
+			for query in context.captured_queries
+			if "is_completed" in query["sql"]
+		]
+
+		self.assertIndexUsed("task_open_deadline_idx", plans)
+
+
+class ConcurrentIndexMigrationsTest(TestCase):
+	def test_non_atomic_migrations_only_add_indexes_concurrently(self) -> None:
+		"""
+		Migrations adding indexes concurrently can't be atomic, so they
+		must hold nothing a failure would leave half applied. Schema
+		changes and backfills go in atomic migrations of their own.
+		"""
+		loader = MigrationLoader(None, ignore_no_migrations=True)
+
+		for (app, name), migration in loader.disk_migrations.items():
+			if app != "task_manager":
+				continue
+			concurrent = [
+				isinstance(operation, CONCURRENT_INDEX_OPERATIONS)
+				for operation in migration.operations
+			]
+			with self.subTest(name):
+				if not migration.atomic:
+					self.assertTrue(all(concurrent))
+				self.assertEqual(migration.atomic, not any(concurrent))
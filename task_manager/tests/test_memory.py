@@ -0,0 +1,164 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from task_manager.memory import MemoryTracer, summarize
+from task_manager.middleware import MEMORY_PROFILE, make_trigger_token
+
+INDEX_DIR = "task_manager.index"
+
+retained = []
+
+
+def allocate() -> None:
+	retained.append([object() for _ in range(10_000)])
+
+
+class MemoryTestCase(TestCase):
+	def setUp(self) -> None:
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		self.directory = Path(directory.name)
+
+	def write_record(self, view: str, name: str, peak: int, lines) -> None:
+		directory = self.directory / view
+		directory.mkdir(exist_ok=True)
+		(directory / f"{name}.json").write_text(
+			json.dumps({"peak": peak, "retained": peak // 2, "lines": lines})
+		)
+
+
+class MemoryTracerTest(MemoryTestCase):
+	def tearDown(self) -> None:
+		retained.clear()
+
+	def test_save_attributes_retained_memory_to_lines(self) -> None:
+		with MemoryTracer() as tracer:
+			allocate()
+
+		path = tracer.save(self.directory, "task_manager:index", 5, 10)
+
+		self.assertEqual(path.parent.name, INDEX_DIR)
+		record = json.loads(path.read_text())
+		self.assertGreaterEqual(record["peak"], record["retained"])
+		self.assertGreater(record["retained"], 10_000 * 16)
+		self.assertTrue(
+			record["lines"][0][0].endswith(
+				f"test_memory.py:{allocate.__code__.co_firstlineno + 1}"
+			)
+		)
+
+	def test_skips_while_another_request_is_traced(self) -> None:
+		with MemoryTracer() as outer, MemoryTracer() as inner:
+			allocate()
+
+		self.assertTrue(outer.traced)
+		self.assertFalse(inner.traced)
+
+	def test_summarize_adds_up_lines(self) -> None:
+		self.write_record(INDEX_DIR, "1", 100, [["a.py:1", 30, 3]])
+		self.write_record(
+			INDEX_DIR, "2", 300, [["a.py:1", 10, 1], ["b.py:2", 20, 2]]
+		)
+
+		report = summarize(sorted((self.directory / INDEX_DIR).glob("*")))
+
+		self.assertEqual(report["requests"], 2)
+		self.assertEqual(report["mean_peak"], 200)
+		self.assertEqual(report["max_peak"], 300)
+		self.assertEqual(report["mean_retained"], 100)
+		self.assertEqual(
+			report["lines"], [["a.py:1", 40, 4, 2], ["b.py:2", 20, 2, 1]]
+		)
+
+
+@modify_settings(
+	MIDDLEWARE={"append": "task_manager.middleware.MemoryProfilerMiddleware"}
+)
+class MemoryProfilerMiddlewareTest(MemoryTestCase):
+	def get_records(self) -> list[Path]:
+		return list((self.directory / INDEX_DIR).glob("*.json"))
+
+	def test_traces_sampled_requests(self) -> None:
+		with override_settings(
+			MEMORY_PROFILER_DIR=self.directory,
+			MEMORY_PROFILER_SAMPLE_EVERY=1,
+		):
+			self.client.get(reverse("task_manager:index"))
+
+		self.assertEqual(len(self.get_records()), 1)
+
+	def test_traces_requests_with_token(self) -> None:
+		with override_settings(MEMORY_PROFILER_DIR=self.directory):
+			self.client.get(
+				reverse("task_manager:index"),
+				headers={
+					"X-Memory-Profile-Token": make_trigger_token(
+						MEMORY_PROFILE
+					)
+				},
+			)
+
+		self.assertEqual(len(self.get_records()), 1)
+
+	def test_skips_other_requests(self) -> None:
+		with override_settings(MEMORY_PROFILER_DIR=self.directory):
+			self.client.get(reverse("task_manager:index"))
+
+		self.assertFalse((self.directory / INDEX_DIR).exists())
+
+
+class MemoryReportCommandTest(MemoryTestCase):
+	def test_report_lists_heaviest_views_first(self) -> None:
+		self.write_record(INDEX_DIR, "1", 2048, [["views.py:52", 1024, 8]])
+		self.write_record(
+			"task_manager.worker_detail",
+			"1",
+			4096,
+			[["views.py:191", 3072, 30], ["views.py:195", 1024, 4]],
+		)
+		out = StringIO()
+
+		call_command(
+			"memory_report",
+			"--dir",
+			str(self.directory),
+			"--limit",
+			1,
+			stdout=out,
+		)
+
+		output = out.getvalue()
+		self.assertTrue(
+			output.startswith(
+				"task_manager.worker_detail: 1 request(s), peak 4.0 KiB mean"
+			)
+		)
+		self.assertIn(f"{INDEX_DIR}: 1 request(s)", output)
+		self.assertIn("views.py:191", output)
+		self.assertNotIn("views.py:195", output)
+
+	def test_report_of_given_views(self) -> None:
+		self.write_record(INDEX_DIR, "1", 2048, [])
+		self.write_record("task_manager.task_list", "1", 2048, [])
+		out = StringIO()
+
+		call_command(
+			"memory_report",
+			"task_manager:index",
+			"--dir",
+			str(self.directory),
+			stdout=out,
+		)
+
+		self.assertIn(INDEX_DIR, out.getvalue())
+		self.assertNotIn("task_list", out.getvalue())
+
+	def test_report_without_profiles(self) -> None:
+		with self.assertRaisesMessage(CommandError, "No memory profiles"):
+			call_command("memory_report", "--dir", str(self.directory))
@@ -0,0 +1,175 @@
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager import metrics
+from task_manager.metrics import MetricsStore, render_metrics
+from task_manager.tests.utils import create_task, create_worker
+
+METRICS_URL = "task_manager:metrics"
+
+
+class MetricsMiddlewareTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.user = create_worker()
+		for i in range(3):
+			create_task(name=f"task{i}")
+
+	def setUp(self) -> None:
+		metrics.store.reset()
+		self.client.force_login(self.user)
+
+	def get_sample(self, metric: str, view: str) -> list:
+		return metrics.store.collect()[(metric, f"task_manager:{view}", "GET")]
+
+	def test_records_latency_queries_templates_and_size(self) -> None:
+		response = self.client.get(reverse("task_manager:task_list"))
+
+		duration = self.get_sample("request_duration_seconds", "task_list")
+		self.assertEqual(duration[0], 1)
+		self.assertGreater(duration[1], 0)
+		self.assertEqual(
+			self.get_sample("request_db_queries", "task_list")[1], 4
+		)
+		self.assertGreater(
+			self.get_sample("request_db_seconds", "task_list")[1], 0
+		)
+		self.assertGreater(
+			self.get_sample("request_template_seconds", "task_list")[1], 0
+		)
+		self.assertEqual(
+			self.get_sample("response_size_bytes", "task_list")[1],
+			len(response.content),
+		)
+
+	def test_records_streaming_responses_once_sent(self) -> None:
+		response = self.client.get(reverse("task_manager:api_task_list"))
+
+		self.assertNotIn(
+			("request_duration_seconds", "task_manager:api_task_list", "GET"),
+			metrics.store.collect(),
+		)
+
+		content = b"".join(response.streaming_content)
+
+		self.assertEqual(
+			self.get_sample("response_size_bytes", "api_task_list")[1],
+			len(content),
+		)
+		self.assertEqual(
+			self.get_sample("request_db_queries", "api_task_list")[1], 3
+		)
+
+
+class MetricsStoreTest(TestCase):
+	def setUp(self) -> None:
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		self.directory = directory.name
+
+	def test_collect_adds_up_every_process(self) -> None:
+		labels = ("task_manager:index", "GET")
+		for name, value in (("1", 0.02), ("2", 0.3)):
+			store = MetricsStore(self.directory, name=name)
+			store.observe("request_duration_seconds", labels, value)
+			store.flush(force=True)
+
+		samples = MetricsStore(self.directory, name="3").collect()
+
+		self.assertEqual(
+			samples[("request_duration_seconds", *labels)][:2], [2, 0.32]
+		)
+
+	def test_flush_waits_for_the_interval(self) -> None:
+		labels = ("task_manager:index", "GET")
+		store = MetricsStore(self.directory, flush_interval=60, name="1")
+		store.observe("request_db_queries", labels, 1)
+		store.flush()
+		store.observe("request_db_queries", labels, 1)
+		store.flush()
+
+		reader = MetricsStore(self.directory, name="2")
+		self.assertEqual(
+			reader.collect()[("request_db_queries", *labels)][0], 1
+		)
+
+	def test_process_with_a_reused_pid_keeps_the_old_snapshot(self) -> None:
+		labels = ("task_manager:index", "GET")
+		for value in (0.02, 0.3):
+			store = MetricsStore(self.directory)
+			store.observe("request_duration_seconds", labels, value)
+			store.flush(force=True)
+
+		self.assertEqual(
+			store.collect()[("request_duration_seconds", *labels)][:2],
+			[2, 0.32],
+		)
+
+	def test_clear_removes_every_snapshot(self) -> None:
+		labels = ("task_manager:index", "GET")
+		store = MetricsStore(self.directory, name="1")
+		store.observe("request_db_queries", labels, 1)
+		store.flush(force=True)
+
+		MetricsStore(self.directory, name="2").clear()
+
+		self.assertEqual(os.listdir(self.directory), [])
+
+	def test_render_cumulative_buckets(self) -> None:
+		store = MetricsStore()
+		labels = ("task_manager:index", "GET")
+		for value in (0.003, 0.2, 20):
+			store.observe("request_duration_seconds", labels, value)
+
+		text = render_metrics(store.collect())
+
+		prefix = (
+			"django_http_request_duration_seconds_bucket"
+			'{view="task_manager:index",method="GET",'
+		)
+		self.assertIn(
+			"# TYPE django_http_request_duration_seconds histogram", text
+		)
+		self.assertIn(f'{prefix}le="0.005"}} 1', text)
+		self.assertIn(f'{prefix}le="0.25"}} 2', text)
+		self.assertIn(f'{prefix}le="10.0"}} 2', text)
+		self.assertIn(f'{prefix}le="+Inf"}} 3', text)
+
+
+class MetricsViewTest(TestCase):
+	def test_metrics_not_accessible_for_anonymous_users(self) -> None:
+		response = self.client.get(reverse(METRICS_URL))
+
+		self.assertEqual(response.status_code, 403)
+
+	@override_settings(METRICS_TOKEN="secret")
+	def test_metrics_accessible_with_token(self) -> None:
+		self.client.get(reverse("task_manager:index"))
+		response = self.client.get(
+			reverse(METRICS_URL), headers={"Authorization": "Bearer secret"}
+		)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+		self.assertContains(
+			response,
+			'django_http_request_duration_seconds_count'
+			'{view="task_manager:index",method="GET"}',
+		)
+
+	@override_settings(METRICS_TOKEN="secret")
+	def test_metrics_not_accessible_with_wrong_token(self) -> None:
+		response = self.client.get(
+			reverse(METRICS_URL), headers={"Authorization": "Bearer wrong"}
+		)
+
+		self.assertEqual(response.status_code, 403)
+
+	def test_metrics_accessible_for_staff(self) -> None:
+		self.client.force_login(create_worker(is_staff=True))
+		response = self.client.get(reverse(METRICS_URL))
+
+		self.assertEqual(response.status_code, 200)
@@ -0,0 +1,206 @@
+import json
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from task_manager import counters, page_cache
+from task_manager.fixture_loader import FixtureLoader
+from task_manager.generators import DataGenerator
+from task_manager.importers import CSV, WorkerImporter, read_records
+from task_manager.models import Counter
+from task_manager.tests.utils import create_task, create_worker
+
+TASK_LIST_URL = reverse("task_manager:task_list")
+WORKER_LIST_URL = reverse("task_manager:worker_list")
+
+
+class AnonymousPageCacheTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.task = create_task(name="task")
+		cls.worker = create_worker()
+
+	def setUp(self) -> None:
+		page_cache.get_cache().clear()
+
+	def get_cache_status(self, url: str) -> str:
+		return self.client.get(url)["X-Page-Cache"]
+
+	def test_serves_repeat_hits_from_cache(self) -> None:
+		response = self.client.get(TASK_LIST_URL)
+
+		self.assertEqual(response["X-Page-Cache"], "miss")
+		self.assertEqual(
+			response["Cache-Control"], "public, max-age=0, s-maxage=600"
+		)
+		self.assertEqual(
+			response["Surrogate-Key"], f"task-list task:{self.task.pk}"
+		)
+		self.assertIn("Cookie", response["Vary"])
+
+		with self.assertNumQueries(0):
+			hit = self.client.get(TASK_LIST_URL)
+
+		self.assertEqual(hit["X-Page-Cache"], "hit")
+		self.assertEqual(hit.content, response.content)
+		self.assertEqual(hit["Surrogate-Key"], response["Surrogate-Key"])
+		self.assertIn("Cookie", hit["Vary"])
+
+	def test_normalizes_the_query(self) -> None:
+		self.client.get(WORKER_LIST_URL, {"sort": "active_tasks", "query": ""})
+		response = self.client.get(
+			WORKER_LIST_URL, {"utm_source": "feed", "sort": "active_tasks"}
+		)
+
+		self.assertEqual(response["X-Page-Cache"], "hit")
+
+	def test_not_cached_for_users_with_session(self) -> None:
+		self.client.force_login(self.worker)
+		self.client.get(TASK_LIST_URL)
+		response = self.client.get(TASK_LIST_URL)
+
+		self.assertNotIn("X-Page-Cache", response)
+		self.assertNotIn("Surrogate-Key", response)
+
+	def test_task_changes_purge_task_pages_only(self) -> None:
+		self.client.get(TASK_LIST_URL)
+		self.client.get(WORKER_LIST_URL)
+
+		self.task.priority = 4
+		self.task.save()
+
+		self.assertEqual(self.get_cache_status(TASK_LIST_URL), "miss")
+		self.assertEqual(self.get_cache_status(WORKER_LIST_URL), "hit")
+
+	def test_new_tasks_purge_the_task_list(self) -> None:
+		self.client.get(TASK_LIST_URL)
+
+		create_task(name="new task")
+
+		self.assertContains(self.client.get(TASK_LIST_URL), "new task")
+
+	def test_logins_do_not_purge_worker_pages(self) -> None:
+		self.client.get(WORKER_LIST_URL)
+
+		self.worker.save(update_fields=["last_login"])
+
+		self.assertEqual(self.get_cache_status(WORKER_LIST_URL), "hit")
+
+	def test_assignments_purge_the_worker_list(self) -> None:
+		self.client.get(WORKER_LIST_URL)
+
+		self.task.assignees.add(self.worker)
+
+		self.assertEqual(self.get_cache_status(WORKER_LIST_URL), "miss")
+
+	@override_settings(PAGE_CACHE_PURGE_URL="http://localhost:6081/")
+	def test_purges_the_proxy_on_commit(self) -> None:
+		with mock.patch("urllib.request.urlopen") as urlopen:
+			with self.captureOnCommitCallbacks(execute=True):
+				page_cache.purge({"task:1", page_cache.TASK_LIST})
+			page_cache._purges.join()
+
+		request = urlopen.call_args.args[0]
+		self.assertEqual(request.get_method(), "PURGE")
+		self.assertEqual(request.full_url, "http://localhost:6081/")
+		self.assertEqual(
+			request.get_header("Surrogate-key"), "task-list task:1"
+		)
+
+	@override_settings(PAGE_CACHE_PURGE_URL="http://localhost:6081/")
+	def test_purges_do_not_wait_for_the_proxy(self) -> None:
+		proxy_called = threading.Event()
+		proxy_answers = threading.Event()
+		keys = []
+
+		def urlopen(request, timeout):
+			keys.append(request.get_header("Surrogate-key"))
+			proxy_called.set()
+			proxy_answers.wait()
+
+			return mock.MagicMock()
+
+		with mock.patch("urllib.request.urlopen", urlopen):
+			for key in ("task:1", "task:2", "task:3"):
+				with self.captureOnCommitCallbacks(execute=True):
+					page_cache.purge({key})
+				# The proxy hangs on the first purge, not the writes.
+				self.assertTrue(proxy_called.wait(timeout=5))
+			proxy_answers.set()
+			page_cache._purges.join()
+
+		# Purges queued while the proxy was busy are sent together.
+		self.assertEqual(keys[0], "task:1")
+		self.assertEqual(" ".join(keys[1:]), "task:2 task:3")
+
+	def test_pages_purged_while_rendering_are_not_cached(self) -> None:
+		request = RequestFactory().get(TASK_LIST_URL)
+		request.page_cache_started = time.time_ns()
+		request.surrogate_keys = {page_cache.TASK_LIST}
+		page_cache.purge({page_cache.TASK_LIST})
+
+		page_cache.set_page(request, HttpResponse("stale"), 600)
+
+		self.assertIsNone(page_cache.get_page(request))
+
+
+class BulkPathsPurgeTest(TestCase):
+	"""Paths skipping signals purge the list pages themselves."""
+
+	def setUp(self) -> None:
+		page_cache.get_cache().clear()
+		self.client.get(TASK_LIST_URL)
+		self.client.get(WORKER_LIST_URL)
+
+	def get_cache_status(self, url: str) -> str:
+		return self.client.get(url)["X-Page-Cache"]
+
+	def assert_purged(self, *urls: str) -> None:
+		for url in urls:
+			self.assertEqual(self.get_cache_status(url), "miss")
+
+	def test_imports(self) -> None:
+		WorkerImporter().run(
+			read_records(StringIO("username\nalice\n"), CSV)
+		)
+
+		self.assert_purged(WORKER_LIST_URL)
+
+	def test_fixture_loads(self) -> None:
+		FixtureLoader().load(
+			StringIO(
+				json.dumps(
+					[
+						{
+							"model": "task_manager.tasktype",
+							"pk": 1,
+							"fields": {"name": "Bug"},
+						}
+					]
+				)
+			)
+		)
+
+		self.assert_purged(TASK_LIST_URL, WORKER_LIST_URL)
+
+	def test_generated_data(self) -> None:
+		DataGenerator(workers=2, tasks=3).generate()
+
+		self.assert_purged(TASK_LIST_URL, WORKER_LIST_URL)
+
+	def test_reconciled_drift(self) -> None:
+		Counter.objects.filter(name=Counter.TOTAL_TASKS).update(value=42)
+
+		counters.reconcile()
+
+		self.assert_purged(TASK_LIST_URL, WORKER_LIST_URL)
+
+	def test_reconcile_without_drift_keeps_the_pages(self) -> None:
+		counters.reconcile()
+
+		self.assertEqual(self.get_cache_status(TASK_LIST_URL), "hit")
@@ -0,0 +1,71 @@
+from django.test import TestCase
+
+from task_manager.models import Task
+from task_manager.pagination import KeysetPaginator
+from task_manager.tests.utils import (
+	create_task,
+	create_task_type,
+	get_actual_deadline,
+)
+
+TASK_ORDERING = ("-priority", "deadline", "id")
+
+
+class KeysetPaginatorTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		task_type = create_task_type()
+		for i in range(7):
+			create_task(
+				name=f"task{i}",
+				priority=i % 3 + 1,
+				deadline=get_actual_deadline(days=i % 2 + 1),
+				task_type=task_type,
+			)
+		cls.expected = list(Task.objects.order_by(*TASK_ORDERING))
+
+	def setUp(self) -> None:
+		self.paginator = KeysetPaginator(
+			Task.objects.all(), 3, TASK_ORDERING
+		)
+
+	def test_first_page(self) -> None:
+		page = self.paginator.page()
+
+		self.assertEqual(page.object_list, self.expected[:3])
+		self.assertTrue(page.has_next())
+		self.assertFalse(page.has_previous())
+
+	def test_walk_forward_covers_every_row_once(self) -> None:
+		page = self.paginator.page()
+		rows = list(page)
+		while page.has_next():
+			page = self.paginator.page(page.next_cursor)
+			rows.extend(page)
+
+		self.assertEqual(rows, self.expected)
+		self.assertFalse(page.has_next())
+		self.assertTrue(page.has_previous())
+
+	def test_walk_backward_returns_previous_page(self) -> None:
+		second = self.paginator.page(self.paginator.page().next_cursor)
+		third = self.paginator.page(second.next_cursor)
+		previous = self.paginator.page(third.previous_cursor)
+
+		self.assertEqual(previous.object_list, second.object_list)
+		self.assertTrue(previous.has_previous())
+		self.assertTrue(previous.has_next())
+
+	def test_seek_query_has_no_offset(self) -> None:
+		cursor = self.paginator.page().next_cursor
+
+		with self.assertNumQueries(1) as context:
+			self.paginator.page(cursor)
+
+		self.assertNotIn("OFFSET", context.captured_queries[0]["sql"])
+
+	def test_tampered_cursor_falls_back_to_first_page(self) -> None:
+		page = self.paginator.page("not-a-valid-cursor")
+
+		self.assertEqual(page.object_list, self.expected[:3])
+		self.assertFalse(page.has_previous())
@@ -0,0 +1,150 @@
+import pstats
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from task_manager.middleware import PROFILE, make_trigger_token
+from task_manager.profiling import RequestProfiler, merge_collapsed, rotate
+from task_manager.tests.utils import create_worker
+
+INDEX_DIR = "task_manager.index"
+
+
+def busy(seconds: float) -> None:
+	deadline = time.perf_counter() + seconds
+	while time.perf_counter() < deadline:
+		pass
+
+
+class ProfilingTestCase(TestCase):
+	def setUp(self) -> None:
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		self.directory = Path(directory.name)
+
+
+class RequestProfilerTest(ProfilingTestCase):
+	def test_save_writes_pstats_and_collapsed_stacks(self) -> None:
+		with RequestProfiler(interval=0.001) as profiler:
+			busy(0.05)
+
+		path = profiler.save(self.directory, "task_manager:index", 10)
+
+		self.assertEqual(path.parent.name, INDEX_DIR)
+		stacks = merge_collapsed([path.with_suffix(".collapsed")])
+		self.assertTrue(
+			any(
+				stack.endswith("task_manager.tests.test_profiling:busy")
+				for stack in stacks
+			)
+		)
+		functions = {
+			name for _, _, name in pstats.Stats(
+				str(path.with_suffix(".pstats"))
+			).stats
+		}
+		self.assertIn("busy", functions)
+
+	def test_rotate_keeps_newest_profiles(self) -> None:
+		for name in ("1", "2", "3"):
+			for suffix in (".pstats", ".collapsed"):
+				(self.directory / f"{name}{suffix}").write_text("")
+
+		rotate(self.directory, 2)
+
+		self.assertEqual(
+			sorted(path.name for path in self.directory.iterdir()),
+			["2.collapsed", "2.pstats", "3.collapsed", "3.pstats"],
+		)
+
+
+@modify_settings(
+	MIDDLEWARE={"append": "task_manager.middleware.ProfilerMiddleware"}
+)
+class ProfilerMiddlewareTest(ProfilingTestCase):
+	def get_profiles(self) -> list[str]:
+		return sorted(
+			path.suffix for path in (self.directory / INDEX_DIR).glob("*")
+		)
+
+	def test_profiles_sampled_requests(self) -> None:
+		with override_settings(
+			PROFILER_DIR=self.directory, PROFILER_SAMPLE_EVERY=1
+		):
+			self.client.get(reverse("task_manager:index"))
+
+		self.assertEqual(self.get_profiles(), [".collapsed", ".pstats"])
+
+	def test_profiles_requests_with_token(self) -> None:
+		with override_settings(PROFILER_DIR=self.directory):
+			self.client.get(
+				reverse("task_manager:index"),
+				headers={"X-Profile-Token": make_trigger_token(PROFILE)},
+			)
+
+		self.assertEqual(self.get_profiles(), [".collapsed", ".pstats"])
+
+	def test_skips_other_requests(self) -> None:
+		with override_settings(PROFILER_DIR=self.directory):
+			self.client.get(
+				reverse("task_manager:index"),
+				headers={"X-Profile-Token": "profile:bad"},
+			)
+
+		self.assertFalse((self.directory / INDEX_DIR).exists())
+
+
+class MergeProfilesCommandTest(ProfilingTestCase):
+	def write_profile(self, view: str, name: str, stacks: str) -> None:
+		with RequestProfiler(interval=1) as profiler:
+			create_worker(username=f"{view}{name}")
+		directory = self.directory / view
+		directory.mkdir(exist_ok=True)
+		profiler.profile.dump_stats(directory / f"{name}.pstats")
+		(directory / f"{name}.collapsed").write_text(stacks)
+
+	def test_merge_profiles(self) -> None:
+		self.write_profile(INDEX_DIR, "1", "main;view 2\nmain;render 1\n")
+		self.write_profile(INDEX_DIR, "2", "main;view 3\n")
+		self.write_profile("task_manager.task_list", "1", "main;list 5\n")
+		out = StringIO()
+		output = self.directory / "merged.pstats"
+
+		call_command(
+			"merge_profiles",
+			"task_manager:index",
+			"--dir",
+			str(self.directory),
+			"--pstats",
+			str(output),
+			stdout=out,
+			stderr=StringIO(),
+		)
+
+		self.assertEqual(out.getvalue(), "main;render 1\nmain;view 5\n")
+		self.assertTrue(pstats.Stats(str(output)).total_calls)
+
+	def test_merge_profiles_of_every_view(self) -> None:
+		self.write_profile(INDEX_DIR, "1", "main;view 2\n")
+		self.write_profile("task_manager.task_list", "1", "main;list 5\n")
+		output = self.directory / "merged.collapsed"
+
+		call_command(
+			"merge_profiles",
+			"--dir",
+			str(self.directory),
+			"-o",
+			str(output),
+			stderr=StringIO(),
+		)
+
+		self.assertEqual(output.read_text(), "main;list 5\nmain;view 2\n")
+
+	def test_merge_profiles_without_profiles(self) -> None:
+		with self.assertRaisesMessage(CommandError, "No profiles found"):
+			call_command("merge_profiles", "--dir", str(self.directory))
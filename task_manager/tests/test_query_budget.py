@@ -0,0 +1,315 @@
+import logging
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from task_manager import urls, views
+from task_manager.middleware import NPlusOneMiddleware
+from task_manager.models import Task
+from task_manager.query_budget import (
+	QueryBudgetExceeded,
+	get_query_budget,
+	get_query_shape,
+)
+from task_manager.tests.utils import (
+	create_position,
+	create_task,
+	create_worker,
+	get_actual_deadline,
+)
+
+LOGGER = "task_manager.queries"
+
+
+class QueryBudgetTest(TestCase):
+	"""
+	Requests every view against rows with relations, so that a relation
+	read lazily per row pushes the view over its ``query_budget``. The
+	cache is cleared first, since budgets count the session and user
+	reads of cold requests.
+	"""
+
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.position = position = create_position()
+		cls.workers = [
+			create_worker(username=f"worker{i}", position=position)
+			for i in range(5)
+		]
+		cls.superuser = create_worker(
+			username="admin", is_superuser=True, is_staff=True
+		)
+		cls.tasks = [create_task(name=f"task{i}") for i in range(15)]
+		for task in cls.tasks:
+			task.assignees.add(*cls.workers)
+
+	def get_requests(self) -> list[tuple]:
+		"""Return (url name, user, method, url args, data) of each request."""
+		worker, task = self.workers[0], self.tasks[0]
+		task_data = {
+			"name": "new task",
+			"description": "test",
+			"deadline": get_actual_deadline(),
+			"priority": 2,
+			"task_type": task.task_type_id,
+			"assignees": [w.pk for w in self.workers],
+		}
+		worker_data = {
+			"first_name": "First name",
+			"last_name": "Last name",
+			"email": "worker@example.com",
+		}
+
+		return [
+			("index", None, "get", [], {}),
+			("index", worker, "get", [], {}),
+			("worker_list", worker, "get", [], {}),
+			("worker_create", None, "get", [], {}),
+			(
+				"worker_create",
+				None,
+				"post",
+				[],
+				{
+					**worker_data,
+					"username": "new-worker",
+					"position": self.position.pk,
+					"password1": "Str0ng-password",
+					"password2": "Str0ng-password",
+				},
+			),
+			("worker_typeahead", worker, "get", [], {"query": "worker"}),
+			("worker_detail", worker, "get", [worker.pk], {}),
+			("worker_update", worker, "get", [worker.pk], {}),
+			(
+				"worker_update",
+				worker,
+				"post",
+				[worker.pk],
+				{**worker_data, "username": worker.username},
+			),
+			("worker_delete", self.superuser, "get", [worker.pk], {}),
+			("task_list", worker, "get", [], {}),
+			("task_list", worker, "get", [], {"query": "task"}),
+			("task_list", worker, "get", [], {"page": 2}),
+			("task_create", worker, "get", [], {}),
+			("task_create", worker, "post", [], task_data),
+			(
+				"task_bulk",
+				worker,
+				"post",
+				[],
+				{"action": "complete", "tasks": [t.pk for t in self.tasks]},
+			),
+			("task_detail", worker, "get", [task.pk], {}),
+			("task_update", worker, "get", [task.pk], {}),
+			(
+				"task_update",
+				worker,
+				"post",
+				[task.pk],
+				{**task_data, "name": task.name},
+			),
+			(
+				"task_update",
+				worker,
+				"post",
+				[task.pk],
+				{**task_data, "name": task.name, "assignees": [worker.pk]},
+			),
+			(
+				"task_update",
+				worker,
+				"post",
+				[task.pk],
+				{**task_data, "name": "renamed task"},
+			),
+			# Completes the task and replaces its assignees, the most
+			# counters a task update changes.
+			(
+				"task_update",
+				worker,
+				"post",
+				[task.pk],
+				{
+					**task_data,
+					"name": "renamed task",
+					"is_completed": True,
+					"assignees": [worker.pk, self.superuser.pk],
+				},
+			),
+			("task_delete", worker, "get", [task.pk], {}),
+			("api_task_list", worker, "get", [], {}),
+			("api_worker_list", worker, "get", [], {}),
+			("api_position_list", worker, "get", [], {}),
+			("api_task_type_list", worker, "get", [], {}),
+			("fragment_cache_stats", self.superuser, "get", [], {}),
+			("metrics", self.superuser, "get", [], {}),
+			("task_delete", worker, "post", [task.pk], {}),
+			# Renames the worker and changes their password, which logs
+			# them in again, the most a worker update writes.
+			(
+				"worker_update",
+				worker,
+				"post",
+				[worker.pk],
+				{
+					**worker_data,
+					"username": "renamed-worker",
+					"password": "N3w-password",
+				},
+			),
+			("worker_delete", self.superuser, "post", [worker.pk], {}),
+		]
+
+	def test_every_view_has_a_budget(self) -> None:
+		requested = {
+			name: method.upper() for name, _, method, *_ in self.get_requests()
+		}
+
+		for pattern in urls.urlpatterns:
+			with self.subTest(pattern.name):
+				self.assertIn(pattern.name, requested)
+				self.assertIsNotNone(
+					get_query_budget(pattern.callback, requested[pattern.name])
+				)
+
+	def test_budgets_are_enforced_under_the_test_runner(self) -> None:
+		self.assertTrue(settings.TESTING)
+
+	def test_views_stay_within_budget(self) -> None:
+		for name, user, method, args, data in self.get_requests():
+			url = reverse(f"task_manager:{name}", args=args)
+			budget = get_query_budget(resolve(url).func, method.upper())
+			self.client.logout()
+			if user:
+				self.client.force_login(user)
+			cache.clear()
+
+			with (
+				self.subTest(name, method=method),
+				CaptureQueriesContext(connection) as context,
+			):
+				response = getattr(self.client, method)(url, data)
+				if response.streaming:
+					b"".join(response.streaming_content)
+
+				self.assertLess(response.status_code, 400)
+				self.assertLessEqual(
+					len(context),
+					budget,
+					"\n".join(query["sql"] for query in context),
+				)
+
+
+@override_settings(NPLUSONE_SAMPLE_RATE=1.0, NPLUSONE_THRESHOLD=3)
+class NPlusOneMiddlewareTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		for i in range(3):
+			create_task(name=f"task{i}")
+
+	def setUp(self) -> None:
+		cache.clear()
+
+	def get_response(self, view) -> HttpResponse:
+		middleware = NPlusOneMiddleware(view)
+
+		return middleware(RequestFactory().get("/tasks/"))
+
+	def test_query_shape_ignores_in_list_length(self) -> None:
+		self.assertEqual(
+			get_query_shape('WHERE "id" IN (%s, %s, %s)'),
+			get_query_shape('WHERE "id" IN (%s, %s)'),
+		)
+
+	def test_logs_queries_repeated_in_code(self) -> None:
+		def view(request) -> HttpResponse:
+			for task in Task.objects.all():
+				str(task.task_type)
+
+			return HttpResponse()
+
+		with self.assertLogs(LOGGER, logging.WARNING) as logs:
+			self.get_response(view)
+
+		self.assertEqual(len(logs.output), 1)
+		self.assertIn("GET /tasks/ ran the same query 3 times", logs.output[0])
+		self.assertIn("test_query_budget.py", logs.output[0])
+
+	def test_logs_template_line_of_repeated_queries(self) -> None:
+		template = Template(
+			"{% for task in tasks %}\n{{ task.task_type }}\n{% endfor %}"
+		)
+
+		def view(request) -> HttpResponse:
+			return HttpResponse(
+				template.render(Context({"tasks": Task.objects.all()}))
+			)
+
+		with self.assertLogs(LOGGER, logging.WARNING) as logs:
+			self.get_response(view)
+
+		self.assertIn("at <unknown source>:2", logs.output[0])
+
+	@override_settings(TESTING=False)
+	def test_logs_requests_over_budget(self) -> None:
+		with (
+			mock.patch.object(views.index, "query_budget", 0),
+			self.assertLogs(LOGGER, logging.WARNING) as logs,
+		):
+			self.client.get(reverse("task_manager:index"))
+
+		self.assertEqual(
+			logs.output,
+			[f"WARNING:{LOGGER}:GET / ran 1 queries, over its budget of 0."],
+		)
+
+	@override_settings(TESTING=True)
+	def test_requests_over_budget_fail_tests(self) -> None:
+		with (
+			mock.patch.object(views.index, "query_budget", 0),
+			self.assertRaisesMessage(
+				QueryBudgetExceeded,
+				"GET / ran 1 queries, over its budget of 0.",
+			),
+		):
+			self.client.get(reverse("task_manager:index"))
+
+	def test_budgets_may_differ_by_method(self) -> None:
+		view = views.TaskUpdateView.as_view()
+
+		self.assertLess(
+			get_query_budget(view, "GET"), get_query_budget(view, "POST")
+		)
+		self.assertIsNone(get_query_budget(view, "PUT"))
+
+	async def test_logs_queries_repeated_in_async_code(self) -> None:
+		async def view(request) -> HttpResponse:
+			for i in range(3):
+				await Task.objects.filter(name=f"task{i}").aexists()
+
+			return HttpResponse()
+
+		with self.assertLogs(LOGGER, logging.WARNING) as logs:
+			await NPlusOneMiddleware(view)(RequestFactory().get("/tasks/"))
+
+		self.assertIn("GET /tasks/ ran the same query 3 times", logs.output[0])
+
+	@override_settings(NPLUSONE_SAMPLE_RATE=0.0)
+	def test_unsampled_requests_are_not_recorded(self) -> None:
+		def view(request) -> HttpResponse:
+			for task in Task.objects.all():
+				str(task.task_type)
+
+			return HttpResponse()
+
+		with self.assertNoLogs(LOGGER):
+			self.get_response(view)
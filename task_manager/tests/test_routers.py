@@ -0,0 +1,93 @@
+from django.db import router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from task_manager.middleware import ReplicaStickinessMiddleware
+from task_manager.models import Task
+from task_manager.routers import use_primary
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(SimpleTestCase):
+	def test_reads_go_to_replicas(self) -> None:
+		self.assertEqual(router.db_for_read(Task), "replica")
+
+	def test_writes_go_to_the_primary(self) -> None:
+		task = Task(name="task")
+		task._state.db = "replica"
+
+		self.assertEqual(router.db_for_write(Task, instance=task), "default")
+
+	def test_reads_go_to_the_primary_when_asked(self) -> None:
+		with use_primary():
+			self.assertEqual(router.db_for_read(Task), "default")
+
+		self.assertEqual(router.db_for_read(Task), "replica")
+
+	def test_objects_of_other_databases_stay_there(self) -> None:
+		task = Task(name="task")
+		task._state.db = "benchmark"
+
+		self.assertEqual(router.db_for_read(Task, instance=task), "benchmark")
+		self.assertEqual(router.db_for_write(Task, instance=task), "benchmark")
+
+	def test_no_migrations_on_replicas(self) -> None:
+		self.assertFalse(router.allow_migrate("replica", "task_manager"))
+		self.assertTrue(router.allow_migrate("default", "task_manager"))
+
+	@override_settings(DATABASE_REPLICAS=[])
+	def test_reads_go_to_the_primary_without_replicas(self) -> None:
+		self.assertEqual(router.db_for_read(Task), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaStickinessMiddlewareTest(SimpleTestCase):
+	def setUp(self) -> None:
+		self.factory = RequestFactory()
+		self.databases_read = []
+
+	def get_response(self, request) -> HttpResponse:
+		self.databases_read.append(router.db_for_read(Task))
+
+		return HttpResponse()
+
+	def process(self, request) -> HttpResponse:
+		return ReplicaStickinessMiddleware(self.get_response)(request)
+
+	def test_post_reads_the_primary_and_sticks(self) -> None:
+		response = self.process(self.factory.post("/tasks/create/"))
+
+		self.assertEqual(self.databases_read, ["default"])
+		cookie = response.cookies["use_primary"]
+		self.assertEqual(cookie["max-age"], 10)
+		self.assertTrue(cookie["httponly"])
+
+	def test_reads_stick_to_the_primary_with_cookie(self) -> None:
+		self.factory.cookies["use_primary"] = "1"
+		response = self.process(self.factory.get("/tasks/"))
+
+		self.assertEqual(self.databases_read, ["default"])
+		self.assertNotIn("use_primary", response.cookies)
+
+	def test_reads_go_to_replicas_otherwise(self) -> None:
+		response = self.process(self.factory.get("/tasks/"))
+
+		self.assertEqual(self.databases_read, ["replica"])
+		self.assertNotIn("use_primary", response.cookies)
+
+	@override_settings(REPLICA_STICKY_SECONDS=30)
+	def test_sticky_window_is_configurable(self) -> None:
+		response = self.process(self.factory.post("/tasks/create/"))
+
+		self.assertEqual(response.cookies["use_primary"]["max-age"], 30)
+
+	def test_streaming_responses_read_the_primary(self) -> None:
+		def stream():
+			yield router.db_for_read(Task).encode()
+
+		self.factory.cookies["use_primary"] = "1"
+		response = ReplicaStickinessMiddleware(
+			lambda request: StreamingHttpResponse(stream())
+		)(self.factory.get("/api/tasks/"))
+
+		self.assertEqual(b"".join(response.streaming_content), b"default")
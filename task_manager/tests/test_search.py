@@ -0,0 +1,143 @@
+from django.test import TestCase
+
+from task_manager.models import Task, Worker
+from task_manager.search import (
+	TaskFullTextSearchBackend,
+	WorkerTrigramSearchBackend,
+	to_fts5_query,
+)
+from task_manager.tests.utils import (
+	create_task,
+	create_task_type,
+	create_worker,
+)
+
+
+class TaskFullTextSearchBackendTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		task_type = create_task_type()
+		cls.in_description = create_task(
+			name="Cleanup",
+			description="Remove the deprecated login page",
+			task_type=task_type,
+		)
+		cls.in_name = create_task(
+			name="Login redesign",
+			description="New layout",
+			task_type=task_type,
+		)
+		cls.unrelated = create_task(
+			name="Billing", description="Invoices", task_type=task_type,
+		)
+		cls.backend = TaskFullTextSearchBackend()
+
+	def search(self, query: str) -> list[Task]:
+		return list(
+			self.backend.search(Task.objects.all(), query).order_by(
+				*self.backend.rank_ordering, "id"
+			)
+		)
+
+	def test_name_matches_rank_above_description_matches(self) -> None:
+		self.assertEqual(
+			self.search("login"), [self.in_name, self.in_description]
+		)
+
+	def test_matches_word_prefixes(self) -> None:
+		self.assertEqual(self.search("invoic"), [self.unrelated])
+
+	def test_match_runs_once_per_query(self) -> None:
+		queryset = self.backend.search(Task.objects.all(), "login")
+
+		self.assertEqual(str(queryset.query).count(" MATCH "), 1)
+
+	def test_rank_orders_values(self) -> None:
+		queryset = self.backend.search(Task.objects.all(), "login")
+
+		self.assertEqual(
+			list(
+				queryset.order_by(*self.backend.rank_ordering).values_list(
+					"name", flat=True
+				)
+			),
+			[self.in_name.name, self.in_description.name],
+		)
+
+	def test_rank_orders_unions(self) -> None:
+		logins = self.backend.search(Task.objects.all(), "login")
+		invoices = self.backend.search(Task.objects.all(), "invoices")
+
+		rows = [
+			*logins.values_list("name", "search_rank"),
+			*invoices.values_list("name", "search_rank"),
+		]
+		union = (
+			logins.values_list("name", "search_rank")
+			.order_by()
+			.union(invoices.values_list("name", "search_rank").order_by())
+		)
+
+		self.assertEqual(
+			list(union.order_by("-search_rank")),
+			sorted(rows, key=lambda row: row[1], reverse=True),
+		)
+
+	def test_index_follows_updates_and_deletes(self) -> None:
+		self.unrelated.name = "Login audit"
+		self.unrelated.save()
+
+		self.assertIn(self.unrelated, self.search("login"))
+
+		self.in_name.delete()
+
+		self.assertEqual(
+			self.search("login"), [self.unrelated, self.in_description]
+		)
+
+	def test_query_syntax_is_escaped(self) -> None:
+		self.assertEqual(self.search('login" OR NOT ('), [])
+
+
+class WorkerTrigramSearchBackendTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.john = create_worker(
+			username="jdoe", first_name="John", last_name="Doe"
+		)
+		cls.alice = create_worker(
+			username="alice", first_name="Alice", last_name="Johnson"
+		)
+		cls.backend = WorkerTrigramSearchBackend()
+
+	def search(self, query: str) -> set[Worker]:
+		return set(self.backend.search(Worker.objects.all(), query))
+
+	def test_matches_substrings_of_any_name_field(self) -> None:
+		self.assertEqual(self.search("ohn"), {self.john, self.alice})
+		self.assertEqual(self.search("lic"), {self.alice})
+
+	def test_every_word_must_match(self) -> None:
+		self.assertEqual(self.search("john doe"), {self.john})
+
+	def test_short_words_fall_back_to_substring_scan(self) -> None:
+		self.assertEqual(self.search("jd"), {self.john})
+
+	def test_index_follows_renames(self) -> None:
+		self.alice.last_name = "Smith"
+		self.alice.save()
+
+		self.assertEqual(self.search("john"), {self.john})
+
+
+class ToFts5QueryTest(TestCase):
+	def test_quotes_words_as_prefix_phrases(self) -> None:
+		self.assertEqual(to_fts5_query('fix "login"'), '"fix"* "login"*')
+
+	def test_quotes_words_without_prefix(self) -> None:
+		self.assertEqual(
+			to_fts5_query("fix login", prefix=False), '"fix" "login"'
+		)
+
+	def test_empty_query(self) -> None:
+		self.assertEqual(to_fts5_query("  "), '""')
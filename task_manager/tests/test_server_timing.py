@@ -0,0 +1,119 @@
+import re
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.middleware import (
+	SERVER_TIMING,
+	is_trigger_token,
+	make_trigger_token,
+)
+from task_manager.tests.utils import create_task, create_worker
+
+TASK_DETAIL_URL = "task_manager:task_detail"
+
+
+class ServerTimingMiddlewareTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.staff = create_worker(username="staff", is_staff=True)
+		cls.user = create_worker(username="user")
+		cls.task = create_task()
+
+	def get(self, **headers):
+		return self.client.get(
+			reverse(TASK_DETAIL_URL, args=[self.task.pk]), headers=headers
+		)
+
+	def test_header_for_staff(self) -> None:
+		self.client.force_login(self.staff)
+		response = self.get()
+
+		self.assertRegex(
+			response["Server-Timing"],
+			r'^db;dur=[\d.]+;desc="5 queries", tmpl;dur=[\d.]+, '
+			r"view;dur=[\d.]+, total;dur=[\d.]+$",
+		)
+
+	def test_durations_add_up(self) -> None:
+		self.client.force_login(self.staff)
+		response = self.get()
+		durations = dict(
+			re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"])
+		)
+
+		self.assertLessEqual(
+			float(durations["view"]) + float(durations["tmpl"]),
+			float(durations["total"]),
+		)
+		self.assertGreater(float(durations["tmpl"]), 0)
+
+	def test_no_header_for_other_users(self) -> None:
+		self.client.force_login(self.user)
+
+		self.assertNotIn("Server-Timing", self.get())
+
+	def test_header_with_token(self) -> None:
+		self.client.force_login(self.user)
+		response = self.get(
+			**{"X-Server-Timing-Token": make_trigger_token(SERVER_TIMING)}
+		)
+
+		self.assertIn("Server-Timing", response)
+
+	def test_no_header_with_bad_token(self) -> None:
+		response = self.get(**{"X-Server-Timing-Token": "server-timing:x:y"})
+
+		self.assertNotIn("Server-Timing", response)
+
+	def test_token_expires(self) -> None:
+		token = make_trigger_token(SERVER_TIMING)
+
+		with mock.patch("time.time", return_value=10 ** 10):
+			self.assertFalse(is_trigger_token(token, SERVER_TIMING, 60))
+
+	@override_settings(SERVER_TIMING_ALLOW=["token"])
+	def test_staff_can_be_excluded(self) -> None:
+		self.client.force_login(self.staff)
+
+		self.assertNotIn("Server-Timing", self.get())
+
+	@override_settings(SERVER_TIMING_ALLOW=[])
+	def test_disabled(self) -> None:
+		response = self.get(
+			**{"X-Server-Timing-Token": make_trigger_token(SERVER_TIMING)}
+		)
+
+		self.assertNotIn("Server-Timing", response)
+
+	def test_works_without_metrics_middleware(self) -> None:
+		self.client.force_login(self.staff)
+		middleware = [
+			name for name in settings.MIDDLEWARE
+			if name != "task_manager.middleware.MetricsMiddleware"
+		]
+
+		for allow in (["staff"], []):
+			with (
+				self.subTest(allow=allow),
+				self.settings(
+					MIDDLEWARE=middleware, SERVER_TIMING_ALLOW=allow
+				),
+			):
+				response = self.get()
+
+				self.assertEqual(response.status_code, 200)
+				self.assertEqual("Server-Timing" in response, bool(allow))
+
+	def test_trigger_token_command(self) -> None:
+		out = StringIO()
+		call_command(
+			"trigger_token", SERVER_TIMING, stdout=out, stderr=StringIO()
+		)
+		token = out.getvalue().strip()
+
+		self.assertTrue(is_trigger_token(token, SERVER_TIMING, 60))
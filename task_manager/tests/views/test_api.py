@@ -0,0 +1,171 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.api import TaskApiListView
+from task_manager.tests.utils import (
+	create_position,
+	create_task,
+	create_task_type,
+	create_worker,
+)
+
+API_TASK_LIST_URL = "task_manager:api_task_list"
+API_WORKER_LIST_URL = "task_manager:api_worker_list"
+API_POSITION_LIST_URL = "task_manager:api_position_list"
+API_TASK_TYPE_LIST_URL = "task_manager:api_task_type_list"
+
+
+def get_json(response) -> dict:
+	return json.loads(b"".join(response.streaming_content))
+
+
+class TaskApiListViewTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.user = create_worker(username="assigned_user")
+		cls.other_user = create_worker(username="other_user")
+		cls.superuser = create_worker(username="admin", is_superuser=True)
+		cls.tasks = [
+			create_task(name=f"task{i}", priority=i % 4 + 1) for i in range(5)
+		]
+		cls.tasks[0].assignees.add(cls.user, cls.other_user)
+		cls.tasks[1].assignees.add(cls.user)
+
+	def test_api_login_required(self) -> None:
+		response = self.client.get(reverse(API_TASK_LIST_URL))
+
+		self.assertEqual(response.status_code, 403)
+
+	def test_api_streams_tasks(self) -> None:
+		self.client.force_login(self.user)
+		response = self.client.get(reverse(API_TASK_LIST_URL))
+
+		self.assertTrue(response.streaming)
+		self.assertEqual(response["Content-Type"], "application/json")
+
+		data = get_json(response)
+		task = next(row for row in data["results"] if row["name"] == "task0")
+
+		self.assertEqual(len(data["results"]), 5)
+		self.assertIsNone(data["next"])
+		self.assertEqual(
+			task,
+			{
+				"id": self.tasks[0].pk,
+				"name": "task0",
+				"description": "test-description",
+				"created_at": self.tasks[0].created_at.isoformat(),
+				"deadline": self.tasks[0].deadline.isoformat(),
+				"is_completed": False,
+				"priority": 1,
+				"task_type": self.tasks[0].task_type_id,
+				"task_type_name": "task0",
+				"editable": True,
+				"assignees": sorted([self.user.pk, self.other_user.pk]),
+			},
+		)
+
+	def test_api_marks_tasks_editable_like_update_view(self) -> None:
+		self.client.force_login(self.user)
+		data = get_json(self.client.get(reverse(API_TASK_LIST_URL)))
+
+		self.assertEqual(
+			{row["name"] for row in data["results"] if row["editable"]},
+			{"task0", "task1"},
+		)
+
+		self.client.force_login(self.superuser)
+		data = get_json(self.client.get(reverse(API_TASK_LIST_URL)))
+
+		self.assertTrue(all(row["editable"] for row in data["results"]))
+
+	def test_api_editable_filter(self) -> None:
+		self.client.force_login(self.user)
+		data = get_json(
+			self.client.get(reverse(API_TASK_LIST_URL), {"editable": "1"})
+		)
+
+		self.assertEqual(
+			[row["name"] for row in data["results"]], ["task1", "task0"]
+		)
+
+	def test_api_cursor_pagination(self) -> None:
+		self.client.force_login(self.user)
+		names = []
+		cursor = None
+
+		while True:
+			params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+			data = get_json(
+				self.client.get(reverse(API_TASK_LIST_URL), params)
+			)
+			names += [row["name"] for row in data["results"]]
+			if not (cursor := data["next"]):
+				break
+
+		self.assertEqual(
+			names, ["task3", "task2", "task1", "task0", "task4"]
+		)
+
+	def test_api_query_count_does_not_grow_with_page_size(self) -> None:
+		self.client.force_login(self.user)
+
+		# User, rows and one assignee query per chunk; the session is
+		# read from the cache.
+		with self.assertNumQueries(3):
+			get_json(self.client.get(reverse(API_TASK_LIST_URL)))
+
+	def test_api_fetches_assignees_per_chunk(self) -> None:
+		self.client.force_login(self.user)
+		chunk_size = TaskApiListView.chunk_size
+		TaskApiListView.chunk_size = 2
+		self.addCleanup(setattr, TaskApiListView, "chunk_size", chunk_size)
+
+		with self.assertNumQueries(5):
+			data = get_json(self.client.get(reverse(API_TASK_LIST_URL)))
+
+		self.assertEqual(len(data["results"]), 5)
+
+
+class WorkerApiListViewTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		position = create_position()
+		cls.user = create_worker(username="bob", position=position)
+		create_worker(username="alice")
+
+	def test_api_worker_list(self) -> None:
+		self.client.force_login(self.user)
+		data = get_json(self.client.get(reverse(API_WORKER_LIST_URL)))
+
+		self.assertEqual(
+			[row["username"] for row in data["results"]], ["alice", "bob"]
+		)
+		self.assertEqual(data["results"][1]["position_name"], "Developer")
+		self.assertNotIn("password", data["results"][0])
+
+
+class CatalogApiListViewTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.user = create_worker()
+		create_position(name="Manager")
+		create_task_type(name="Feature")
+
+	def test_api_position_list(self) -> None:
+		self.client.force_login(self.user)
+		data = get_json(self.client.get(reverse(API_POSITION_LIST_URL)))
+
+		self.assertEqual(
+			[row["name"] for row in data["results"]], ["Manager"]
+		)
+
+	def test_api_task_type_list(self) -> None:
+		self.client.force_login(self.user)
+		data = get_json(self.client.get(reverse(API_TASK_TYPE_LIST_URL)))
+
+		self.assertEqual(
+			[row["name"] for row in data["results"]], ["Feature"]
+		)
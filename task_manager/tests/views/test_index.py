@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 
+from task_manager import page_cache
 from task_manager.tests.utils import create_task, create_worker
 
 INDEX_URL = reverse('task_manager:index')
@@ -13,6 +14,9 @@ class IndexViewTest(TestCase):
 		create_task(name="Task 2", is_completed=True)
 		create_worker()
 
+	def setUp(self) -> None:
+		page_cache.get_cache().clear()
+
 	def test_index_view_is_accessible(self) -> None:
 		response = self.client.get(INDEX_URL)
 
@@ -25,3 +29,7 @@ class IndexViewTest(TestCase):
 		self.assertEqual(response.context["total_tasks"], 2)
 		self.assertEqual(response.context["active_tasks"], 1)
 		self.assertEqual(response.context["total_users"], 1)
+
+	def test_index_view_reads_counters_in_one_query(self) -> None:
+		with self.assertNumQueries(1):
+			self.client.get(INDEX_URL)
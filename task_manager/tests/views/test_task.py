@@ -4,7 +4,9 @@ from django.conf.global_settings import LOGIN_URL
 from django.test import TestCase
 from django.urls import reverse
 
-from task_manager.models import Task
+from task_manager import fragment_cache, page_cache
+from task_manager.counters import get_counters
+from task_manager.models import Counter, Task
 from task_manager.tests.utils import (
 	create_task,
 	create_task_type,
@@ -17,6 +19,7 @@ TASK_CREATE_URL = "task_manager:task_create"
 TASK_DETAIL_URL = "task_manager:task_detail"
 TASK_UPDATE_URL = "task_manager:task_update"
 TASK_DELETE_URL = "task_manager:task_delete"
+TASK_BULK_URL = "task_manager:task_bulk"
 
 
 class TaskListViewTest(TestCase):
@@ -25,6 +28,9 @@ class TaskListViewTest(TestCase):
 		cls.task1 = create_task(name="Bug")
 		cls.task2 = create_task(name="Fix")
 
+	def setUp(self) -> None:
+		page_cache.get_cache().clear()
+
 	def test_task_list_view_is_accessible(self) -> None:
 		response = self.client.get(reverse(TASK_LIST_URL))
 
@@ -54,6 +60,40 @@ class TaskListViewTest(TestCase):
 			len(response.context["task_list"]), 2
 		)
 
+	def test_task_list_view_cursor_pagination(self) -> None:
+		for i in range(10):
+			create_task(name=f"test_task{i}")
+		response = self.client.get(reverse(TASK_LIST_URL))
+		page_obj = response.context["page_obj"]
+
+		self.assertTrue(page_obj.has_next())
+		self.assertFalse(page_obj.has_previous())
+
+		response = self.client.get(
+			reverse(TASK_LIST_URL), {"cursor": page_obj.next_cursor}
+		)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response.context["is_paginated"])
+		self.assertEqual(len(response.context["task_list"]), 2)
+		self.assertTrue(response.context["page_obj"].has_previous())
+
+	def test_task_list_view_cursor_pagination_keeps_search_query(self) -> None:
+		for i in range(12):
+			create_task(name=f"test_task{i}")
+		response = self.client.get(
+			reverse(TASK_LIST_URL), {"query": "test_task"}
+		)
+		cursor = response.context["page_obj"].next_cursor
+
+		self.assertContains(response, "query=test_task&amp;cursor=")
+
+		response = self.client.get(
+			reverse(TASK_LIST_URL), {"query": "test_task", "cursor": cursor}
+		)
+
+		self.assertEqual(len(response.context["task_list"]), 2)
+
 	def test_task_list_view_search_results(self) -> None:
 		response = self.client.get(
 			reverse(TASK_LIST_URL) + f"?query={self.task1.name}"
@@ -63,6 +103,12 @@ class TaskListViewTest(TestCase):
 		self.assertContains(response, self.task1.name)
 		self.assertNotContains(response, self.task2.name)
 
+	def test_task_list_view_searches_description(self) -> None:
+		task = create_task(name="Deploy", description="Rotate the keys")
+		response = self.client.get(reverse(TASK_LIST_URL) + "?query=keys")
+
+		self.assertEqual(list(response.context["task_list"]), [task])
+
 	def test_task_list_view_search_form_in_context(self) -> None:
 		response = self.client.get(
 			reverse(TASK_LIST_URL) + f"?query={self.task1.name}"
@@ -93,6 +139,19 @@ class TaskListViewTest(TestCase):
 
 		self.assertEqual(response.context["today"], date.today())
 
+	def test_task_list_view_links_editing_of_editable_tasks(self) -> None:
+		user = create_worker()
+		self.task1.assignees.add(user)
+		self.client.force_login(user)
+		response = self.client.get(reverse(TASK_LIST_URL))
+
+		self.assertContains(
+			response, reverse(TASK_UPDATE_URL, args=[self.task1.pk])
+		)
+		self.assertNotContains(
+			response, reverse(TASK_UPDATE_URL, args=[self.task2.pk])
+		)
+
 
 class TaskCreateViewTest(TestCase):
 	@classmethod
@@ -350,3 +409,163 @@ class TaskDeleteViewTest(TestCase):
 
 		self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
 		self.assertRedirects(response, reverse(TASK_LIST_URL))
+
+
+class TaskBulkActionViewTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		cls.superuser = create_worker(username="admin", is_superuser=True)
+		cls.user = create_worker(username="assigned_user")
+		cls.other_user = create_worker(username="other_user")
+		cls.tasks = [create_task(name=f"task{i}") for i in range(3)]
+		for task in cls.tasks[:2]:
+			task.assignees.add(cls.user)
+		cls.task_type = create_task_type(name="Refactoring")
+
+	def post(self, user, action: str, tasks, **data):
+		self.client.force_login(user)
+
+		return self.client.post(
+			reverse(TASK_BULK_URL),
+			{"action": action, "tasks": [task.pk for task in tasks], **data},
+		)
+
+	def test_task_bulk_action_login_required(self) -> None:
+		response = self.client.post(
+			reverse(TASK_BULK_URL),
+			{"action": "complete", "tasks": [self.tasks[0].pk]},
+		)
+
+		self.assertEqual(response.status_code, 302)
+		self.assertTrue(response.url.startswith(LOGIN_URL))
+		self.tasks[0].refresh_from_db()
+		self.assertFalse(self.tasks[0].is_completed)
+
+	def test_task_bulk_action_get_not_allowed(self) -> None:
+		self.client.force_login(self.user)
+		response = self.client.get(reverse(TASK_BULK_URL))
+
+		self.assertEqual(response.status_code, 405)
+
+	def test_task_bulk_complete_skips_tasks_user_can_not_edit(self) -> None:
+		response = self.post(self.user, "complete", self.tasks)
+
+		self.assertRedirects(response, reverse(TASK_LIST_URL))
+		self.assertEqual(
+			list(
+				Task.objects.order_by("name").values_list(
+					"is_completed", flat=True
+				)
+			),
+			[True, True, False],
+		)
+		self.assertEqual(get_counters()[Counter.ACTIVE_TASKS], 1)
+		self.user.refresh_from_db()
+		self.assertEqual(self.user.active_task_count, 0)
+		self.assertEqual(self.user.resolved_task_count, 2)
+
+	def test_task_bulk_complete_for_superuser(self) -> None:
+		self.post(self.superuser, "complete", self.tasks)
+
+		self.assertFalse(Task.objects.filter(is_completed=False).exists())
+		self.assertEqual(get_counters()[Counter.ACTIVE_TASKS], 0)
+
+	def test_task_bulk_set_priority(self) -> None:
+		self.post(self.user, "set_priority", self.tasks, priority=3)
+
+		self.assertEqual(
+			list(
+				Task.objects.order_by("name").values_list(
+					"priority", flat=True
+				)
+			),
+			[3, 3, 1],
+		)
+
+	def test_task_bulk_set_task_type(self) -> None:
+		self.post(
+			self.user, "set_task_type", self.tasks, task_type=self.task_type.pk
+		)
+
+		self.assertEqual(
+			Task.objects.filter(task_type=self.task_type).count(), 2
+		)
+
+	def test_task_bulk_add_and_remove_assignees(self) -> None:
+		self.post(
+			self.user, "add_assignees", self.tasks, assignees="other_user"
+		)
+
+		self.assertEqual(self.other_user.tasks.count(), 2)
+		self.other_user.refresh_from_db()
+		self.assertEqual(self.other_user.active_task_count, 2)
+
+		self.post(
+			self.user, "remove_assignees", self.tasks, assignees="other_user"
+		)
+
+		self.assertFalse(self.other_user.tasks.exists())
+		self.other_user.refresh_from_db()
+		self.assertEqual(self.other_user.active_task_count, 0)
+
+	def test_task_bulk_remove_self_touches_the_tasks(self) -> None:
+		task = self.tasks[0]
+		before = Task.objects.get(pk=task.pk).updated_at
+		version = fragment_cache.get_versions([task.pk])
+
+		self.post(
+			self.user, "remove_assignees", [task], assignees="assigned_user"
+		)
+
+		self.assertFalse(task.assignees.exists())
+		self.assertGreater(Task.objects.get(pk=task.pk).updated_at, before)
+		self.assertNotEqual(fragment_cache.get_versions([task.pk]), version)
+
+	def test_task_bulk_action_reports_unknown_assignees(self) -> None:
+		response = self.post(
+			self.user, "add_assignees", self.tasks, assignees="nobody"
+		)
+		messages = [str(m) for m in response.wsgi_request._messages]
+
+		self.assertEqual(messages, ["Unknown users: nobody."])
+		self.assertFalse(self.tasks[2].assignees.exists())
+
+	def test_task_bulk_action_requires_selected_tasks(self) -> None:
+		response = self.post(self.user, "complete", [])
+		messages = [str(m) for m in response.wsgi_request._messages]
+
+		self.assertEqual(messages, ["Select at least one task."])
+
+	def test_task_bulk_action_redirects_to_safe_next_only(self) -> None:
+		self.client.force_login(self.user)
+		data = {"action": "complete", "tasks": [self.tasks[0].pk]}
+		next_page = reverse(TASK_LIST_URL) + "?query=task"
+
+		response = self.client.post(
+			reverse(TASK_BULK_URL) + f"?next={next_page}", data
+		)
+		self.assertRedirects(
+			response, next_page, fetch_redirect_response=False
+		)
+
+		response = self.client.post(
+			reverse(TASK_BULK_URL) + "?next=https://example.com/", data
+		)
+		self.assertRedirects(response, reverse(TASK_LIST_URL))
+
+	def test_task_bulk_action_query_count_does_not_grow(self) -> None:
+		tasks = [create_task(name=f"bulk{i}") for i in range(10)]
+		self.client.force_login(self.superuser)
+		# Load the user into the cache, so both requests find it there.
+		self.client.get(reverse(TASK_LIST_URL))
+
+		with self.assertNumQueries(6) as few:
+			self.client.post(
+				reverse(TASK_BULK_URL),
+				{"action": "complete", "tasks": [tasks[0].pk]},
+			)
+		with self.assertNumQueries(len(few)):
+			self.client.post(
+				reverse(TASK_BULK_URL),
+				{"action": "complete", "tasks": [t.pk for t in tasks]},
+			)
@@ -2,9 +2,12 @@ from datetime import date
 
 from django.conf.global_settings import LOGIN_URL
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from task_manager import page_cache
 from task_manager.tests.utils import (
 	create_position, create_task, create_worker,
 )
@@ -14,6 +17,7 @@ WORKER_CREATE_URL = "task_manager:worker_create"
 WORKER_DETAIL_URL = "task_manager:worker_detail"
 WORKER_UPDATE_URL = "task_manager:worker_update"
 WORKER_DELETE_URL = "task_manager:worker_delete"
+WORKER_TYPEAHEAD_URL = "task_manager:worker_typeahead"
 
 
 class WorkerListViewTest(TestCase):
@@ -26,6 +30,9 @@ class WorkerListViewTest(TestCase):
 			username="Jane", first_name="Jane", last_name="Jane"
 		)
 
+	def setUp(self) -> None:
+		page_cache.get_cache().clear()
+
 	def test_worker_list_view_is_accessible(self) -> None:
 		response = self.client.get(reverse(WORKER_LIST_URL))
 
@@ -55,6 +62,17 @@ class WorkerListViewTest(TestCase):
 			len(response.context["worker_list"]), 2
 		)
 
+	def test_worker_list_view_sorted_by_workload(self) -> None:
+		create_task().assignees.add(self.worker2)
+		response = self.client.get(
+			reverse(WORKER_LIST_URL), {"sort": "active_tasks"}
+		)
+
+		self.assertEqual(
+			list(response.context["worker_list"]),
+			[self.worker2, self.worker1],
+		)
+
 	def test_worker_list_view_search_results(self) -> None:
 		response = self.client.get(
 			reverse(WORKER_LIST_URL) + f"?query={self.worker1.username}"
@@ -91,6 +109,48 @@ class WorkerListViewTest(TestCase):
 		)
 
 
+class WorkerTypeaheadViewTest(TestCase):
+	@classmethod
+	def setUpTestData(cls) -> None:
+		position = create_position()
+		cls.worker = create_worker(
+			username="johnny", first_name="John", position=position
+		)
+		create_worker(username="jane", first_name="Jane")
+
+	def test_worker_typeahead_returns_matching_workers(self) -> None:
+		response = self.client.get(
+			reverse(WORKER_TYPEAHEAD_URL), {"query": "john"}
+		)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			response.json()["results"],
+			[
+				{
+					"id": self.worker.pk,
+					"username": "johnny",
+					"first_name": "John",
+					"last_name": "",
+					"position_name": self.worker.position.name,
+				}
+			],
+		)
+
+	def test_worker_typeahead_limit(self) -> None:
+		response = self.client.get(
+			reverse(WORKER_TYPEAHEAD_URL), {"query": "j", "limit": 1}
+		)
+
+		self.assertEqual(len(response.json()["results"]), 1)
+
+	def test_worker_typeahead_without_query(self) -> None:
+		with self.assertNumQueries(0):
+			response = self.client.get(reverse(WORKER_TYPEAHEAD_URL))
+
+		self.assertEqual(response.json(), {"results": []})
+
+
 class WorkerCreateViewTest(TestCase):
 	@classmethod
 	def setUpTestData(cls) -> None:
@@ -215,6 +275,24 @@ class WorkerDetailViewTest(TestCase):
 		)
 		self.assertEqual(response.context["today"], date.today())
 
+	def test_worker_detail_view_renders_task_counts_without_counting(
+		self
+	) -> None:
+		self.client.force_login(self.user)
+		with CaptureQueriesContext(connection) as context:
+			response = self.client.get(
+				reverse(WORKER_DETAIL_URL, args=[self.user.pk])
+			)
+
+		self.assertContains(response, 'countTo="4"')
+		self.assertContains(response, 'countTo="2"')
+		self.assertFalse(
+			[
+				query for query in context.captured_queries
+				if "COUNT(" in query["sql"]
+			]
+		)
+
 
 class WorkerUpdateViewTest(TestCase):
 	@classmethod
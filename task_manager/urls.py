@@ -1,13 +1,23 @@
 from django.urls import path
 
+from task_manager.api import (
+	PositionApiListView,
+	TaskApiListView,
+	TaskTypeApiListView,
+	WorkerApiListView,
+)
 from task_manager.views import (
 	index,
+	fragment_cache_stats,
+	request_metrics,
+	worker_typeahead,
 	WorkerListView,
 	WorkerCreateView,
 	WorkerDetailView,
 	WorkerUpdateView,
 	WorkerDeleteView,
 	TaskListView,
+	TaskBulkActionView,
 	TaskCreateView,
 	TaskDetailView,
 	TaskUpdateView,
@@ -18,6 +28,9 @@ urlpatterns = [
 	path("", index, name="index"),
 	path("workers/", WorkerListView.as_view(), name="worker_list"),
 	path("workers/create/", WorkerCreateView.as_view(), name="worker_create"),
+	path(
+		"workers/typeahead/", worker_typeahead, name="worker_typeahead"
+	),
 	path(
 		"workers/<int:pk>/", WorkerDetailView.as_view(), name="worker_detail"
 	),
@@ -33,6 +46,7 @@ urlpatterns = [
 	),
 	path("tasks/", TaskListView.as_view(), name="task_list"),
 	path("tasks/create/", TaskCreateView.as_view(), name="task_create"),
+	path("tasks/bulk/", TaskBulkActionView.as_view(), name="task_bulk"),
 	path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task_detail"),
 	path(
 		"tasks/update/<int:pk>/", TaskUpdateView.as_view(), name="task_update"
@@ -40,6 +54,24 @@ urlpatterns = [
 	path(
 		"tasks/delete/<int:pk>/", TaskDeleteView.as_view(), name="task_delete"
 	),
+	path("api/tasks/", TaskApiListView.as_view(), name="api_task_list"),
+	path("api/workers/", WorkerApiListView.as_view(), name="api_worker_list"),
+	path(
+		"api/positions/",
+		PositionApiListView.as_view(),
+		name="api_position_list",
+	),
+	path(
+		"api/task-types/",
+		TaskTypeApiListView.as_view(),
+		name="api_task_type_list",
+	),
+	path(
+		"stats/fragment-cache/",
+		fragment_cache_stats,
+		name="fragment_cache_stats",
+	),
+	path("metrics", request_metrics, name="metrics"),
 ]
 
 app_name = "task_manager"
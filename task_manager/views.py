@@ -1,40 +1,113 @@
-from datetime import date
+from datetime import date, datetime
+from operator import attrgetter
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView as BaseLoginView
+from django.contrib import messages
 from django.contrib.auth import get_user_model, login
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count, Prefetch, Q
-from django.http import HttpRequest, HttpResponse
+from django.db.models import F, Max, Prefetch
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
+from django.utils.crypto import constant_time_compare
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.generic import (
 	DetailView,
+	FormView,
 	ListView,
 	CreateView,
 	UpdateView,
 	DeleteView,
 )
 
-from task_manager.forms import TaskForm, WorkerCreateForm, WorkerUpdateForm
-from task_manager.mixins import PreviousPageMixin, SearchMixin
-from task_manager.models import Task
+from task_manager import bulk, fragment_cache, metrics, page_cache
+from task_manager.counters import get_counters, get_list_probe
+from task_manager.forms import (
+	TaskBulkActionForm,
+	TaskForm,
+	WorkerCreateForm,
+	WorkerUpdateForm,
+)
+from task_manager.mixins import (
+	CachedObjectMixin,
+	ConditionalGetMixin,
+	KeysetPaginationMixin,
+	PreviousPageMixin,
+	SearchMixin,
+)
+from task_manager.models import Counter, Task
+from task_manager.page_cache import cache_anonymous_page
+from task_manager.query_budget import query_budget
+from task_manager.search import (
+	SearchBackend,
+	WorkerTrigramSearchBackend,
+	get_task_search_backend,
+)
+
+TYPEAHEAD_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 50
+PAGE_CACHE_TIMEOUT = 60 * 10
 
 
+@query_budget(3)
+@cache_anonymous_page(PAGE_CACHE_TIMEOUT)
 def index(request: HttpRequest) -> HttpResponse:
-	task_counts = Task.objects.aggregate(
-		total_tasks=Count("id"),
-		active_tasks=Count("id", filter=Q(is_completed=False))
+	page_cache.add_keys(request, page_cache.TASK_LIST, page_cache.WORKER_LIST)
+
+	return render(request, "pages/index.html", get_counters())
+
+
+@query_budget(1)
+def worker_typeahead(request: HttpRequest) -> JsonResponse:
+	"""Return the workers most similar to the ``query`` parameter."""
+	search_query = str(request.GET.get("query", "")).strip()
+	try:
+		limit = min(
+			int(request.GET.get("limit", TYPEAHEAD_LIMIT)), TYPEAHEAD_MAX_LIMIT
+		)
+	except ValueError:
+		limit = TYPEAHEAD_LIMIT
+
+	if not search_query or limit < 1:
+		return JsonResponse({"results": []})
+
+	search_backend = WorkerTrigramSearchBackend()
+	workers = search_backend.search(
+		get_user_model().objects.all(), search_query
+	).order_by(
+		*search_backend.rank_ordering, "username"
+	).values(
+		"id", "username", "first_name", "last_name",
+		position_name=F("position__name"),
+	)
+
+	return JsonResponse({"results": list(workers[:limit])})
+
+
+@query_budget(2)
+def fragment_cache_stats(request: HttpRequest) -> JsonResponse:
+	"""Return the task fragment cache hit and miss counts of every worker."""
+	if not request.user.is_staff:
+		raise PermissionDenied("You are not allowed to view cache stats.")
+
+	return JsonResponse(fragment_cache.get_stats())
+
+
+@query_budget(2)
+def request_metrics(request: HttpRequest) -> HttpResponse:
+	"""Return the request metrics of every worker for Prometheus."""
+	token = settings.METRICS_TOKEN
+	has_token = bool(token) and constant_time_compare(
+		request.headers.get("Authorization", ""), f"Bearer {token}"
 	)
+	if not has_token and not request.user.is_staff:
+		raise PermissionDenied("You are not allowed to view metrics.")
 
-	return render(
-		request,
-		"pages/index.html",
-		{
-			"total_tasks": task_counts["total_tasks"],
-			"active_tasks": task_counts["active_tasks"],
-			"total_users": get_user_model().objects.count(),
-		}
+	return HttpResponse(
+		metrics.render_metrics(metrics.store.collect()),
+		content_type=metrics.CONTENT_TYPE,
 	)
 
 
@@ -46,30 +119,52 @@ class LoginView(BaseLoginView):
 		return super().dispatch(request, *args, **kwargs)
 
 
-class WorkerListView(SearchMixin, ListView):
+class WorkerListView(
+	ConditionalGetMixin, SearchMixin, KeysetPaginationMixin, ListView
+):
 	model = get_user_model()
 	context_object_name = "worker_list"
 	template_name = "pages/worker_list.html"
+	query_budget = 4
+	page_cache_timeout = PAGE_CACHE_TIMEOUT
 	paginate_by = 10
+	keyset_ordering = ("username", "id")
+	sort_orderings = {
+		"active_tasks": ("-active_task_count", "username", "id"),
+		"resolved_tasks": ("-resolved_task_count", "username", "id"),
+	}
+	queryset = get_user_model().objects.select_related("position")
+	search_backend = WorkerTrigramSearchBackend()
 
-	def get_queryset(self):
-		queryset = get_user_model().objects.select_related("position")
-		search_query = str(self.request.GET.get("query", "")).strip()
-
-		if search_query:
-			queryset = queryset.filter(
-				Q(username__icontains=search_query) |
-				Q(first_name__icontains=search_query) |
-				Q(last_name__icontains=search_query)
-			)
+	def get_keyset_ordering(self) -> tuple[str, ...]:
+		"""An explicit workload sort takes precedence over relevance."""
+		if ordering := self.sort_orderings.get(self.request.GET.get("sort")):
+			return ordering
 
-		return queryset
+		return super().get_keyset_ordering()
+
+	def get_probe(self) -> tuple | None:
+		return get_list_probe(get_user_model(), Counter.TOTAL_USERS)
+
+	def get_context_data(self, **kwargs) -> dict:
+		context = super().get_context_data(**kwargs)
+		page_cache.add_keys(
+			self.request,
+			page_cache.WORKER_LIST,
+			*(
+				page_cache.worker_key(worker.pk)
+				for worker in context["worker_list"]
+			),
+		)
+
+		return context
 
 
 class WorkerCreateView(CreateView):
 	model = get_user_model()
 	form_class = WorkerCreateForm
 	template_name = "pages/worker_form.html"
+	query_budget = {"GET": 1, "POST": 16}
 
 	def dispatch(self, request, *args, **kwargs):
 		if request.user.is_authenticated:
@@ -84,46 +179,67 @@ class WorkerCreateView(CreateView):
 
 	def form_valid(self, form):
 		response = super().form_valid(form)
-		user = form.save()
-		login(self.request, user)
+		login(self.request, self.object)
 
 		return response
 
 
-class WorkerDetailView(LoginRequiredMixin, DetailView):
+class WorkerDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
 	model = get_user_model()
 	context_object_name = "worker"
 	template_name = "pages/worker_detail.html"
+	query_budget = 6
 
 	queryset = get_user_model().objects.select_related(
 		"position"
 	).prefetch_related(
 		Prefetch(
 			"tasks",
-			queryset=Task.objects.filter(is_completed=False),
+			queryset=Task.objects.filter(
+				is_completed=False
+			).select_related("task_type"),
 			to_attr="active_tasks"
 		),
 		Prefetch(
 			"tasks",
-			queryset=Task.objects.filter(is_completed=True),
+			queryset=Task.objects.filter(
+				is_completed=True
+			).select_related("task_type"),
 			to_attr="resolved_tasks"
 		),
 	)
 
+	def get_probe(self) -> tuple | None:
+		# Removing tasks touches both sides, so the latest timestamps do.
+		probe = self.model.objects.filter(pk=self.kwargs["pk"]).aggregate(
+			Max("updated_at"), Max("tasks__updated_at")
+		)
+
+		return tuple(probe.values()) if probe["updated_at__max"] else None
+
+	def get_last_modified(self, probe: tuple) -> datetime:
+		return max(filter(None, probe))
+
 	def get_context_data(self, **kwargs) -> dict:
 		context = super().get_context_data(**kwargs)
 
 		context["active_tasks"] = self.object.active_tasks
 		context["resolved_tasks"] = self.object.resolved_tasks
 		context["today"] = date.today()
+		fragment_cache.load_fragments(
+			self.object.active_tasks + self.object.resolved_tasks,
+			"card_body",
+			attrgetter("task_type"),
+		)
 
 		return context
 
 
-class WorkerUpdateView(UpdateView):
+class WorkerUpdateView(CachedObjectMixin, UpdateView):
 	model = get_user_model()
 	form_class = WorkerUpdateForm
 	template_name = "pages/worker_form.html"
+	query_budget = {"GET": 3, "POST": 13}
 
 	def dispatch(self, request, *args, **kwargs):
 		worker = self.get_object()
@@ -157,6 +273,7 @@ class WorkerUpdateView(UpdateView):
 class WorkerDeleteView(PreviousPageMixin, DeleteView):
 	model = get_user_model()
 	template_name = "pages/worker_confirm_delete.html"
+	query_budget = {"GET": 3, "POST": 11}
 	success_url = reverse_lazy("task_manager:worker_list")
 
 	def dispatch(self, request, *args, **kwargs):
@@ -168,32 +285,113 @@ class WorkerDeleteView(PreviousPageMixin, DeleteView):
 		return super().dispatch(request, *args, **kwargs)
 
 
-class TaskListView(SearchMixin, ListView):
+class TaskListView(
+	ConditionalGetMixin, SearchMixin, KeysetPaginationMixin, ListView
+):
 	model = Task
 	context_object_name = "task_list"
 	template_name = "pages/task_list.html"
+	query_budget = 6
+	page_cache_timeout = PAGE_CACHE_TIMEOUT
 	paginate_by = 10
+	keyset_ordering = ("-priority", "deadline", "id")
+	queryset = Task.objects.select_related("task_type")
+
+	def get_search_backend(self) -> SearchBackend:
+		return get_task_search_backend()
+
+	def get_probe(self) -> tuple | None:
+		if (probe := get_list_probe(Task, Counter.TOTAL_TASKS)) is None:
+			return None
+
+		# The bulk form lists every task type, and task type changes purge
+		# the task list pages, so their version stands for the choices. A
+		# missing one starts with the page, as the page cache would do.
+		versions = page_cache.get_versions(
+			[page_cache.TASK_LIST],
+			getattr(self.request, "page_cache_started", None),
+		)
 
-	def get_queryset(self):
-		queryset = Task.objects.select_related("task_type")
-		search_query = str(self.request.GET.get("query", "")).strip()
+		return *probe, versions[page_cache.TASK_LIST]
 
-		if search_query:
-			queryset = queryset.filter(name__icontains=search_query)
+	def get_queryset(self):
+		queryset = super().get_queryset()
+		if self.request.user.is_authenticated:
+			queryset = queryset.with_editable(self.request.user)
 
 		return queryset
 
 	def get_context_data(self, **kwargs) -> dict:
 		context = super().get_context_data(**kwargs)
 		context["today"] = date.today()
+		if self.request.user.is_authenticated:
+			context["bulk_form"] = TaskBulkActionForm()
+		fragment_cache.load_fragments(
+			context["task_list"], "list_row", attrgetter("task_type")
+		)
+		page_cache.add_keys(
+			self.request,
+			page_cache.TASK_LIST,
+			*(page_cache.task_key(task.pk) for task in context["task_list"]),
+		)
 
 		return context
 
 
+class TaskBulkActionView(LoginRequiredMixin, FormView):
+	"""
+	Applies one action to many tasks with set-based queries. Tasks the
+	user may not edit are filtered out in SQL, as in TaskUpdateView.
+	"""
+
+	form_class = TaskBulkActionForm
+	http_method_names = ["post"]
+	query_budget = 8
+
+	def form_valid(self, form):
+		data = form.cleaned_data
+		tasks = Task.objects.filter(pk__in=data["tasks"]).editable_by(
+			self.request.user
+		)
+		action = data["action"]
+
+		if action == TaskBulkActionForm.COMPLETE:
+			count = bulk.complete_tasks(tasks)
+		elif action == TaskBulkActionForm.SET_PRIORITY:
+			count = bulk.set_priority(tasks, data["priority"])
+		elif action == TaskBulkActionForm.SET_TASK_TYPE:
+			count = bulk.set_task_type(tasks, data["task_type"])
+		elif action == TaskBulkActionForm.ADD_ASSIGNEES:
+			count = bulk.add_assignees(tasks, data["assignees"])
+		else:
+			count = bulk.remove_assignees(tasks, data["assignees"])
+
+		messages.success(self.request, f"Updated {count} task(s).")
+
+		return redirect(self.get_success_url())
+
+	def form_invalid(self, form):
+		for errors in form.errors.values():
+			for error in errors:
+				messages.error(self.request, error)
+
+		return redirect(self.get_success_url())
+
+	def get_success_url(self) -> str:
+		next_page = self.request.GET.get("next")
+		if next_page and url_has_allowed_host_and_scheme(
+			next_page, allowed_hosts={self.request.get_host()}
+		):
+			return next_page
+
+		return reverse_lazy("task_manager:task_list")
+
+
 class TaskCreateView(LoginRequiredMixin, CreateView):
 	model = Task
 	form_class = TaskForm
 	template_name = "pages/task_form.html"
+	query_budget = {"GET": 4, "POST": 15}
 
 	def get_success_url(self):
 		return reverse_lazy(
@@ -201,14 +399,29 @@ class TaskCreateView(LoginRequiredMixin, CreateView):
 		)
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
 	model = Task
 	context_object_name = "task"
 	template_name = "pages/task_detail.html"
+	query_budget = 6
 	queryset = Task.objects.select_related("task_type").prefetch_related(
-		"assignees"
+		Prefetch(
+			"assignees",
+			queryset=get_user_model().objects.select_related("position"),
+		)
 	)
 
+	def get_probe(self) -> tuple | None:
+		# Removing assignees touches both sides, so the latest timestamps do.
+		probe = Task.objects.filter(pk=self.kwargs["pk"]).aggregate(
+			Max("updated_at"), Max("assignees__updated_at")
+		)
+
+		return tuple(probe.values()) if probe["updated_at__max"] else None
+
+	def get_last_modified(self, probe: tuple) -> datetime:
+		return max(filter(None, probe))
+
 	def get_context_data(self, **kwargs) -> dict:
 		context = super().get_context_data(**kwargs)
 		context["today"] = date.today()
@@ -219,16 +432,18 @@ class TaskDetailView(LoginRequiredMixin, DetailView):
 		return context
 
 
-class TaskUpdateView(UpdateView):
+class TaskUpdateView(CachedObjectMixin, UpdateView):
 	model = Task
 	form_class = TaskForm
 	template_name = "pages/task_form.html"
+	query_budget = {"GET": 7, "POST": 18}
 
 	def dispatch(self, request, *args, **kwargs):
 		task = self.get_object()
-		is_user_assigned = task.assignees.filter(pk=request.user.pk).exists()
 
-		if not (request.user.is_superuser or is_user_assigned):
+		if not Task.objects.filter(pk=task.pk).editable_by(
+			request.user
+		).exists():
 			raise PermissionDenied(
 				"You are not allowed to edit this task."
 			)
@@ -244,16 +459,20 @@ class TaskUpdateView(UpdateView):
 		)
 
 
-class TaskDeleteView(PreviousPageMixin, DeleteView):
+class TaskDeleteView(
+	CachedObjectMixin, PreviousPageMixin, DeleteView
+):
 	model = Task
 	template_name = "pages/task_confirm_delete.html"
+	query_budget = {"GET": 4, "POST": 9}
 	success_url = reverse_lazy("task_manager:task_list")
 
 	def dispatch(self, request, *args, **kwargs):
 		task = self.get_object()
-		is_user_assigner = task.assignees.filter(pk=request.user.pk).exists()
 
-		if not (request.user.is_superuser or is_user_assigner):
+		if not Task.objects.filter(pk=task.pk).editable_by(
+			request.user
+		).exists():
 			raise PermissionDenied(
 				"You are not allowed to delete this task."
 			)